@@ -7,6 +7,7 @@ from typing import Optional
 
 from .color_finder import ColorFinder, SearchDirection
 from .global_hotkey_listener import GlobalHotkeyListener
+from .polling_governor import PollingGovernor
 # 타입 힌팅을 위해 AppUI를 임포트합니다.
 from .app_ui import AppUI
 
@@ -16,7 +17,7 @@ class AppController:
         self.ui: Optional[AppUI] = None  # UI 인스턴스는 나중에 set_ui를 통해 설정됩니다.
         self._initialize_attributes()
         # 핵심 로직 컴포넌트 초기화
-        self.color_finder = ColorFinder(sleep_time=self.sleep_time)
+        self.color_finder = ColorFinder()
         self.mouse_controller = mouse.Controller()
         hotkey_map = {
             'tab+esc': self.start_search,
@@ -51,6 +52,8 @@ class AppController:
         self.click_offset4 = 5
         self.click_offset5 = 5
         self.max_fail_clicks = 525
+        # 반복 탐색의 대기 시간 조절기. 화면이 그대로이면 기존 고정 대기 시간(0.1초)까지 물러납니다.
+        self.polling_governor = PollingGovernor(cpu_budget=0.25, max_interval=0.1)
 
         # 내부 상태 변수
         self.area = (0, 0, 0, 0)
@@ -199,10 +202,15 @@ class AppController:
 
     def _search_worker(self):
         """(스레드 워커) 색상을 주기적으로 검색하고, 찾으면 클릭 후 종료합니다."""
+        governor = self.polling_governor
+        governor.reset()
         while self.is_searching:
-            abs_x, abs_y = self.color_finder.find_color_in_area(self.area, self.current_search_color, self.color_tolerance, self.search_direction)
+            governor.begin_cycle()
+            found_pos = self.color_finder.find_color_in_area(self.area, self.current_search_color, self.color_tolerance, self.search_direction)
+            delay = governor.end_cycle(self.color_finder.last_frame_changed)
 
-            if abs_x is not None and abs_y is not None:
+            if found_pos is not None:
+                abs_x, abs_y = found_pos
                 self.color_finder.click_action(abs_x, abs_y)
 
                 if self.position3 != (0, 0):
@@ -215,7 +223,9 @@ class AppController:
                         offset_y = random.randint(-self.click_offset3, self.click_offset3)
                         final_comp_x += offset_x
                         final_comp_y += offset_y
-                    self.color_finder.click_action(final_comp_x, final_comp_y, delay=self.complete_click_delay)
+                    if self.complete_click_delay > 0:
+                        time.sleep(self.complete_click_delay)
+                    self.color_finder.click_action(final_comp_x, final_comp_y)
                     status_message = f"색상 클릭 후 완료선택({final_comp_x},{final_comp_y}) 클릭"
                 else:
                     status_message = f"색상 발견 및 클릭 완료: ({abs_x}, {abs_y})"
@@ -267,7 +277,9 @@ class AppController:
                     if self.fail_click_delay > 0:
                         random_offset = random.uniform(-0.1, 0.1)
                         final_delay = self.fail_click_delay + random_offset
-                    self.color_finder.click_action(fail_x, fail_y, delay=max(0, final_delay))
+                    if final_delay > 0:
+                        time.sleep(final_delay)
+                    self.color_finder.click_action(fail_x, fail_y)
 
                     self.total_fail_clicks += 1
                     if self.total_fail_clicks >= self.max_fail_clicks:
@@ -287,8 +299,11 @@ class AppController:
                     else:
                         self.current_search_color = self.next_color_after_pos5
                         print(f"다음 검색 색상 변경 (구역2 규칙): {self.current_search_color}")
+            else:
+                status_text = f"색상 탐색 중... | {governor.describe()}"
+                self.ui.queue_task(lambda text=status_text: self.ui.update_status(text))
 
-            time.sleep(0.1)
+            time.sleep(delay)
 
     def on_closing(self):
         """창을 닫을 때 리소스를 안전하게 정리합니다."""
@@ -2,7 +2,6 @@ import tkinter as tk
 import queue
 import sys
 from pynput import mouse
-from PIL import ImageGrab
 
 from .color_finder import SearchDirection
 
@@ -307,9 +306,7 @@ class AppUI:
             x, y = self.mouse_controller.position
             ix, iy = int(x), int(y)
             
-            screenshot = ImageGrab.grab(bbox=(ix, iy, ix + 1, iy + 1)).convert('RGB')
-            pixel_color = screenshot.getpixel((0, 0))
-            new_color = pixel_color
+            new_color = self.controller.color_finder.screen_source.grab_pixel(ix, iy)
 
             if color_index == 0:
                 self.color_var.set(str(new_color))
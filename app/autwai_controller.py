@@ -5,9 +5,11 @@ import ast
 from typing import Optional, TYPE_CHECKING
 
 from pynput import mouse, keyboard
-from PIL import ImageGrab
 
 from .color_finder import ColorFinder, SearchDirection
+from .frame_recorder import RECORDING_DIR, FrameRecorder, default_recording_path
+from .latency_stats import LatencyStats
+from .polling_governor import PollingGovernor
 from .global_hotkey_listener import GlobalHotkeyListener
 
 if TYPE_CHECKING:
@@ -28,6 +30,14 @@ class AutwaiController:
         self.is_running = False
         self.run_thread: Optional[threading.Thread] = None
         self.area_markers = []
+        self.use_latency_stats = False # 단계별 지연 시간 기록 사용 여부
+        self.latency_stats: Optional[LatencyStats] = None # 마지막 실행의 지연 시간 기록
+        self.record_frames = False # 탐색한 모든 프레임과 결과를 링 파일에 기록
+        self.recording_dir = RECORDING_DIR
+        self.frame_recorder: Optional[FrameRecorder] = None
+        # 색상 반복 탐색의 대기 시간 조절기. 화면이 바뀌는 동안은 CPU 예산 안에서 빠르게,
+        # 그대로이면 기존 고정 대기 시간(0.05초)까지 물러납니다.
+        self.polling_governor = PollingGovernor(cpu_budget=0.25, max_interval=0.05)
 
         # --- 전역 단축키 설정 ---
         hotkey_map = {
@@ -111,6 +121,18 @@ class AutwaiController:
         if self.is_running: return
         if not self.apply_settings(): return
 
+        self.latency_stats = LatencyStats() if self.use_latency_stats else None
+        self.color_finder.set_latency_stats(self.latency_stats)
+        if self.record_frames:
+            recorder = FrameRecorder(default_recording_path(self.recording_dir))
+            try:
+                recorder.start()
+            except OSError as e:
+                print(f"프레임 기록 시작 실패: {e}")
+            else:
+                self.frame_recorder = recorder
+                self.color_finder.set_frame_recorder(recorder)
+                print(f"프레임 기록: {recorder.path}")
         self.is_running = True
         
         if self.ui:
@@ -136,6 +158,14 @@ class AutwaiController:
                 self.ui.update_window_bg('default')
             self.ui.root.after(0, ui_update)
         print(f"--- {message} ---")
+        if self.latency_stats is not None:
+            print("--- 단계별 지연 시간 ---")
+            print(self.latency_stats.format_report())
+        if self.frame_recorder is not None:
+            self.color_finder.set_frame_recorder(None)
+            self.frame_recorder.stop()
+            print(f"프레임 기록 완료: {self.frame_recorder.path} ({self.frame_recorder.recorded}프레임)")
+            self.frame_recorder = None
 
     def _click_at(self, coord: tuple):
         """지정된 좌표로 이동하고, 설정된 딜레이 후 클릭합니다."""
@@ -174,13 +204,20 @@ class AutwaiController:
             search_area = (min(self.p1[0], self.p2[0]), min(self.p1[1], self.p2[1]),
                            max(self.p1[0], self.p2[0]), max(self.p1[1], self.p2[1]))
 
+            governor = self.polling_governor
+            governor.reset()
             while self.is_running:
-                self._update_status_safe(f"색상 탐색 중...")
+                self._update_status_safe(f"색상 탐색 중... | {governor.describe()}")
 
+                cycle_started = time.perf_counter()
+                governor.begin_cycle()
                 found_pos = self.color_finder.find_color_in_area(
                     area=search_area, color=self.color,
                     tolerance=self.color_tolerance, direction=self.search_direction
                 )
+                delay = governor.end_cycle(self.color_finder.last_frame_changed)
+                if self.latency_stats is not None:
+                    self.latency_stats.record('cycle', time.perf_counter() - cycle_started, search_area)
 
                 if found_pos:
                     # --- Part 3: 성공 시퀀스 ---
@@ -194,8 +231,8 @@ class AutwaiController:
                     self.stop_run("작업 완료!")
                     return # 작업 완료 후 스레드 종료
 
-                # 색상을 못 찾았을 경우, 짧은 대기 후 다시 시도 (CPU 과부하 방지)
-                time.sleep(0.05)
+                # 색상을 못 찾았을 경우, 조절기가 정한 시간만큼 대기 후 다시 시도 (CPU 과부하 방지)
+                time.sleep(delay)
 
         except Exception as e:
             self.stop_run(f"오류 발생: {e}")
@@ -269,8 +306,7 @@ class AutwaiController:
     def _grab_color(self, color_key: str):
         if not self.ui: return
         x, y = self.mouse_controller.position
-        screenshot = ImageGrab.grab(bbox=(int(x), int(y), int(x) + 1, int(y) + 1))
-        new_color = screenshot.getpixel((0, 0))[:3] # RGB
+        new_color = self.color_finder.screen_source.grab_pixel(int(x), int(y)) # RGB
 
         if color_key == 'main_color':
             self.ui.color_var.set(str(new_color))
@@ -0,0 +1,337 @@
+"""
+화면 없이(ArrayScreenSource) 색상 탐색 성능을 측정하는 도구입니다.
+
+사용 예:
+    python -m app.benchmark suite --output base.json
+    python -m app.benchmark suite --sizes 1920x1080 --repeats 20 --output new.csv
+    python -m app.benchmark compare base.json new.csv --threshold 0.1
+    python -m app.benchmark scaling --size 3840x2160 --max-workers 8
+    python -m app.benchmark metrics --size 660x450 --max-ratio 3
+"""
+import argparse
+import csv
+import json
+import os
+import platform
+import sys
+import time
+import numpy as np
+
+from .color_finder import ColorFinder, SearchDirection
+from .color_search import COLOR_METRICS
+from .screen_source import ArrayScreenSource
+
+TARGET_COLOR = (13, 192, 192)
+TARGET_TOLERANCE = 15
+TARGET_SIZE = 20 # 합성 화면에 그리는 대상 blob의 한 변 (px)
+
+DEFAULT_SIZES = ['200x200', '640x480', '1280x720', '1920x1080', '3840x2160']
+DEFAULT_TOLERANCES = [0, 15, 40]
+HIT_POSITIONS = ('start', 'middle', 'end', 'miss')
+# 결과 파일에서 같은 측정 조건을 식별하는 열
+CASE_KEYS = ('size', 'direction', 'position', 'tolerance')
+
+
+def parse_size(text: str) -> tuple[int, int]:
+    """'1920x1080' 형식의 문자열을 (너비, 높이)로 변환합니다."""
+    width, height = text.lower().split('x')
+    return int(width), int(height)
+
+
+def make_frame(width: int, height: int, hit: tuple | None = None, seed: int = 0) -> np.ndarray:
+    """
+    대상 색상과 겹치지 않는 잡음 배경에, hit 위치(좌상단)에 대상 blob을 그린 합성 화면을 만듭니다.
+    hit이 None이면 대상이 없는 화면입니다.
+    """
+    rng = np.random.default_rng(seed)
+    # G, B 채널을 0~99로 제한하면 대상 색상과의 거리가 항상 허용 오차보다 큽니다.
+    frame = rng.integers(0, 100, (height, width, 3), dtype=np.uint8)
+    if hit is not None:
+        x, y = hit
+        frame[y:y + TARGET_SIZE, x:x + TARGET_SIZE] = TARGET_COLOR
+    return frame
+
+
+def hit_position(width: int, height: int, direction: SearchDirection, position: str) -> tuple | None:
+    """
+    탐색 방향 기준으로 대상 blob을 둘 좌상단 좌표를 구합니다.
+    'start'는 탐색을 시작하는 모서리, 'end'는 마지막 모서리, 'middle'은 화면 중앙이며, 'miss'는 None입니다.
+    """
+    if position == 'miss':
+        return None
+    _, bottom_up, right_to_left = direction.scan_order
+    max_x, max_y = max(0, width - TARGET_SIZE), max(0, height - TARGET_SIZE)
+    if position == 'middle':
+        return max_x // 2, max_y // 2
+    at_end = position == 'end'
+    x = max_x if right_to_left != at_end else 0
+    y = max_y if bottom_up != at_end else 0
+    return x, y
+
+
+def time_scan(finder: ColorFinder, area: tuple, direction: SearchDirection, repeats: int,
+              targets: list | None = None, **options) -> list[float]:
+    """같은 탐색을 repeats번 반복하여 회당 소요 시간(ms) 목록을 반환합니다."""
+    targets = targets or [(TARGET_COLOR, TARGET_TOLERANCE)]
+    finder.find_colors_in_area(area, targets, direction, **options) # 작업 버퍼, 스레드 풀 준비
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        finder.find_colors_in_area(area, targets, direction, **options)
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def summarize_samples(samples: list[float]) -> dict:
+    """측정값(ms)의 최소/중앙값/평균/p95/최대를 반환합니다."""
+    values = np.asarray(samples)
+    return {
+        'min_ms': float(values.min()),
+        'median_ms': float(np.median(values)),
+        'mean_ms': float(values.mean()),
+        'p95_ms': float(np.percentile(values, 95)),
+        'max_ms': float(values.max()),
+    }
+
+
+def configure_finder(finder: ColorFinder, workers: int = 1, use_lut: bool = False):
+    """벤치마크용 ColorFinder 설정. 같은 프레임을 반복 탐색하므로 프레임 캐시는 항상 끕니다."""
+    finder.use_frame_cache = False
+    finder.use_color_lut = use_lut
+    finder.set_scan_workers(workers)
+
+
+def run_suite(sizes: list, tolerances: list, repeats: int = 5, directions: list | None = None,
+              positions: tuple = HIT_POSITIONS, workers: int = 1, use_lut: bool = False, metric: str = 'rgb',
+              progress=None) -> list[dict]:
+    """
+    크기 x 방향 x 대상 위치 x 허용 오차의 모든 조합에 대해 find_colors_in_area의 소요 시간을 측정합니다.
+    대상은 화면마다 한 번만 그렸다가 원래 배경으로 되돌리므로, 큰 화면도 조합마다 새로 만들지 않습니다.
+    """
+    directions = directions or list(SearchDirection)
+    source = ArrayScreenSource([np.zeros((1, 1, 3), dtype=np.uint8)])
+    finder = ColorFinder(source)
+    configure_finder(finder, workers, use_lut)
+
+    results = []
+    for size in sizes:
+        width, height = parse_size(size)
+        frame = make_frame(width, height)
+        source.set_frame(frame)
+        area = (0, 0, width, height)
+        for direction in directions:
+            for position in positions:
+                hit = hit_position(width, height, direction, position)
+                if hit is not None:
+                    x, y = hit
+                    patch = frame[y:y + TARGET_SIZE, x:x + TARGET_SIZE].copy()
+                    frame[y:y + TARGET_SIZE, x:x + TARGET_SIZE] = TARGET_COLOR
+                for tolerance in tolerances:
+                    targets = [(TARGET_COLOR, tolerance)]
+                    found = finder.find_colors_in_area(area, targets, direction, metric=metric)
+                    samples = time_scan(finder, area, direction, repeats, targets, metric=metric)
+                    row = {
+                        'size': size, 'direction': direction.name, 'position': position, 'tolerance': tolerance,
+                        'repeats': repeats, 'found': None if found is None else list(found[1]),
+                    }
+                    row.update(summarize_samples(samples))
+                    results.append(row)
+                    if progress:
+                        progress(row)
+                if hit is not None:
+                    frame[y:y + TARGET_SIZE, x:x + TARGET_SIZE] = patch
+    finder.shutdown_scan_pool()
+    return results
+
+
+def save_results(path: str, results: list[dict], meta: dict | None = None):
+    """결과를 확장자에 따라 JSON(.json) 또는 CSV(.csv)로 저장합니다."""
+    if path.lower().endswith('.csv'):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0].keys()) if results else list(CASE_KEYS))
+            writer.writeheader()
+            for row in results:
+                writer.writerow({**row, 'found': '' if row.get('found') is None else '{},{}'.format(*row['found'])})
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'meta': meta or {}, 'results': results}, f, ensure_ascii=False, indent=2)
+
+
+def load_results(path: str) -> list[dict]:
+    """save_results로 저장한 JSON 또는 CSV 결과를 읽습니다."""
+    if path.lower().endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        for row in rows:
+            row['tolerance'] = int(row['tolerance'])
+            for key in ('min_ms', 'median_ms', 'mean_ms', 'p95_ms', 'max_ms'):
+                row[key] = float(row[key])
+        return rows
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)['results']
+
+
+def compare_results(base: list[dict], new: list[dict], threshold: float = 0.1, min_delta_ms: float = 0.05) -> list[dict]:
+    """
+    같은 조건의 측정끼리 중앙값을 비교합니다.
+    중앙값이 threshold 비율 이상, 그리고 min_delta_ms 이상 느려졌으면 회귀로 표시합니다.
+    """
+    base_by_case = {tuple(row[key] for key in CASE_KEYS): row for row in base}
+    comparisons = []
+    for row in new:
+        case = tuple(row[key] for key in CASE_KEYS)
+        base_row = base_by_case.get(case)
+        if base_row is None:
+            continue
+        base_ms, new_ms = base_row['median_ms'], row['median_ms']
+        ratio = new_ms / base_ms if base_ms > 0 else float('inf')
+        comparisons.append({
+            **dict(zip(CASE_KEYS, case)),
+            'base_ms': base_ms, 'new_ms': new_ms, 'ratio': ratio,
+            'regression': ratio > 1 + threshold and new_ms - base_ms > min_delta_ms,
+        })
+    return comparisons
+
+
+def benchmark_scan_workers(width: int, height: int, worker_counts: list, repeats: int = 20,
+                           direction: SearchDirection = SearchDirection.TOP_LEFT_TO_BOTTOM_RIGHT) -> list[dict]:
+    """
+    작업자 수별 띠 병렬 탐색 시간을 측정합니다.
+    대상이 없는 화면(모든 띠를 계산해야 하는 최악의 경우)을 기준으로 합니다.
+    """
+    finder = ColorFinder(ArrayScreenSource([make_frame(width, height)]))
+    finder.use_frame_cache = False
+    area = (0, 0, width, height)
+
+    results = []
+    for workers in worker_counts:
+        finder.set_scan_workers(workers)
+        elapsed = float(np.median(time_scan(finder, area, direction, repeats)))
+        results.append({'workers': workers, 'ms': elapsed, 'speedup': results[0]['ms'] / elapsed if results else 1.0})
+    finder.shutdown_scan_pool()
+    return results
+
+
+def benchmark_metrics(width: int, height: int, repeats: int = 20, metrics: list | None = None,
+                      direction: SearchDirection = SearchDirection.TOP_LEFT_TO_BOTTOM_RIGHT) -> list[dict]:
+    """
+    색상 비교 기준별 탐색 시간을 측정하고 'rgb' 대비 배율을 구합니다.
+    대상이 없는 화면(전체 화면을 판정해야 하는 경우)을 기준으로 하며, 색상표는 실제 탐색처럼 미리 준비합니다.
+    """
+    metrics = metrics or list(COLOR_METRICS)
+    finder = ColorFinder(ArrayScreenSource([make_frame(width, height)]))
+    configure_finder(finder)
+    area = (0, 0, width, height)
+    targets = [(TARGET_COLOR, TARGET_TOLERANCE)]
+
+    results = []
+    for metric in metrics:
+        finder.prepare_metric_tables([(targets, metric)])
+        elapsed = float(np.median(time_scan(finder, area, direction, repeats, targets, metric=metric)))
+        results.append({'metric': metric, 'ms': elapsed})
+    base = next((row['ms'] for row in results if row['metric'] == 'rgb'), results[0]['ms'])
+    for row in results:
+        row['ratio'] = row['ms'] / base
+    finder.shutdown_scan_pool()
+    return results
+
+
+def run_suite_command(args):
+    sizes = args.sizes or DEFAULT_SIZES
+    tolerances = args.tolerances or DEFAULT_TOLERANCES
+    directions = [SearchDirection[name] for name in args.directions] if args.directions else None
+
+    def progress(row):
+        print(f"{row['size']:>10} {row['direction']:<28} {row['position']:<6} tol={row['tolerance']:<3} "
+              f"median {row['median_ms']:8.3f}ms  p95 {row['p95_ms']:8.3f}ms")
+
+    results = run_suite(sizes, tolerances, args.repeats, directions, workers=args.workers,
+                        use_lut=args.lut, metric=args.metric, progress=progress)
+    if args.output:
+        meta = {
+            'created': time.strftime('%Y-%m-%d %H:%M:%S'), 'python': platform.python_version(),
+            'numpy': np.__version__, 'cpu_count': os.cpu_count(), 'platform': platform.platform(),
+            'workers': args.workers, 'lut': args.lut, 'metric': args.metric, 'repeats': args.repeats,
+        }
+        save_results(args.output, results, meta)
+        print(f"결과 저장: {args.output} ({len(results)}개 조건)")
+
+
+def run_compare(args):
+    comparisons = compare_results(load_results(args.base), load_results(args.new), args.threshold, args.min_delta_ms)
+    regressions = [row for row in comparisons if row['regression']]
+    for row in sorted(comparisons, key=lambda row: row['ratio'], reverse=True)[:args.top]:
+        mark = '회귀' if row['regression'] else ''
+        print(f"{row['size']:>10} {row['direction']:<28} {row['position']:<6} tol={row['tolerance']:<3} "
+              f"{row['base_ms']:8.3f} -> {row['new_ms']:8.3f}ms ({row['ratio']:.2f}x) {mark}")
+    print(f"비교 {len(comparisons)}개 조건, 회귀 {len(regressions)}개 (기준: {args.threshold:.0%} 이상 느려짐)")
+    return 1 if regressions else 0
+
+
+def run_scaling(args):
+    width, height = parse_size(args.size)
+    worker_counts = list(range(1, args.max_workers + 1))
+    print(f"띠 병렬 탐색 확장성: {width}x{height}, 반복 {args.repeats}회, CPU {os.cpu_count()}개")
+    print(f"{'작업자':>6} {'시간(ms)':>10} {'속도 향상':>10}")
+    for row in benchmark_scan_workers(width, height, worker_counts, args.repeats):
+        print(f"{row['workers']:>6} {row['ms']:>10.2f} {row['speedup']:>9.2f}x")
+
+
+def run_metrics(args):
+    width, height = parse_size(args.size)
+    print(f"비교 기준별 탐색 시간: {width}x{height}, 반복 {args.repeats}회 (허용 배율: rgb의 {args.max_ratio:.1f}배)")
+    print(f"{'기준':>6} {'시간(ms)':>10} {'rgb 대비':>10}")
+    slow = []
+    for row in benchmark_metrics(width, height, args.repeats, args.metrics):
+        mark = '초과' if row['ratio'] > args.max_ratio else ''
+        print(f"{row['metric']:>6} {row['ms']:>10.2f} {row['ratio']:>9.2f}x {mark}")
+        if mark:
+            slow.append(row['metric'])
+    if slow:
+        print(f"허용 배율을 넘은 기준: {', '.join(slow)}")
+        return 1
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="색상 탐색 성능 측정")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    suite = commands.add_parser('suite', help="크기/방향/대상 위치/허용 오차 조합별 탐색 시간 측정")
+    suite.add_argument('--sizes', nargs='+', help=f"화면 크기 목록 (기본: {' '.join(DEFAULT_SIZES)})")
+    suite.add_argument('--tolerances', nargs='+', type=int, help=f"허용 오차 목록 (기본: {DEFAULT_TOLERANCES})")
+    suite.add_argument('--directions', nargs='+', choices=[d.name for d in SearchDirection], help="탐색 방향 (기본: 전체)")
+    suite.add_argument('--repeats', type=int, default=5)
+    suite.add_argument('--workers', type=int, default=1, help="띠 병렬 탐색 작업자 수")
+    suite.add_argument('--lut', action='store_true', help="색상표(LUT) 탐색 사용")
+    suite.add_argument('--metric', default='rgb', help="색상 비교 기준 (rgb, box, hsv, lab)")
+    suite.add_argument('--output', help="결과 파일 (.json 또는 .csv)")
+    suite.set_defaults(func=run_suite_command)
+
+    compare = commands.add_parser('compare', help="두 결과 파일을 비교하여 회귀를 표시 (회귀가 있으면 종료 코드 1)")
+    compare.add_argument('base', help="기준 결과 파일")
+    compare.add_argument('new', help="비교할 결과 파일")
+    compare.add_argument('--threshold', type=float, default=0.1, help="회귀로 볼 중앙값 증가 비율 (기본 0.1 = 10%%)")
+    compare.add_argument('--min-delta-ms', type=float, default=0.05, help="이보다 작은 절대 차이는 무시 (ms)")
+    compare.add_argument('--top', type=int, default=20, help="변화가 큰 순으로 출력할 조건 수")
+    compare.set_defaults(func=run_compare)
+
+    scaling = commands.add_parser('scaling', help="작업자 수(1~N)에 따른 띠 병렬 탐색 속도")
+    scaling.add_argument('--size', default='3840x2160', help="화면 크기 (예: 1920x1080)")
+    scaling.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    scaling.add_argument('--repeats', type=int, default=20)
+    scaling.set_defaults(func=run_scaling)
+
+    metrics = commands.add_parser('metrics', help="색상 비교 기준별 탐색 시간 (rgb 대비 배율을 넘으면 종료 코드 1)")
+    metrics.add_argument('--size', default='660x450', help="화면 크기 (예: 1920x1080)")
+    metrics.add_argument('--metrics', nargs='+', choices=list(COLOR_METRICS), help="측정할 비교 기준 (기본: 전체)")
+    metrics.add_argument('--repeats', type=int, default=20)
+    metrics.add_argument('--max-ratio', type=float, default=3.0, help="허용하는 rgb 대비 시간 배율 (기본 3.0)")
+    metrics.set_defaults(func=run_metrics)
+
+    args = parser.parse_args(argv)
+    return args.func(args) or 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
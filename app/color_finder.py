@@ -1,9 +1,19 @@
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from pynput import mouse
-from PIL import ImageGrab
+import threading
 import time
 import numpy as np
 
+from .color_search import (
+    MatchScratch, TileScanState, compute_match_mask, compute_metric_mask, find_blob_center, find_blob_center_in_frame, find_blob_cross_in_frame, find_first_conforming_match,
+    find_first_match, find_first_match_pyramid, find_first_match_tiled, find_nearest_conforming_match, find_nearest_match, frame_fingerprint,
+    label_blobs, normalize_blob_constraints, squared_distance_grid,
+)
+from .color_lut import LUT_CACHE_DIR, MAX_LUT_COLORS, TABLE_METRICS, ColorLookupTable, normalize_targets
+from .screen_source import ScreenSource, UnionFrame, create_screen_source
+from .template_search import TemplateMatcher
+
 class SearchDirection(Enum):
     """탐색 방향을 정의합니다."""
     TOP_LEFT_TO_BOTTOM_RIGHT = "→↓"
@@ -14,11 +24,124 @@ class SearchDirection(Enum):
     TOP_TO_BOTTOM_RIGHT_TO_LEFT = "↓←"
     BOTTOM_TO_TOP_LEFT_TO_RIGHT = "↑→"
     BOTTOM_TO_TOP_RIGHT_TO_LEFT = "↑←"
+    NEAREST_TO_ANCHOR = "◎" # 순회 순서 대신 기준점에 가장 가까운 대상
+
+    @property
+    def scan_order(self) -> tuple[bool, bool, bool]:
+        """(세로 우선 여부, 아래→위 여부, 오른쪽→왼쪽 여부)를 반환합니다."""
+        return _SCAN_ORDERS[self]
+
+    @property
+    def is_nearest(self) -> bool:
+        """순회 순서가 아니라 기준점과의 거리로 대상을 고르는 방향인지 여부"""
+        return self is SearchDirection.NEAREST_TO_ANCHOR
+
+# 방향별 픽셀 순회 순서. 기존 이중 루프의 range 구성과 1:1로 대응합니다.
+_SCAN_ORDERS = {
+    SearchDirection.TOP_LEFT_TO_BOTTOM_RIGHT: (False, False, False),
+    SearchDirection.TOP_RIGHT_TO_BOTTOM_LEFT: (False, False, True),
+    SearchDirection.BOTTOM_LEFT_TO_TOP_RIGHT: (False, True, False),
+    SearchDirection.BOTTOM_RIGHT_TO_TOP_LEFT: (False, True, True),
+    SearchDirection.TOP_TO_BOTTOM_LEFT_TO_RIGHT: (True, False, False),
+    SearchDirection.TOP_TO_BOTTOM_RIGHT_TO_LEFT: (True, False, True),
+    SearchDirection.BOTTOM_TO_TOP_LEFT_TO_RIGHT: (True, True, False),
+    SearchDirection.BOTTOM_TO_TOP_RIGHT_TO_LEFT: (True, True, True),
+    # 거리가 같은 후보끼리는 행 우선 순서로 고릅니다.
+    SearchDirection.NEAREST_TO_ANCHOR: (False, False, False),
+}
 
 class ColorFinder:
     """화면에서 특정 색상을 찾고 관련 동작을 수행하는 클래스"""
-    def __init__(self):
-        self.mouse_controller = mouse.Controller()
+    def __init__(self, screen_source: ScreenSource | None = None):
+        self.screen_source = screen_source or create_screen_source()
+        self._mouse_controller = None
+
+        # --- 프레임 지문 캐시 ---
+        # 화면이 지난 탐색 이후 그대로라면 같은 조건의 탐색 결과를 재사용합니다.
+        self.use_frame_cache = True
+        self._scan_cache = {} # (영역, 색상 목록, 방향) -> (프레임 지문, 결과)
+        self.frame_cache_hits = 0 # 재탐색을 건너뛴 횟수
+        self.frame_cache_misses = 0 # 실제로 탐색한 횟수
+        self.last_frame_changed = True # 마지막 탐색의 화면이 같은 조건의 지난 탐색 때와 달랐는지 (캐시를 쓰지 않거나 알 수 없으면 True)
+        self._template_fingerprints = {} # 템플릿 탐색 영역 -> 지난 탐색의 프레임 지문
+
+        # --- 타일 단위 증분 탐색 ---
+        # 연속된 프레임에서 바뀐 타일만 다시 계산합니다. (넓은 좌석 배치도 등에 유리)
+        self.use_tiled_scan = False
+        self.tile_size = 64
+        self._tile_states = {} # 영역 -> TileScanState
+
+        # --- 색상표(LUT) 탐색 ---
+        # (색상, 허용 오차) 조합을 전체 RGB 색상표로 미리 컴파일해 프레임당 한 번의 인덱싱으로 판정합니다.
+        self.use_color_lut = False
+        self.lut_cache_dir = LUT_CACHE_DIR # None이면 디스크 캐시를 사용하지 않습니다.
+        self._color_luts = {} # (정규화된 색상 목록, 비교 기준) -> ColorLookupTable
+
+        # 영역 크기별 일치 계산 작업 버퍼. 같은 영역을 반복 탐색할 때 매 프레임 할당하지 않습니다.
+        # 병렬 탐색 스레드끼리 버퍼를 공유하지 않도록 스레드마다 따로 둡니다.
+        self._scratch_local = threading.local() # .buffers: (높이, 너비) -> MatchScratch
+
+        # --- 기준점 거리 탐색 ---
+        # 영역 크기와 기준점별 거리 제곱 배열. 같은 영역을 반복 탐색할 때 매 프레임 계산하지 않습니다.
+        self._distance_grids = {} # (높이, 너비, 기준 x, 기준 y) -> 거리 제곱 배열
+
+        # --- 최근 발견 위치 우선 탐색 ---
+        # 대상은 새로고침 뒤에도 전에 찾은 자리에 다시 나타나는 경우가 많으므로, 영역 전체를 탐색하기 전에
+        # 최근 발견 위치 주변을 먼저 확인합니다. 없으면 평소처럼 영역 전체를 탐색합니다.
+        # 영역을 한 번 캡처해 프레임 캐시를 먼저 확인하고, 화면이 바뀐 경우에만 그 캡처에서 최근 위치를 확인한 뒤 전체 탐색합니다.
+        # 프레임 캐시를 끈 비엄격 모드에서만 영역 전체 대신 주변의 작은 영역을 캡처합니다.
+        self.use_hotspot_cache = False
+        self.hotspot_strict = True # True이면 방향 순서상 앞선 줄을 모두 확인해 전체 탐색과 같은 결과일 때만 사용합니다.
+        self.hotspot_radius = 24 # 최근 발견 위치 주변 확인 범위 (px)
+        self.hotspot_history = 4 # 영역별로 기억할 최근 발견 위치 수
+        self._hotspots = {} # 영역 -> 최근 발견 위치 deque (화면 절대 좌표, 최근 것이 앞)
+        self.hotspot_hits = 0 # 최근 위치 확인으로 찾은 횟수
+        self.hotspot_misses = 0 # 최근 위치를 확인했지만 전체 탐색으로 넘어간 횟수
+
+        # --- 띠(band) 병렬 탐색 ---
+        # 넓은 영역을 탐색 순서대로 띠로 나누어 여러 스레드에서 동시에 계산합니다. (NumPy 연산 중에는 GIL이 풀립니다)
+        self.scan_workers = 1 # 1이면 병렬 탐색을 사용하지 않습니다.
+        self.parallel_min_pixels = 512 * 512 # 이보다 작은 영역은 스레드 전환 비용이 더 크므로 한 번에 계산합니다.
+        self.bands_per_worker = 4 # 앞선 띠에서 찾으면 뒤쪽 띠를 건너뛸 수 있도록 작업자 수보다 잘게 나눕니다.
+        self._scan_pool: ThreadPoolExecutor | None = None
+
+        # --- 지연 시간 측정 ---
+        # set_latency_stats로 LatencyStats를 연결하면 단계별 소요 시간을 기록합니다. None이면 측정 비용이 없습니다.
+        self.latency_stats = None
+        self._blob_center_elapsed = 0.0 # 현재 탐색에서 blob 중심 계산에 쓴 시간 (탐색 시간에서 제외)
+        self._stats_area = None # 현재 탐색 중인 영역 (영역별 기록용)
+
+        # --- 프레임 기록 / 재생 ---
+        self.frame_recorder = None # FrameRecorder를 연결하면 탐색한 모든 프레임과 결과를 기록합니다.
+        self.dry_run = False # True이면 클릭하지 않고 좌표만 출력합니다. (기록 재생용)
+
+    @property
+    def mouse_controller(self):
+        """
+        마우스 컨트롤러는 처음 사용할 때 생성합니다.
+        디스플레이가 없는 환경에서도 탐색 기능만은 사용할 수 있도록 하기 위함입니다.
+        """
+        if self._mouse_controller is None:
+            from pynput import mouse
+            self._mouse_controller = mouse.Controller()
+        return self._mouse_controller
+
+    def set_screen_source(self, screen_source: ScreenSource):
+        """캡처 백엔드를 교체합니다."""
+        old_source = self.screen_source
+        self.screen_source = screen_source
+        screen_source.latency_stats = self.latency_stats
+        if old_source is not screen_source:
+            old_source.close()
+
+    def set_latency_stats(self, stats):
+        """단계별 지연 시간을 기록할 LatencyStats를 연결합니다. None이면 측정을 끕니다."""
+        self.latency_stats = stats
+        self.screen_source.latency_stats = stats
+
+    def set_frame_recorder(self, recorder):
+        """탐색한 프레임을 기록할 FrameRecorder를 연결합니다. None이면 기록하지 않습니다."""
+        self.frame_recorder = recorder
 
     def _is_color_match(self, c1_rgb: tuple, c2_rgb: tuple, tolerance_sq: int) -> bool:
         """두 색상이 허용 오차 내에 있는지 확인합니다."""
@@ -27,102 +150,623 @@ class ColorFinder:
         dist_sq = (int(r1) - r2)**2 + (int(g1) - g2)**2 + (int(b1) - b2)**2
         return dist_sq <= tolerance_sq
 
-    def _find_blob_center(self, img_array: np.ndarray, start_x: int, start_y: int, color: tuple, tolerance_sq: int) -> tuple[int, int]:
+    def _find_blob_center(self, mask: np.ndarray, start_x: int, start_y: int) -> tuple[int, int]:
         """
         발견된 픽셀을 시작으로 상하좌우로 색상 영역을 스캔하여
         해당 영역(blob)의 중심 좌표를 찾습니다.
+        픽셀 단위 순회 대신 일치 마스크에서 연속 구간을 한 번에 찾습니다.
         """
-        height, width, _ = img_array.shape
-        
-        # 1. 가로 경계 찾기 (x-axis)
-        x_min, x_max = start_x, start_x
-        # 시작점에서 왼쪽으로 스캔
-        for x in range(start_x - 1, -1, -1):
-            if self._is_color_match(img_array[start_y, x][:3], color, tolerance_sq):
-                x_min = x
-            else:
+        return self._timed_blob_center(find_blob_center, mask, start_x, start_y)
+
+    def _find_blob_center_in_frame(self, img_array: np.ndarray, start_x: int, start_y: int, color: tuple, tolerance: int, metric: str = 'rgb') -> tuple[int, int]:
+        """전체 마스크 없이 시작 픽셀의 행과 중심 열만 다시 계산하여 blob 중심을 찾습니다."""
+        return self._timed_blob_center(find_blob_center_in_frame, img_array, start_x, start_y, color, tolerance, metric)
+
+    def _timed_blob_center(self, center_func, *args) -> tuple[int, int]:
+        stats = self.latency_stats
+        if stats is None:
+            return center_func(*args)
+        started = time.perf_counter()
+        center = center_func(*args)
+        elapsed = time.perf_counter() - started
+        self._blob_center_elapsed += elapsed
+        stats.record('blob_center', elapsed, self._stats_area)
+        return center
+
+    def _capture_area(self, area: tuple) -> np.ndarray:
+        """지정된 영역을 캡처 백엔드로 캡처하여 배열로 반환합니다."""
+        return self.screen_source.grab(area)
+
+    def capture_union(self, areas: list) -> UnionFrame | None:
+        """여러 영역의 합집합 영역을 한 번만 캡처합니다. 유효한 영역이 없으면 None을 반환합니다."""
+        areas = [area for area in areas if area[2] > area[0] and area[3] > area[1]]
+        if not areas:
+            return None
+        bbox = (min(a[0] for a in areas), min(a[1] for a in areas), max(a[2] for a in areas), max(a[3] for a in areas))
+        return UnionFrame(self._capture_area(bbox), bbox)
+
+    def _get_tile_state(self, area: tuple) -> TileScanState:
+        """영역별 타일 탐색 상태를 가져옵니다. 타일 크기가 바뀌었으면 새로 만듭니다."""
+        state = self._tile_states.get(area)
+        if state is None or state.tile_size != self.tile_size:
+            state = TileScanState(self.tile_size)
+            self._tile_states[area] = state
+        return state
+
+    def get_color_lut(self, targets: list, metric: str = 'rgb') -> ColorLookupTable:
+        """색상 목록에 대한 색상표를 가져옵니다. 처음 요청될 때만 디스크에서 불러오거나 새로 만듭니다."""
+        key = (normalize_targets(targets), metric)
+        lut = self._color_luts.get(key)
+        if lut is None:
+            lut = ColorLookupTable.load_or_build(key[0], self.lut_cache_dir, metric)
+            self._color_luts[key] = lut
+        return lut
+
+    def prepare_color_luts(self, target_lists):
+        """
+        탐색을 시작하기 전에 사용할 색상표를 미리 준비해, 첫 탐색이 생성 비용을 치르지 않도록 합니다.
+
+        :param target_lists: (색상 목록, 비교 기준) 쌍의 반복 가능 객체
+        """
+        for targets, metric in target_lists:
+            if 0 < len(targets) <= MAX_LUT_COLORS:
+                self.get_color_lut(targets, metric)
+
+    def prepare_metric_tables(self, target_lists):
+        """
+        TABLE_METRICS 기준 색상의 단일 색상표를 미리 준비합니다. 색상표 탐색(use_color_lut)을 쓰지 않아도
+        이 기준들은 색상별 색상표로 판정하므로, 첫 탐색이 생성 비용(색상당 약 1초)을 치르지 않도록 합니다.
+
+        :param target_lists: (색상 목록, 비교 기준) 쌍의 반복 가능 객체
+        """
+        for targets, metric in target_lists:
+            if metric in TABLE_METRICS:
+                for target in targets:
+                    self.get_color_lut([target], metric)
+
+    def _find_in_lut_bits(self, lut: ColorLookupTable, bits: np.ndarray, index: int, direction: SearchDirection, constraints: dict | None = None, anchor: tuple | None = None) -> tuple[int, int] | None:
+        """색상표 조회 결과에서 index번째 색상을 찾아 blob 중심의 상대 좌표를 반환합니다."""
+        mask = lut.match_mask(bits, index)
+        if anchor is not None:
+            found = self._find_nearest(mask, anchor, constraints)
+        elif constraints:
+            found = find_first_conforming_match(mask, constraints, *direction.scan_order)
+        else:
+            found = find_first_match(mask, *direction.scan_order)
+        if found is None:
+            return None
+        return self._find_blob_center(mask, *found)
+
+    def _get_distance_grid(self, shape: tuple, anchor: tuple) -> np.ndarray:
+        """영역 크기와 (영역 기준 상대) 기준점에 맞는 거리 제곱 배열을 가져옵니다. 처음 보는 조합일 때만 계산합니다."""
+        key = (shape[0], shape[1], anchor[0], anchor[1])
+        grid = self._distance_grids.get(key)
+        if grid is None:
+            if len(self._distance_grids) >= 16: # 영역이나 기준점이 계속 바뀌는 경우 무한히 커지지 않도록 합니다.
+                self._distance_grids.clear()
+            grid = squared_distance_grid(shape[0], shape[1], anchor[0], anchor[1])
+            self._distance_grids[key] = grid
+        return grid
+
+    def _find_nearest(self, mask: np.ndarray, anchor: tuple, constraints: dict | None = None) -> tuple[int, int] | None:
+        """일치 마스크에서 (영역 기준 상대) 기준점에 가장 가까운 일치 픽셀을 찾습니다. 모양 제약이 있으면 통과한 blob만 봅니다."""
+        if constraints:
+            return find_nearest_conforming_match(mask, constraints, anchor[0], anchor[1])
+        return find_nearest_match(mask, self._get_distance_grid(mask.shape, anchor))
+
+    def _get_match_scratch(self, shape: tuple) -> MatchScratch:
+        """현재 스레드에서 영역 크기에 맞는 일치 계산 작업 버퍼를 가져옵니다. 처음 보는 크기일 때만 할당합니다."""
+        buffers = getattr(self._scratch_local, 'buffers', None)
+        if buffers is None:
+            buffers = self._scratch_local.buffers = {}
+        scratch = buffers.get(shape)
+        if scratch is None:
+            scratch = MatchScratch(shape)
+            buffers[shape] = scratch
+        return scratch
+
+    def _compute_mask(self, rgb: np.ndarray, color: tuple, tolerance: int, metric: str = 'rgb') -> np.ndarray:
+        """
+        일치 마스크를 계산합니다. RGB 거리 기준은 현재 스레드의 작업 버퍼에 결과를 씁니다.
+        TABLE_METRICS 기준은 색상별 색상표를 한 번 조회해 판정합니다. (색 공간 변환을 매 프레임 하지 않습니다)
+        """
+        if metric == 'rgb':
+            return compute_match_mask(rgb, color, tolerance**2, self._get_match_scratch(rgb.shape[:2]))
+        if metric in TABLE_METRICS:
+            lut = self.get_color_lut([(color, tolerance)], metric)
+            return lut.match_mask(lut.lookup(rgb), 0)
+        return compute_metric_mask(rgb, color, tolerance, metric)
+
+    def set_scan_workers(self, count: int):
+        """병렬 탐색 작업자 수를 설정합니다. 스레드 풀은 탐색 사이에 유지되며, 수가 바뀔 때만 다시 만듭니다."""
+        count = max(1, int(count))
+        if count != self.scan_workers:
+            self.shutdown_scan_pool()
+            self.scan_workers = count
+
+    def shutdown_scan_pool(self):
+        """병렬 탐색 스레드 풀을 정리합니다."""
+        if self._scan_pool is not None:
+            self._scan_pool.shutdown(wait=False, cancel_futures=True)
+            self._scan_pool = None
+
+    def _get_scan_pool(self) -> ThreadPoolExecutor:
+        if self._scan_pool is None:
+            self._scan_pool = ThreadPoolExecutor(max_workers=self.scan_workers, thread_name_prefix='color-scan')
+        return self._scan_pool
+
+    def _find_in_bands(self, img_array: np.ndarray, color: tuple, tolerance: int, direction: SearchDirection, metric: str = 'rgb') -> tuple[int, int] | None:
+        """
+        영역을 탐색 순서의 바깥 축(행 우선이면 행, 세로 우선이면 열)을 따라 띠로 나누어 병렬로 탐색합니다.
+        앞선 띠의 모든 픽셀은 뒤쪽 띠보다 먼저 순회되므로, 일치가 있는 가장 앞선 띠의 첫 픽셀이 전체의 첫 픽셀입니다.
+        앞선 띠에서 이미 찾았다면 아직 시작하지 않은 뒤쪽 띠는 계산하지 않습니다.
+        """
+        column_major, bottom_up, right_to_left = direction.scan_order
+        length = img_array.shape[1] if column_major else img_array.shape[0]
+        band_count = max(1, min(self.scan_workers * self.bands_per_worker, length // 16))
+        edges = [length * i // band_count for i in range(band_count + 1)]
+        bands = list(zip(edges[:-1], edges[1:]))
+        if (right_to_left if column_major else bottom_up):
+            bands.reverse()
+
+        first_hit = [len(bands)] # 일치를 찾은 가장 앞선 띠의 순번
+        lock = threading.Lock()
+
+        def scan_band(order: int, start: int, stop: int):
+            if order > first_hit[0]:
+                return None
+            band = img_array[:, start:stop] if column_major else img_array[start:stop]
+            found = find_first_match(self._compute_mask(band, color, tolerance, metric), column_major, bottom_up, right_to_left)
+            if found is None:
+                return None
+            with lock:
+                first_hit[0] = min(first_hit[0], order)
+            x, y = found
+            return (x + start, y) if column_major else (x, y + start)
+
+        pool = self._get_scan_pool()
+        futures = [pool.submit(scan_band, order, start, stop) for order, (start, stop) in enumerate(bands)]
+        found = None
+        for future in futures:
+            found = future.result()
+            if found is not None:
                 break
-        # 시작점에서 오른쪽으로 스캔
-        for x in range(start_x + 1, width):
-            if self._is_color_match(img_array[start_y, x][:3], color, tolerance_sq):
-                x_max = x
-            else:
+        for future in futures:
+            future.cancel()
+        if found is None:
+            return None
+
+        # 찾은 픽셀이 띠 경계에 걸친 blob에 속할 수 있으므로 중심은 전체 프레임에서 구합니다.
+        return self._find_blob_center_in_frame(img_array, found[0], found[1], color, tolerance, metric)
+
+    def _find_in_array(self, img_array: np.ndarray, color: tuple, tolerance: int, direction: SearchDirection, tile_state: TileScanState | None = None, pyramid_factor: int = 0, min_target_size: int = 0, metric: str = 'rgb', constraints: dict | None = None, anchor: tuple | None = None) -> tuple[int, int] | None:
+        """캡처된 배열에서 색상을 찾아 blob 중심의 상대 좌표를 반환합니다."""
+        # 성능을 위해 제곱된 허용 오차를 사용합니다.
+        tolerance_sq = tolerance**2
+
+        if anchor is not None:
+            # 기준점과의 거리는 영역 전체의 일치 픽셀을 비교해야 하므로 전체 마스크를 한 번에 계산합니다.
+            mask = self._compute_mask(img_array, color, tolerance, metric)
+            found = self._find_nearest(mask, anchor, constraints)
+            if found is None:
+                return None
+            return self._find_blob_center(mask, *found)
+
+        if constraints:
+            # 모양 제약은 blob 전체의 크기를 알아야 하므로 영역 전체 마스크를 한 번에 분류합니다.
+            mask = self._compute_mask(img_array, color, tolerance, metric)
+            found = find_first_conforming_match(mask, constraints, *direction.scan_order)
+            if found is None:
+                return None
+            return self._find_blob_center(mask, *found)
+
+        if min_target_size > 2:
+            # 대상이 N x N 이상이면 N-1 간격 격자점 중 하나는 반드시 대상 위에 놓입니다.
+            stride = min_target_size - 1
+            lattice_mask = self._compute_mask(img_array[::stride, ::stride], color, tolerance, metric)
+            found = find_first_match(lattice_mask, *direction.scan_order)
+            if found is None:
+                return None
+            return self._find_blob_center_in_frame(img_array, found[0] * stride, found[1] * stride, color, tolerance, metric)
+
+        if pyramid_factor > 1:
+            # 축소 화면에서 후보 칸을 찾고, 후보 칸 안에서만 원본 해상도로 확인합니다.
+            found = find_first_match_pyramid(img_array, color, tolerance_sq, pyramid_factor, *direction.scan_order)
+            if found is None:
+                return None
+            return self._find_blob_center_in_frame(img_array, found[0], found[1], color, tolerance)
+
+        if tile_state is None and self.scan_workers > 1 and img_array.shape[0] * img_array.shape[1] >= self.parallel_min_pixels:
+            return self._find_in_bands(img_array, color, tolerance, direction, metric)
+
+        if tile_state is not None:
+            # 바뀐 타일만 다시 계산하고, 일치하는 타일이 있는 줄 안에서만 첫 픽셀을 찾습니다.
+            mask, tile_any = tile_state.match_mask(img_array, color, tolerance_sq)
+            found = find_first_match_tiled(mask, tile_any, tile_state.tile_size, *direction.scan_order)
+        else:
+            # 영역 전체의 일치 여부를 한 번에 계산한 뒤, 탐색 방향 순서상 첫 픽셀을 찾습니다.
+            mask = self._compute_mask(img_array, color, tolerance, metric)
+            found = find_first_match(mask, *direction.scan_order)
+        if found is None:
+            return None
+
+        x, y = found
+        return self._find_blob_center(mask, x, y)
+
+    def _grab_region(self, region: tuple, frame: UnionFrame | None = None) -> np.ndarray:
+        """합집합 프레임이 영역을 포함하면 그 조각을, 아니면 새로 캡처한 배열을 반환합니다."""
+        if frame is not None and frame.contains(region):
+            return frame.crop(region)
+        return self._capture_area(region)
+
+    def _remember_hotspot(self, area: tuple, pos: tuple):
+        """영역의 최근 발견 위치 목록 맨 앞에 pos를 넣습니다. 같은 자리 근처의 이전 기록은 지웁니다."""
+        history = self._hotspots.get(area)
+        if history is None or history.maxlen != self.hotspot_history:
+            history = deque(history or (), maxlen=max(1, self.hotspot_history))
+            self._hotspots[area] = history
+        radius = self.hotspot_radius
+        for old in [old for old in history if abs(old[0] - pos[0]) <= radius and abs(old[1] - pos[1]) <= radius]:
+            history.remove(old)
+        history.appendleft(tuple(pos))
+
+    def reset_hotspots(self):
+        """기억한 최근 발견 위치를 모두 지웁니다."""
+        self._hotspots.clear()
+
+    def _hotspot_rois(self, area: tuple) -> list:
+        """영역의 최근 발견 위치마다 주변 확인 영역을 (영역 안으로 잘라) 최근 것부터 반환합니다."""
+        x1, y1, x2, y2 = area
+        radius = self.hotspot_radius
+        rois = []
+        for x, y in self._hotspots.get(area, ()):
+            roi = (max(x1, x - radius), max(y1, y - radius), min(x2, x + radius + 1), min(y2, y + radius + 1))
+            if roi[2] > roi[0] and roi[3] > roi[1]:
+                rois.append(roi)
+        return rois
+
+    def _hotspot_regions(self, area: tuple, direction: SearchDirection) -> list:
+        """
+        확인할 영역 목록을 만듭니다.
+        엄격 모드에서는 각 확인 영역을 탐색 순서상 바깥 축(행 우선이면 행, 세로 우선이면 열)으로 영역 끝까지 넓힌 뒤,
+        앞선 것부터 아직 확인하지 않은 줄만 잘라 냅니다. 앞선 줄에 일치가 없으면 이번 줄의 첫 일치가 영역 전체의 첫 일치입니다.
+        """
+        rois = self._hotspot_rois(area)
+        if not self.hotspot_strict:
+            return rois
+        column_major, bottom_up, right_to_left = direction.scan_order
+        x1, y1, x2, y2 = area
+        low, high = (x1, x2) if column_major else (y1, y2)
+        reverse = right_to_left if column_major else bottom_up
+        # 바깥 축의 (시작, 끝) 구간
+        spans = [(roi[0], roi[2]) if column_major else (roi[1], roi[3]) for roi in rois]
+        regions = []
+        if reverse:
+            covered = high
+            for start, _ in sorted(spans, reverse=True):
+                if start < covered:
+                    regions.append((start, covered))
+                    covered = start
+        else:
+            covered = low
+            for _, stop in sorted(spans):
+                if stop > covered:
+                    regions.append((covered, stop))
+                    covered = stop
+        return [(start, y1, stop, y2) if column_major else (x1, start, x2, stop) for start, stop in regions]
+
+    def _hotspot_blob_center(self, area: tuple, region: tuple, img_array: np.ndarray, start: tuple, color: tuple, tolerance: int, metric: str, frame: UnionFrame | None) -> tuple[int, int]:
+        """
+        확인 영역에서 찾은 시작 픽셀(화면 절대 좌표)의 blob 중심을 구합니다.
+        중심 계산에 쓰는 십자 구간이 확인 영역 경계(영역 경계 제외)에 닿으면 blob이 잘렸을 수 있으므로,
+        닿은 쪽으로 확인 영역을 두 배씩 넓혀 다시 캡처하고 계산합니다.
+        :return: blob 중심의 화면 절대 좌표
+        """
+        while True:
+            left, top, right, bottom = region
+            x_min, x_max, y_min, y_max = self._timed_blob_center(
+                find_blob_cross_in_frame, img_array, start[0] - left, start[1] - top, color, tolerance, metric,
+            )
+            grow_left = x_min == 0 and left > area[0]
+            grow_right = x_max == right - left - 1 and right < area[2]
+            grow_up = y_min == 0 and top > area[1]
+            grow_down = y_max == bottom - top - 1 and bottom < area[3]
+            if not (grow_left or grow_right or grow_up or grow_down):
+                return left + (x_min + x_max) // 2, top + (y_min + y_max) // 2
+            width, height = right - left, bottom - top
+            region = (
+                max(area[0], left - width) if grow_left else left,
+                max(area[1], top - height) if grow_up else top,
+                min(area[2], right + width) if grow_right else right,
+                min(area[3], bottom + height) if grow_down else bottom,
+            )
+            img_array = self._grab_region(region, frame)
+
+    def _find_in_hotspots(self, area: tuple, targets: list, direction: SearchDirection, metric: str, frame: UnionFrame | None) -> tuple | None:
+        """
+        최근 발견 위치 주변에서 먼저 찾습니다.
+        엄격 모드에서는 1순위 색상만 확인합니다. 하위 색상은 상위 색상이 영역 어디에도 없어야 하므로 전체 탐색이 필요합니다.
+        :return: (targets 인덱스, (x, y)) 또는 None
+        """
+        stats = self.latency_stats
+        if stats is not None:
+            self._blob_center_elapsed = 0.0
+            started = time.perf_counter()
+        found_result = None
+        candidate_targets = targets[:1] if self.hotspot_strict else targets
+        for region in self._hotspot_regions(area, direction):
+            img_array = self._grab_region(region, frame)
+            for index, (color, tolerance) in enumerate(candidate_targets):
+                found = find_first_match(self._compute_mask(img_array, color, tolerance, metric), *direction.scan_order)
+                if found is not None:
+                    start = (region[0] + found[0], region[1] + found[1])
+                    found_result = index, self._hotspot_blob_center(area, region, img_array, start, color, tolerance, metric, frame)
+                    break
+            if found_result is not None:
                 break
-        
-        center_x = (x_min + x_max) // 2
-
-        # 2. 세로 경계 찾기 (y-axis at a horizontal center)
-        y_min, y_max = start_y, start_y
-        # 중심 x좌표에서 위쪽으로 스캔
-        for y in range(start_y - 1, -1, -1):
-            if self._is_color_match(img_array[y, center_x][:3], color, tolerance_sq):
-                y_min = y
+        if stats is not None:
+            stats.record('hotspot', time.perf_counter() - started - self._blob_center_elapsed, self._stats_area)
+        return found_result
+
+    def find_color_in_area(self, area: tuple, color: tuple, tolerance: int, direction: SearchDirection) -> tuple[int, int] | None:
+        """
+        지정된 영역(area)에서 주어진 색상(color)을 허용 오차(tolerance) 내에서 찾습니다.
+        지정된 방향으로 픽셀을 순회했을 때 처음 만나는 픽셀을 기준으로 합니다.
+        """
+        found = self.find_colors_in_area(area, [(color, tolerance)], direction)
+        if found is None:
+            return None
+        return found[1]
+
+    def find_colors_in_area(self, area: tuple, targets: list, direction: SearchDirection, pyramid_factor: int = 0, min_target_size: int = 0, metric: str = 'rgb', frame: UnionFrame | None = None, blob_constraints: dict | None = None, anchor: tuple | None = None) -> tuple[int, tuple[int, int]] | None:
+        """
+        한 번의 캡처로 여러 색상을 우선순위 순서대로 찾습니다.
+
+        :param targets: [(색상, 허용 오차), ...] 형태의 목록. 앞에 있을수록 우선순위가 높습니다.
+        :param pyramid_factor: 2 이상이면 이 배율로 줄인 화면에서 후보를 먼저 찾는 피라미드 탐색을 사용합니다.
+                               한 변이 2 * pyramid_factor 픽셀 이상인 대상만 확실히 찾을 수 있습니다.
+        :param min_target_size: 3 이상이면 대상이 항상 N x N 픽셀 이상이라고 보고 N-1 간격의 격자점만 검사합니다.
+                                격자점에서 찾은 blob의 중심을 반환하며, pyramid_factor보다 우선합니다.
+        :param metric: 색상 비교 기준 ('rgb', 'box', 'hsv', 'lab'). 'rgb' 이외의 기준에서는
+                       RGB 거리 전용인 피라미드/타일 탐색을 사용하지 않습니다.
+        :param frame: 이미 캡처한 합집합 프레임. 영역을 포함하면 새로 캡처하지 않고 그 조각을 탐색합니다.
+        :param blob_constraints: blob 모양 제약 (BLOB_CONSTRAINT_KEYS). 제약을 만족하지 않는 blob은 건너뛰고
+                                 탐색 방향상 다음 후보를 찾으며, 이때는 피라미드/격자점/타일/띠 병렬 탐색을 사용하지 않습니다.
+        :param anchor: NEAREST_TO_ANCHOR 방향에서 거리를 잴 기준점 (화면 절대 좌표). None이면 영역 중심을 사용합니다.
+                       이 방향은 영역 전체를 비교하므로 피라미드/격자점/타일/띠 병렬 탐색을 사용하지 않습니다.
+        use_hotspot_cache가 켜져 있으면 프레임 캐시 확인 뒤, 영역 전체를 탐색하기 전에 최근 발견 위치 주변을 먼저 확인합니다. (hotspot_strict 참고)
+        :return: (찾은 색상의 targets 인덱스, (x, y)) 또는 None
+        """
+        x1, y1, x2, y2 = area
+        if not (x2 > x1 and y2 > y1) or not targets:
+            self.last_frame_changed = True
+            return None
+
+        constraints = normalize_blob_constraints(blob_constraints)
+        whole_mask = bool(constraints) or direction.is_nearest
+        if metric != 'rgb' or whole_mask:
+            pyramid_factor = 0
+        if whole_mask:
+            min_target_size = 0
+
+        # 최근 발견 위치 주변을 먼저 확인합니다. 모양 제약과 기준점 거리 탐색은 영역 전체를 봐야 하므로 제외합니다.
+        # 피라미드/격자점 탐색은 원본 해상도 확인과 시작 픽셀이 달라 전체 탐색과 결과가 다를 수 있으므로 역시 제외합니다.
+        use_hotspots = self.use_hotspot_cache and not whole_mask and pyramid_factor <= 1 and min_target_size <= 2
+        probe_hotspots = use_hotspots and bool(self._hotspots.get(tuple(area)))
+        if probe_hotspots and not self.hotspot_strict and not self.use_frame_cache and (frame is None or not frame.contains(area)):
+            # 비엄격 모드에서 프레임 캐시를 쓰지 않으면 영역 전체를 캡처하기 전에 최근 위치 주변만 캡처해 확인합니다.
+            self._stats_area = tuple(area)
+            result = self._find_in_hotspots(tuple(area), targets, direction, metric, frame)
+            if result is not None:
+                self.hotspot_hits += 1
+                self.last_frame_changed = True # 영역 전체를 지난 탐색과 비교하지 않았으므로 바뀐 것으로 봅니다.
+                self._remember_hotspot(tuple(area), result[1])
+                if self.frame_recorder is not None:
+                    # 재생은 탐색한 영역 단위로 프레임을 내주므로 확인 영역이 아니라 영역 전체를 기록합니다.
+                    self.frame_recorder.record(self._capture_area(area), area, targets, direction, metric, pyramid_factor, min_target_size, result, constraints, anchor)
+                return result
+            self.hotspot_misses += 1
+            probe_hotspots = False
+
+        if frame is not None and frame.contains(area):
+            img_array = frame.crop(area)
+        else:
+            img_array = self._capture_area(area)
+            # 최근 위치 확인과 전체 탐색이 이 캡처 한 장을 나눠 씁니다.
+            frame = UnionFrame(img_array, tuple(area))
+        anchor_rel = None
+        if direction.is_nearest:
+            anchor_x, anchor_y = anchor if anchor is not None else ((x1 + x2) // 2, (y1 + y2) // 2)
+            anchor_rel = (int(anchor_x) - x1, int(anchor_y) - y1)
+
+        # 지난 탐색과 화면이 같으면 저장된 결과를 바로 반환합니다. 최근 위치 확인보다 먼저 하므로 화면이 그대로일 때는 탐색 비용이 없습니다.
+        if self.use_frame_cache:
+            # 비엄격 모드의 최근 위치 결과는 전체 탐색 결과와 다를 수 있으므로 따로 저장합니다.
+            cache_key = (tuple(area), tuple((tuple(color), tolerance) for color, tolerance in targets), direction, pyramid_factor, min_target_size, metric, tuple(sorted(constraints.items())), anchor_rel, use_hotspots and not self.hotspot_strict)
+            fingerprint = frame.fingerprint
+            cached = self._scan_cache.get(cache_key)
+            if cached is not None and cached[0] == fingerprint:
+                self.frame_cache_hits += 1
+                self.last_frame_changed = False
+                if self.frame_recorder is not None:
+                    self.frame_recorder.record(img_array, area, targets, direction, metric, pyramid_factor, min_target_size, cached[1], constraints, anchor)
+                return cached[1]
+            self.frame_cache_misses += 1
+        self.last_frame_changed = True
+
+        result = None
+        if probe_hotspots:
+            self._stats_area = tuple(area)
+            result = self._find_in_hotspots(tuple(area), targets, direction, metric, frame)
+            if result is not None:
+                self.hotspot_hits += 1
             else:
-                break
-        # 중심 x좌표에서 아래쪽으로 스캔
-        for y in range(start_y + 1, height):
-            if self._is_color_match(img_array[y, center_x][:3], color, tolerance_sq):
-                y_max = y
+                self.hotspot_misses += 1
+
+        if result is None:
+            result = self._scan_area(area, img_array, targets, direction, pyramid_factor, min_target_size, metric, constraints, anchor_rel)
+
+        if self.use_frame_cache:
+            if len(self._scan_cache) >= 64: # 탐색 조건이 계속 바뀌는 경우 캐시가 무한히 커지지 않도록 합니다.
+                self._scan_cache.clear()
+            self._scan_cache[cache_key] = (fingerprint, result)
+        if use_hotspots and result is not None:
+            self._remember_hotspot(tuple(area), result[1])
+        if self.frame_recorder is not None:
+            self.frame_recorder.record(img_array, area, targets, direction, metric, pyramid_factor, min_target_size, result, constraints, anchor)
+        return result
+
+    def _scan_area(self, area: tuple, img_array: np.ndarray, targets: list, direction: SearchDirection, pyramid_factor: int, min_target_size: int, metric: str, constraints: dict, anchor_rel: tuple | None) -> tuple[int, tuple[int, int]] | None:
+        """캡처한 영역 전체를 우선순위 순서대로 탐색합니다. (find_colors_in_area의 전체 탐색 단계)"""
+        x1, y1 = area[:2]
+        stats = self.latency_stats
+        if stats is not None:
+            self._stats_area = tuple(area)
+            self._blob_center_elapsed = 0.0
+            scan_started = time.perf_counter()
+
+        # 타일 상태는 타일 탐색을 실제로 하는 경우에만 갱신합니다. 피라미드/격자점 탐색은 타일 마스크를 쓰지 않습니다.
+        tile_state = None
+        if self.use_tiled_scan and metric == 'rgb' and not constraints and anchor_rel is None and pyramid_factor <= 1 and min_target_size <= 2:
+            tile_state = self._get_tile_state(tuple(area))
+            tile_state.update_frame(img_array)
+
+        # 색상표는 전체 영역 탐색에만 사용합니다. 모든 색상의 비트를 한 번의 조회로 얻습니다.
+        lut = lut_bits = None
+        if self.use_color_lut and tile_state is None and pyramid_factor <= 1 and min_target_size <= 2 and len(targets) <= MAX_LUT_COLORS:
+            lut = self.get_color_lut(targets, metric)
+            lut_bits = lut.lookup(img_array)
+
+        result = None
+        for index, (color, tolerance) in enumerate(targets):
+            if lut_bits is not None:
+                found = self._find_in_lut_bits(lut, lut_bits, index, direction, constraints, anchor_rel)
             else:
+                found = self._find_in_array(img_array, color, tolerance, direction, tile_state, pyramid_factor, min_target_size, metric, constraints, anchor_rel)
+            if found is not None:
+                center_x_rel, center_y_rel = found
+                result = index, (x1 + center_x_rel, y1 + center_y_rel)
                 break
-        
-        center_y = (y_min + y_max) // 2
-        
-        return center_x, center_y
 
-    def find_color_in_area(self, area: tuple, color: tuple, tolerance: int, direction: SearchDirection) -> tuple[int, int] | None:
+        if stats is not None:
+            stats.record('scan', time.perf_counter() - scan_started - self._blob_center_elapsed, self._stats_area)
+        return result
+
+    def get_frame_cache_stats(self) -> dict:
+        """프레임 지문 캐시의 적중(탐색 생략)/미적중(실제 탐색) 횟수를 반환합니다."""
+        total = self.frame_cache_hits + self.frame_cache_misses
+        return {
+            'hits': self.frame_cache_hits,
+            'misses': self.frame_cache_misses,
+            'hit_rate': self.frame_cache_hits / total if total else 0.0,
+        }
+
+    def reset_frame_cache(self):
+        """저장된 탐색 결과, 타일 탐색 상태와 적중 횟수를 초기화합니다. 최근 발견 위치는 유지합니다."""
+        self._scan_cache.clear()
+        self._template_fingerprints.clear()
+        self._tile_states.clear()
+        self.frame_cache_hits = 0
+        self.frame_cache_misses = 0
+        self.hotspot_hits = 0
+        self.hotspot_misses = 0
+
+    def get_hotspot_stats(self) -> dict:
+        """최근 위치 확인으로 찾은 횟수와 전체 탐색으로 넘어간 횟수를 반환합니다."""
+        total = self.hotspot_hits + self.hotspot_misses
+        return {
+            'hits': self.hotspot_hits,
+            'misses': self.hotspot_misses,
+            'hit_rate': self.hotspot_hits / total if total else 0.0,
+        }
+
+    def find_all_blobs(self, area: tuple, color: tuple, tolerance: int, min_area: int = 1, metric: str = 'rgb') -> np.ndarray:
         """
-        지정된 영역(area)에서 주어진 색상(color)을 허용 오차(tolerance) 내에서 찾습니다.
-        지정된 방향으로 픽셀을 순회합니다.
+        지정된 영역에서 색상이 일치하는 모든 연결 영역(blob)을 찾습니다.
+        픽셀 수가 min_area 미만인 blob(안티앨리어싱 점, 1px 테두리 등)은 제외합니다.
+
+        :return: BLOB_DTYPE 구조화 배열 (area, x1, y1, x2, y2, cx, cy). 좌표는 화면 절대 좌표입니다.
         """
         x1, y1, x2, y2 = area
         if not (x2 > x1 and y2 > y1):
-            return None
+            return label_blobs(np.zeros((0, 0), dtype=bool))
 
-        screenshot = ImageGrab.grab(bbox=(x1, y1, x2, y2))
-        img_array = np.array(screenshot)
-        height, width, _ = img_array.shape
-        
-        # 성능을 위해 제곱된 허용 오차를 사용합니다.
-        tolerance_sq = tolerance**2
+        img_array = self._capture_area(area)
+        mask = self._compute_mask(img_array, color, tolerance, metric)
+        blobs = label_blobs(mask)
+        blobs = blobs[blobs['area'] >= min_area]
+
+        # 영역 기준 상대 좌표를 화면 절대 좌표로 변환합니다.
+        blobs['x1'] += x1
+        blobs['x2'] += x1
+        blobs['cx'] += x1
+        blobs['y1'] += y1
+        blobs['y2'] += y1
+        blobs['cy'] += y1
+        return blobs
+
+    def find_templates_in_area(self, area: tuple, matcher: TemplateMatcher, direction: SearchDirection, threshold: float = 0.85, max_results: int | None = None, frame: UnionFrame | None = None, anchor: tuple | None = None) -> list:
+        """
+        지정된 영역에서 템플릿(기준 패치)과 모양이 같은 위치를 모두 찾아 탐색 방향 순서로 반환합니다.
+
+        :param threshold: 정규화 상호상관 점수의 하한 (-1~1, 1이면 완전히 같은 모양)
+        :param frame: 이미 캡처한 합집합 프레임. 영역을 포함하면 새로 캡처하지 않고 그 조각을 탐색합니다.
+        :param anchor: NEAREST_TO_ANCHOR 방향에서 기준점 (화면 절대 좌표). None이면 영역 중심이며, 기준점에 가까운 순서로 반환합니다.
+        :return: [(x, y, 점수), ...] 템플릿 중심의 화면 절대 좌표
+        """
+        x1, y1, x2, y2 = area
+        if not (x2 > x1 and y2 > y1):
+            self.last_frame_changed = True
+            return []
+
+        if frame is not None and frame.contains(area):
+            img_array = frame.crop(area)
+        else:
+            img_array = self._capture_area(area)
+            frame = None
 
-        # 가로 우선 탐색 (기존 방식)
-        if direction in [SearchDirection.TOP_LEFT_TO_BOTTOM_RIGHT, SearchDirection.TOP_RIGHT_TO_BOTTOM_LEFT, SearchDirection.BOTTOM_LEFT_TO_TOP_RIGHT, SearchDirection.BOTTOM_RIGHT_TO_TOP_LEFT]:
-            if direction == SearchDirection.TOP_LEFT_TO_BOTTOM_RIGHT:
-                y_range, x_range = range(height), range(width)
-            elif direction == SearchDirection.TOP_RIGHT_TO_BOTTOM_LEFT:
-                y_range, x_range = range(height), range(width - 1, -1, -1)
-            elif direction == SearchDirection.BOTTOM_LEFT_TO_TOP_RIGHT:
-                y_range, x_range = range(height - 1, -1, -1), range(width)
-            else: # BOTTOM_RIGHT_TO_TOP_LEFT
-                y_range, x_range = range(height - 1, -1, -1), range(width - 1, -1, -1)
-            
-            for y in y_range:
-                for x in x_range:
-                    if self._is_color_match(img_array[y, x][:3], color, tolerance_sq):
-                        center_x_rel, center_y_rel = self._find_blob_center(img_array, x, y, color, tolerance_sq)
-                        return x1 + center_x_rel, y1 + center_y_rel
-        # 세로 우선 탐색 (새로 추가)
+        # 폴링 조절용으로 같은 영역의 지난 템플릿 탐색과 화면이 같은지만 기록합니다.
+        if self.use_frame_cache:
+            fingerprint = frame.fingerprint if frame is not None else frame_fingerprint(img_array)
+            self.last_frame_changed = self._template_fingerprints.get(tuple(area)) != fingerprint
+            self._template_fingerprints[tuple(area)] = fingerprint
         else:
-            if direction == SearchDirection.TOP_TO_BOTTOM_LEFT_TO_RIGHT:
-                x_range, y_range = range(width), range(height)
-            elif direction == SearchDirection.TOP_TO_BOTTOM_RIGHT_TO_LEFT:
-                x_range, y_range = range(width - 1, -1, -1), range(height)
-            elif direction == SearchDirection.BOTTOM_TO_TOP_LEFT_TO_RIGHT:
-                x_range, y_range = range(width), range(height - 1, -1, -1)
-            else: # BOTTOM_TO_TOP_RIGHT_TO_LEFT
-                x_range, y_range = range(width - 1, -1, -1), range(height - 1, -1, -1)
-
-            for x in x_range:
-                for y in y_range:
-                    if self._is_color_match(img_array[y, x][:3], color, tolerance_sq):
-                        center_x_rel, center_y_rel = self._find_blob_center(img_array, x, y, color, tolerance_sq)
-                        return x1 + center_x_rel, y1 + center_y_rel
-
-        return None
+            self.last_frame_changed = True
+
+        stats = self.latency_stats
+        if stats is not None:
+            scan_started = time.perf_counter()
+        if direction.is_nearest:
+            matches = matcher.find_matches(img_array, threshold, *direction.scan_order)
+            anchor_x, anchor_y = anchor if anchor is not None else ((x1 + x2) // 2, (y1 + y2) // 2)
+            # 정렬은 안정 정렬이므로 거리가 같으면 행 우선 순서가 유지됩니다.
+            matches.sort(key=lambda match: (x1 + match[0] - anchor_x) ** 2 + (y1 + match[1] - anchor_y) ** 2)
+            matches = matches[:max_results] if max_results is not None else matches
+        else:
+            matches = matcher.find_matches(img_array, threshold, *direction.scan_order, max_results=max_results)
+        if stats is not None:
+            stats.record('scan', time.perf_counter() - scan_started, tuple(area))
+        return [(x1 + x, y1 + y, score) for x, y, score in matches]
+
+    def find_template_in_area(self, area: tuple, matcher: TemplateMatcher, direction: SearchDirection, threshold: float = 0.85, frame: UnionFrame | None = None, anchor: tuple | None = None) -> tuple[int, int] | None:
+        """탐색 방향 순서상 첫 번째 템플릿 위치(중심 좌표)를 반환합니다. 없으면 None을 반환합니다."""
+        matches = self.find_templates_in_area(area, matcher, direction, threshold, max_results=1, frame=frame, anchor=anchor)
+        if not matches:
+            return None
+        x, y, _ = matches[0]
+        return x, y
 
     def click_action(self, x: int, y: int):
         """지정된 좌표로 마우스를 이동하고 클릭합니다."""
+        if self.dry_run:
+            print(f"(재생) 클릭 생략: ({x}, {y})")
+            return
+        stats = self.latency_stats
+        if stats is not None:
+            started = time.perf_counter()
         self.mouse_controller.position = (x, y)
         time.sleep(0.05) # 마우스 이동 후 안정화를 위한 짧은 대기
-        self.mouse_controller.click(mouse.Button.left, 1)
\ No newline at end of file
+        from pynput import mouse
+        self.mouse_controller.click(mouse.Button.left, 1)
+        if stats is not None:
+            stats.record('click', time.perf_counter() - started)
\ No newline at end of file
@@ -0,0 +1,110 @@
+import hashlib
+import os
+import numpy as np
+
+from .color_search import compute_metric_mask
+
+# 컴파일된 색상표를 저장하는 기본 위치. 프로필을 바꿔도 같은 색상 조합이면 다시 만들지 않습니다.
+LUT_CACHE_DIR = os.path.join(os.path.expanduser('~'), '.outtic', 'lut_cache')
+# 색상표 생성 방식이 바뀌면 올려서 이전 캐시 파일을 무시하도록 합니다.
+LUT_FORMAT_VERSION = 1
+# 한 색상표가 공유할 수 있는 최대 색상 수 (uint8 항목의 비트 수)
+MAX_LUT_COLORS = 8
+LUT_SIZE = 1 << 24
+# 색 공간 변환이 필요해 직접 계산하면 RGB 거리보다 한 자릿수 이상 느린 비교 기준.
+# ColorFinder는 이 기준들을 use_color_lut 설정과 관계없이 색상표로 판정하여 픽셀당 조회 한 번으로 만듭니다.
+TABLE_METRICS = ('hsv', 'lab')
+
+
+def rgb_index(frame: np.ndarray) -> np.ndarray:
+    """(높이, 너비, 3) RGB 배열을 색상표 인덱스 (R << 16) | (G << 8) | B 배열로 변환합니다."""
+    index = frame[..., 0].astype(np.int32)
+    index <<= 8
+    index |= frame[..., 1]
+    index <<= 8
+    index |= frame[..., 2]
+    return index
+
+
+def build_color_lut(targets: list, metric: str = 'rgb') -> np.ndarray:
+    """
+    전체 RGB 공간(2^24색)에 대해 색상별 일치 여부를 미리 계산합니다.
+    i번째 (색상, 허용 오차)와 metric 기준으로 일치하는 RGB 항목에는 i번째 비트가 켜집니다.
+    """
+    if len(targets) > MAX_LUT_COLORS:
+        raise ValueError(f"한 색상표에는 최대 {MAX_LUT_COLORS}개의 색상만 넣을 수 있습니다.")
+    table = np.zeros((256, 256, 256), dtype=np.uint8)
+
+    # R 값 하나당 (G, B) 평면 전체를 한 번에 계산합니다.
+    block = np.empty((256, 256, 3), dtype=np.uint8)
+    block[..., 1] = np.arange(256, dtype=np.uint8)[:, None]
+    block[..., 2] = np.arange(256, dtype=np.uint8)[None, :]
+    for red in range(256):
+        block[..., 0] = red
+        plane = table[red]
+        for bit, (color, tolerance) in enumerate(targets):
+            plane[compute_metric_mask(block, color, tolerance, metric)] |= 1 << bit
+    return table.reshape(LUT_SIZE)
+
+
+class ColorLookupTable:
+    """
+    여러 (색상, 허용 오차)를 하나의 비트 마스크 색상표로 묶은 것입니다.
+    프레임당 한 번의 인덱싱으로 모든 색상의 일치 여부를 동시에 얻습니다.
+    """
+    def __init__(self, targets: list, table: np.ndarray, metric: str = 'rgb'):
+        self.targets = normalize_targets(targets)
+        self.table = table
+        self.metric = metric
+
+    @classmethod
+    def load_or_build(cls, targets: list, cache_dir: str | None = LUT_CACHE_DIR, metric: str = 'rgb') -> 'ColorLookupTable':
+        """
+        디스크 캐시에 같은 색상표가 있으면 메모리 매핑으로 불러오고, 없으면 만들어 저장합니다.
+        cache_dir이 None이면 디스크 캐시를 사용하지 않습니다.
+        """
+        targets = normalize_targets(targets)
+        if cache_dir is None:
+            return cls(targets, build_color_lut(targets, metric), metric)
+
+        path = os.path.join(cache_dir, lut_cache_name(targets, metric))
+        if os.path.exists(path):
+            try:
+                table = np.load(path, mmap_mode='r')
+                if table.shape == (LUT_SIZE,) and table.dtype == np.uint8:
+                    return cls(targets, table, metric)
+            except (OSError, ValueError):
+                pass # 손상된 캐시 파일은 새로 만듭니다.
+
+        table = build_color_lut(targets, metric)
+        try:
+            os.makedirs(cache_dir, exist_ok=True)
+            # 다른 프로세스가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체합니다.
+            temp_path = f"{path}.{os.getpid()}.tmp.npy"
+            np.save(temp_path, table)
+            os.replace(temp_path, path)
+        except OSError as e:
+            print(f"색상표 캐시 저장 실패: {e}")
+        return cls(targets, table, metric)
+
+    def lookup(self, frame: np.ndarray) -> np.ndarray:
+        """프레임의 각 픽셀에 대한 색상 비트 마스크 (높이, 너비) uint8 배열을 반환합니다."""
+        return self.table.take(rgb_index(frame))
+
+    def match_mask(self, bits: np.ndarray, index: int) -> np.ndarray:
+        """lookup 결과에서 index번째 색상의 일치 마스크를 꺼냅니다."""
+        if len(self.targets) == 1:
+            # 색상이 하나뿐이면 항목 값이 0/1이므로 복사 없이 bool로 해석합니다.
+            return bits.view(np.bool_)
+        return (bits & (1 << index)) != 0
+
+
+def normalize_targets(targets: list) -> tuple:
+    """캐시 키로 사용할 수 있도록 [(색상, 허용 오차), ...]를 정수 튜플로 정규화합니다."""
+    return tuple((tuple(int(c) for c in color), int(tolerance)) for color, tolerance in targets)
+
+
+def lut_cache_name(targets: tuple, metric: str = 'rgb') -> str:
+    """색상 조합과 비교 기준별 캐시 파일 이름을 만듭니다."""
+    key = repr((LUT_FORMAT_VERSION, metric, targets)).encode('utf-8')
+    return f"lut_{hashlib.sha1(key).hexdigest()}.npy"
@@ -0,0 +1,576 @@
+import zlib
+import numpy as np
+
+
+class MatchScratch:
+    """
+    compute_match_mask가 사용하는 영역 크기별 작업 버퍼입니다.
+    같은 크기의 영역을 반복 탐색할 때 매 프레임 힙 할당 없이 마스크를 계산하기 위해 재사용합니다.
+    스레드 간에 공유하지 않아야 하며, 반환된 마스크는 다음 계산 전까지만 유효합니다.
+    """
+    def __init__(self, shape: tuple):
+        self.shape = tuple(shape)
+        self.diff = np.empty(self.shape, dtype=np.int16) # 채널별 차이 (-255~255)
+        self.square = np.empty(self.shape, dtype=np.int32) # 채널별 차이의 제곱
+        self.dist_sq = np.empty(self.shape, dtype=np.int32) # 제곱 거리 누적 (최대 3 * 255²)
+        self.mask = np.empty(self.shape, dtype=bool)
+
+
+def compute_match_mask(rgb: np.ndarray, color: tuple, tolerance_sq: int, scratch: MatchScratch | None = None) -> np.ndarray:
+    """
+    캡처된 RGB 배열 전체에 대해 색상 일치 여부를 한 번에 계산합니다.
+    ColorFinder._is_color_match와 동일한 제곱 유클리드 거리 기준을 사용합니다.
+
+    int64로 올리지 않고 채널마다 int16 차이 -> int32 제곱 누적으로 계산하며,
+    모든 중간 결과를 scratch 버퍼에 직접 씁니다. scratch가 없으면 이번 호출용으로 만듭니다.
+    """
+    if scratch is None:
+        scratch = MatchScratch(rgb.shape[:2])
+    diff, square, dist_sq = scratch.diff, scratch.square, scratch.dist_sq
+
+    for channel in range(3):
+        np.subtract(rgb[..., channel], np.int16(color[channel]), out=diff, dtype=np.int16)
+        if channel == 0:
+            np.multiply(diff, diff, out=dist_sq, dtype=np.int32)
+        else:
+            np.multiply(diff, diff, out=square, dtype=np.int32)
+            np.add(dist_sq, square, out=dist_sq)
+    return np.less_equal(dist_sq, tolerance_sq, out=scratch.mask)
+
+
+def compute_box_mask(rgb: np.ndarray, color: tuple, tolerance: int) -> np.ndarray:
+    """채널별 상자 기준: R, G, B 각각의 차이가 모두 tolerance 이하인 픽셀을 찾습니다."""
+    # 채널마다 따로 비교하면 (높이, 너비, 3) 중간 배열의 축 축소를 피할 수 있습니다.
+    mask = np.abs(rgb[..., 0].astype(np.int16) - int(color[0])) <= tolerance
+    for channel in (1, 2):
+        mask &= np.abs(rgb[..., channel].astype(np.int16) - int(color[channel])) <= tolerance
+    return mask
+
+
+# --- 색 공간 변환용 사전 계산 테이블 ---
+# 0~255 값의 역수 (0은 0으로 둡니다). HSV 변환에서 나눗셈 대신 조회로 사용합니다.
+_RECIPROCAL = np.zeros(256, dtype=np.float32)
+_RECIPROCAL[1:] = 1.0 / np.arange(1, 256, dtype=np.float32)
+
+# sRGB 8비트 값 -> 선형 RGB
+_SRGB_LEVELS = np.arange(256, dtype=np.float64) / 255.0
+_SRGB_TO_LINEAR = np.where(_SRGB_LEVELS <= 0.04045, _SRGB_LEVELS / 12.92, ((_SRGB_LEVELS + 0.055) / 1.055) ** 2.4).astype(np.float32)
+
+# 선형 RGB -> D65 백색점으로 정규화한 XYZ (행렬곱에 바로 쓰도록 전치해 둡니다)
+_RGB_TO_XYZ_T = (np.array([
+    [0.4124564, 0.3575761, 0.1804375],
+    [0.2126729, 0.7151522, 0.0721750],
+    [0.0193339, 0.1191920, 0.9503041],
+]) / np.array([[0.95047], [1.0], [1.08883]])).T.astype(np.float32)
+
+_LAB_EPSILON = (6 / 29) ** 3
+
+
+def rgb_to_hue_saturation(rgb: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """RGB 배열의 색상(hue)과 채도(saturation)를 0~255 범위(PIL HSV와 같은 척도)로 반환합니다."""
+    r, g, b = (rgb[..., i].astype(np.int16) for i in range(3))
+    high = np.maximum(np.maximum(r, g), b)
+    low = np.minimum(np.minimum(r, g), b)
+    delta = high - low
+    inverse_delta = _RECIPROCAL[delta]
+
+    # 최댓값 채널에 따라 육각형의 구간(0, 2, 4)과 구간 내 위치를 정합니다.
+    hue = np.where(high == r, (g - b) * inverse_delta,
+                   np.where(high == g, (b - r) * inverse_delta + 2, (r - g) * inverse_delta + 4))
+    hue = (hue % 6) * np.float32(256 / 6)
+    saturation = delta * _RECIPROCAL[high] * np.float32(255)
+    return hue, saturation
+
+
+def compute_hsv_mask(rgb: np.ndarray, color: tuple, tolerance: int) -> np.ndarray:
+    """
+    색상/채도 대역 기준: 색상 차이(원형)와 채도 차이가 모두 tolerance(0~255 척도) 이하인 픽셀을 찾습니다.
+    명도는 비교하지 않으므로 마우스 오버 등으로 밝기만 바뀐 픽셀도 일치합니다.
+    무채색(채도 0) 색상은 색상(hue)이 정의되지 않으므로 채도만 비교합니다.
+    """
+    hue, saturation = rgb_to_hue_saturation(rgb)
+    target_hue, target_saturation = rgb_to_hue_saturation(np.asarray(color, dtype=np.uint8).reshape(1, 1, 3))
+    target_hue, target_saturation = float(target_hue[0, 0]), float(target_saturation[0, 0])
+
+    mask = np.abs(saturation - target_saturation) <= tolerance
+    if target_saturation > 0:
+        hue_diff = np.abs(hue - target_hue)
+        mask &= np.minimum(hue_diff, 256 - hue_diff) <= tolerance
+    return mask
+
+
+def rgb_to_lab(rgb: np.ndarray) -> np.ndarray:
+    """RGB 배열을 CIELAB (L*, a*, b*) float32 배열로 변환합니다. (D65 백색점)"""
+    xyz = _SRGB_TO_LINEAR[rgb] @ _RGB_TO_XYZ_T
+    f = np.where(xyz > _LAB_EPSILON, np.cbrt(xyz), xyz * np.float32(841 / 108) + np.float32(4 / 29))
+    fx, fy, fz = f[..., 0], f[..., 1], f[..., 2]
+    return np.stack((116 * fy - 16, 500 * (fx - fy), 200 * (fy - fz)), axis=-1)
+
+
+def compute_lab_mask(rgb: np.ndarray, color: tuple, tolerance: int) -> np.ndarray:
+    """CIELAB ΔE(1976) 기준: 지각적 색차가 tolerance 이하인 픽셀을 찾습니다."""
+    diff = rgb_to_lab(rgb) - rgb_to_lab(np.asarray(color, dtype=np.uint8).reshape(1, 1, 3))[0, 0]
+    return np.einsum('ijk,ijk->ij', diff, diff) <= tolerance * tolerance
+
+
+def compute_rgb_mask(rgb: np.ndarray, color: tuple, tolerance: int) -> np.ndarray:
+    """RGB 유클리드 거리 기준 (기본값)."""
+    return compute_match_mask(rgb, color, tolerance * tolerance)
+
+
+# 구역별로 선택할 수 있는 색상 비교 기준. 모든 커널은 (RGB 배열, 색상, 허용 오차) -> 일치 마스크 형태입니다.
+COLOR_METRICS = {
+    'rgb': compute_rgb_mask,
+    'box': compute_box_mask,
+    'hsv': compute_hsv_mask,
+    'lab': compute_lab_mask,
+}
+
+
+def compute_metric_mask(rgb: np.ndarray, color: tuple, tolerance: int, metric: str = 'rgb') -> np.ndarray:
+    """metric 기준으로 색상 일치 마스크를 계산합니다."""
+    kernel = COLOR_METRICS.get(metric)
+    if kernel is None:
+        raise ValueError(f"알 수 없는 색상 비교 기준입니다: {metric}")
+    return kernel(rgb, color, tolerance)
+
+
+def find_first_match(mask: np.ndarray, column_major: bool, bottom_up: bool, right_to_left: bool) -> tuple[int, int] | None:
+    """
+    일치 마스크에서 탐색 순서상 가장 먼저 만나는 픽셀의 (x, y)를 반환합니다.
+    뒤집기/전치 뷰로 탐색 순서를 정방향 행 우선으로 맞춘 뒤 argmax로 첫 위치를 찾습니다.
+    """
+    height, width = mask.shape
+    view = mask[::-1 if bottom_up else 1, ::-1 if right_to_left else 1]
+    if column_major:
+        view = view.T
+
+    # 1. 일치 픽셀이 있는 첫 줄(행 우선이면 행, 세로 우선이면 열)
+    lines_with_match = view.any(axis=1)
+    line = int(np.argmax(lines_with_match))
+    if not lines_with_match[line]:
+        return None
+
+    # 2. 해당 줄 안에서의 첫 위치
+    pos = int(np.argmax(view[line]))
+
+    row, col = (pos, line) if column_major else (line, pos)
+    y = height - 1 - row if bottom_up else row
+    x = width - 1 - col if right_to_left else col
+    return x, y
+
+
+def find_run_extent(line: np.ndarray, index: int) -> tuple[int, int]:
+    """
+    1차원 일치 마스크에서 index를 포함하는 연속 구간(run)의 양 끝 (min, max)을 반환합니다.
+    index 위치는 일치 픽셀이라고 가정합니다.
+    """
+    # 시작점에서 뒤쪽으로 처음 불일치하는 위치
+    after = line[index + 1:]
+    stop = int(np.argmin(after)) if after.size else 0
+    run_max = index + stop if after.size and not after[stop] else index + after.size
+
+    # 시작점에서 앞쪽으로 처음 불일치하는 위치 (역순 뷰)
+    before = line[index - 1::-1] if index > 0 else line[:0]
+    stop = int(np.argmin(before)) if before.size else 0
+    run_min = index - stop if before.size and not before[stop] else index - before.size
+
+    return run_min, run_max
+
+
+def find_blob_center(mask: np.ndarray, start_x: int, start_y: int) -> tuple[int, int]:
+    """
+    발견된 픽셀을 시작으로 가로 구간을 찾고, 그 중심 열에서 세로 구간을 찾아
+    색상 영역(blob)의 중심 좌표를 계산합니다. 기존 십자 스캔과 결과가 동일합니다.
+    """
+    x_min, x_max = find_run_extent(mask[start_y], start_x)
+    center_x = (x_min + x_max) // 2
+
+    y_min, y_max = find_run_extent(mask[:, center_x], start_y)
+    center_y = (y_min + y_max) // 2
+
+    return center_x, center_y
+
+
+# find_all_blobs가 반환하는 blob 정보. 좌표는 모두 포함(inclusive) 좌표입니다.
+BLOB_DTYPE = np.dtype([
+    ('area', np.int32),   # 픽셀 수
+    ('x1', np.int32), ('y1', np.int32),
+    ('x2', np.int32), ('y2', np.int32),
+    ('cx', np.float32), ('cy', np.float32),  # 무게중심
+])
+
+
+def find_runs(mask: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    마스크의 각 행에서 연속된 일치 구간(run)을 찾아 (행, 시작 x, 끝 x+1) 배열로 반환합니다.
+    구간은 행 우선(위→아래, 왼쪽→오른쪽) 순서로 정렬되어 있습니다.
+    """
+    height, width = mask.shape
+    padded = np.zeros((height, width + 2), dtype=np.int8)
+    padded[:, 1:-1] = mask
+    edges = np.diff(padded, axis=1)
+    rows, starts = np.nonzero(edges == 1)
+    _, ends = np.nonzero(edges == -1)
+    return rows, starts, ends
+
+
+def label_runs(rows: np.ndarray, starts: np.ndarray, ends: np.ndarray, width: int) -> tuple[np.ndarray, int]:
+    """
+    위아래로 맞닿은 구간들을 4방향 연결 기준으로 묶어 구간별 blob 번호를 반환합니다.
+    blob 번호는 행 우선 순서로 처음 나타나는 순서대로 0부터 매겨집니다.
+    """
+    run_count = rows.size
+    if run_count == 0:
+        return np.zeros(0, dtype=np.intp), 0
+
+    # 구간들은 행 우선으로 정렬되어 있으므로 (행, x) 키도 정렬되어 있습니다.
+    stride = width + 1
+    start_keys = rows * stride + starts
+    end_keys = rows * stride + ends
+
+    # 다음 행에서 [start, end)와 겹치는 구간의 범위 [lo, hi)
+    next_row = (rows + 1) * stride
+    lo = np.searchsorted(end_keys, next_row + starts, side='right')
+    hi = np.searchsorted(start_keys, next_row + ends, side='left')
+    counts = np.maximum(hi - lo, 0)
+
+    upper = np.repeat(np.arange(run_count), counts)
+    offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    lower = np.repeat(lo, counts) + offsets
+
+    # 간선을 따라 더 작은 번호로 합치고, 포인터 점프로 대표 번호까지 압축합니다.
+    labels = np.arange(run_count)
+    while upper.size:
+        upper_labels, lower_labels = labels[upper], labels[lower]
+        if np.array_equal(upper_labels, lower_labels):
+            break
+        lowest = np.minimum(upper_labels, lower_labels)
+        np.minimum.at(labels, upper_labels, lowest)
+        np.minimum.at(labels, lower_labels, lowest)
+        while True:
+            jumped = labels[labels]
+            if np.array_equal(jumped, labels):
+                break
+            labels = jumped
+
+    roots, run_labels = np.unique(labels, return_inverse=True)
+    return run_labels, roots.size
+
+
+def measure_blobs(rows: np.ndarray, starts: np.ndarray, ends: np.ndarray, run_labels: np.ndarray, count: int) -> np.ndarray:
+    """구간별 blob 번호로부터 blob마다 픽셀 수, 경계 상자, 무게중심을 계산합니다."""
+    blobs = np.zeros(count, dtype=BLOB_DTYPE)
+    if count == 0:
+        return blobs
+
+    lengths = ends - starts
+    area = np.bincount(run_labels, weights=lengths, minlength=count)
+    blobs['area'] = area
+
+    x1 = np.full(count, np.iinfo(np.int32).max)
+    y1 = np.full(count, np.iinfo(np.int32).max)
+    x2 = np.full(count, -1)
+    y2 = np.full(count, -1)
+    np.minimum.at(x1, run_labels, starts)
+    np.minimum.at(y1, run_labels, rows)
+    np.maximum.at(x2, run_labels, ends - 1)
+    np.maximum.at(y2, run_labels, rows)
+    blobs['x1'], blobs['y1'], blobs['x2'], blobs['y2'] = x1, y1, x2, y2
+
+    blobs['cx'] = np.bincount(run_labels, weights=lengths * (starts + ends - 1) / 2, minlength=count) / area
+    blobs['cy'] = np.bincount(run_labels, weights=lengths * rows, minlength=count) / area
+    return blobs
+
+
+def label_blobs(mask: np.ndarray) -> np.ndarray:
+    """마스크의 연결 요소(4방향)를 모두 찾아 BLOB_DTYPE 구조화 배열로 반환합니다."""
+    rows, starts, ends = find_runs(mask)
+    run_labels, count = label_runs(rows, starts, ends, mask.shape[1])
+    return measure_blobs(rows, starts, ends, run_labels, count)
+
+
+# blob 모양 제약 항목. 0(또는 없음)이면 그 항목은 검사하지 않습니다.
+BLOB_CONSTRAINT_KEYS = (
+    'min_width', 'max_width', # 외접 사각형 너비 (px)
+    'min_height', 'max_height', # 외접 사각형 높이 (px)
+    'min_fill', # 외접 사각형 중 일치 픽셀 비율 (0~1). 얇은 테두리, 대각선 등을 거릅니다.
+    'max_aspect', # 긴 변 / 짧은 변. 가로선, 세로선 등을 거릅니다.
+)
+
+
+def normalize_blob_constraints(constraints: dict | None) -> dict:
+    """검사하지 않는 항목(0, None)을 뺀 제약 사전을 반환합니다. 알 수 없는 항목이 있으면 ValueError를 발생시킵니다."""
+    if not constraints:
+        return {}
+    unknown = set(constraints) - set(BLOB_CONSTRAINT_KEYS)
+    if unknown:
+        raise ValueError(f"알 수 없는 blob 제약 항목입니다: {', '.join(sorted(unknown))}")
+    return {key: float(value) for key, value in constraints.items() if value}
+
+
+def blob_conformance(blobs: np.ndarray, constraints: dict) -> np.ndarray:
+    """각 blob(BLOB_DTYPE)이 모양 제약을 모두 만족하는지를 bool 배열로 반환합니다."""
+    width = blobs['x2'] - blobs['x1'] + 1
+    height = blobs['y2'] - blobs['y1'] + 1
+    ok = np.ones(blobs.size, dtype=bool)
+    if 'min_width' in constraints:
+        ok &= width >= constraints['min_width']
+    if 'max_width' in constraints:
+        ok &= width <= constraints['max_width']
+    if 'min_height' in constraints:
+        ok &= height >= constraints['min_height']
+    if 'max_height' in constraints:
+        ok &= height <= constraints['max_height']
+    if 'min_fill' in constraints:
+        ok &= blobs['area'] >= constraints['min_fill'] * width * height
+    if 'max_aspect' in constraints:
+        ok &= np.maximum(width, height) <= constraints['max_aspect'] * np.minimum(width, height)
+    return ok
+
+
+def find_first_conforming_match(mask: np.ndarray, constraints: dict, column_major: bool, bottom_up: bool, right_to_left: bool) -> tuple[int, int] | None:
+    """
+    모양 제약을 만족하는 blob에 속한 픽셀 중 탐색 방향 순서상 첫 픽셀의 (x, y)를 반환합니다.
+    제약을 만족하지 않는 blob은 건너뛰고 다음 후보로 넘어가는 픽셀 단위 순회와 같은 결과입니다.
+    """
+    rows, starts, ends = find_runs(mask)
+    if rows.size == 0:
+        return None
+    run_labels, count = label_runs(rows, starts, ends, mask.shape[1])
+    ok = blob_conformance(measure_blobs(rows, starts, ends, run_labels, count), constraints)
+    if not ok.any():
+        return None
+
+    # 통과한 blob의 구간만 남기고, 구간마다 탐색 방향상 먼저 만나는 끝 픽셀끼리 비교합니다.
+    keep = ok[run_labels]
+    rows = rows[keep]
+    xs = ends[keep] - 1 if right_to_left else starts[keep]
+    row_keys = -rows if bottom_up else rows
+    col_keys = -xs if right_to_left else xs
+    first = np.lexsort((row_keys, col_keys) if column_major else (col_keys, row_keys))[0]
+    return int(xs[first]), int(rows[first])
+
+
+def squared_distance_grid(height: int, width: int, anchor_x: int, anchor_y: int) -> np.ndarray:
+    """영역의 각 픽셀에서 기준점 (anchor_x, anchor_y)까지의 거리 제곱 (높이, 너비) 배열을 만듭니다. 기준점은 영역 밖이어도 됩니다."""
+    dx_sq = np.square(np.arange(width, dtype=np.int64) - anchor_x)
+    dy_sq = np.square(np.arange(height, dtype=np.int64) - anchor_y)
+    return dy_sq[:, None] + dx_sq[None, :]
+
+
+def find_nearest_match(mask: np.ndarray, distance_grid: np.ndarray) -> tuple[int, int] | None:
+    """
+    일치 픽셀 중 기준점에 가장 가까운 픽셀의 (x, y)를 반환합니다. distance_grid는 squared_distance_grid의 결과입니다.
+    거리가 같으면 행 우선(위→아래, 왼쪽→오른쪽) 순서상 앞선 픽셀을 고릅니다.
+    """
+    candidates = np.flatnonzero(mask)
+    if candidates.size == 0:
+        return None
+    nearest = int(candidates[np.argmin(distance_grid.ravel()[candidates])])
+    y, x = divmod(nearest, mask.shape[1])
+    return x, y
+
+
+def find_nearest_conforming_match(mask: np.ndarray, constraints: dict, anchor_x: int, anchor_y: int) -> tuple[int, int] | None:
+    """
+    모양 제약을 만족하는 blob에 속한 픽셀 중 기준점에 가장 가까운 픽셀의 (x, y)를 반환합니다.
+    구간마다 기준점에 가장 가까운 픽셀은 기준점의 x를 구간 안으로 자른 위치이므로, 픽셀 대신 구간끼리 비교합니다.
+    """
+    rows, starts, ends = find_runs(mask)
+    if rows.size == 0:
+        return None
+    run_labels, count = label_runs(rows, starts, ends, mask.shape[1])
+    ok = blob_conformance(measure_blobs(rows, starts, ends, run_labels, count), constraints)
+    if not ok.any():
+        return None
+
+    keep = ok[run_labels]
+    rows = rows[keep]
+    xs = np.clip(anchor_x, starts[keep], ends[keep] - 1)
+    distances = np.square(xs.astype(np.int64) - anchor_x) + np.square(rows.astype(np.int64) - anchor_y)
+    # 거리가 같으면 find_nearest_match와 같이 행 우선 순서상 앞선 픽셀을 고릅니다.
+    first = np.lexsort((xs, rows, distances))[0]
+    return int(xs[first]), int(rows[first])
+
+
+def frame_fingerprint(frame: np.ndarray) -> int:
+    """
+    프레임 내용의 CRC32 지문을 계산합니다.
+    채널 뷰처럼 연속 메모리가 아닌 배열은 복사하지 않고, 뷰가 가리키는 원본 버퍼 전체의 지문을 계산합니다.
+    """
+    source = frame
+    while not source.flags.c_contiguous and isinstance(source.base, np.ndarray):
+        source = source.base
+    if not source.flags.c_contiguous:
+        source = np.ascontiguousarray(source)
+    return zlib.crc32(source)
+
+
+def find_first_match_tiled(mask: np.ndarray, tile_any: np.ndarray, tile_size: int, column_major: bool, bottom_up: bool, right_to_left: bool) -> tuple[int, int] | None:
+    """
+    타일별 일치 여부(tile_any)로 첫 일치가 있는 타일 줄을 먼저 고른 뒤,
+    그 줄(band) 안에서만 find_first_match를 수행합니다. 결과는 전체 탐색과 동일합니다.
+    """
+    lines = tile_any.any(axis=0 if column_major else 1)
+    candidates = np.flatnonzero(lines)
+    if candidates.size == 0:
+        return None
+
+    reverse = right_to_left if column_major else bottom_up
+    band = int(candidates[-1] if reverse else candidates[0])
+    start = band * tile_size
+
+    if column_major:
+        found = find_first_match(mask[:, start:start + tile_size], column_major, bottom_up, right_to_left)
+        return found[0] + start, found[1]
+    found = find_first_match(mask[start:start + tile_size], column_major, bottom_up, right_to_left)
+    return found[0], found[1] + start
+
+
+class TileScanState:
+    """
+    한 탐색 영역에 대한 타일 단위 증분 탐색 상태입니다.
+    이전 프레임과 타일별로 비교하여, 바뀐 타일에 대해서만 일치 마스크를 다시 계산합니다.
+    """
+    def __init__(self, tile_size: int = 64):
+        self.tile_size = tile_size
+        self.prev_frame = None
+        self._masks = {} # (색상, 제곱 허용 오차) -> [마스크, 타일별 일치 여부, 다시 계산할 타일]
+
+    def _tile_starts(self, shape: tuple) -> tuple[np.ndarray, np.ndarray]:
+        return np.arange(0, shape[0], self.tile_size), np.arange(0, shape[1], self.tile_size)
+
+    def update_frame(self, frame: np.ndarray):
+        """새 프레임을 이전 프레임과 비교하여, 바뀐 타일을 모든 마스크의 재계산 대상으로 표시합니다."""
+        if self.prev_frame is None or self.prev_frame.shape != frame.shape:
+            self.prev_frame = np.array(frame)
+            self._masks.clear()
+            return
+
+        row_starts, col_starts = self._tile_starts(frame.shape)
+        changed_pixels = np.any(frame != self.prev_frame, axis=2)
+        changed_tiles = np.logical_or.reduceat(np.logical_or.reduceat(changed_pixels, row_starts, axis=0), col_starts, axis=1)
+        if not changed_tiles.any():
+            return
+
+        np.copyto(self.prev_frame, frame)
+        for entry in self._masks.values():
+            entry[2] |= changed_tiles
+
+    def match_mask(self, frame: np.ndarray, color: tuple, tolerance_sq: int) -> tuple[np.ndarray, np.ndarray]:
+        """바뀐 타일만 다시 계산한 일치 마스크와 타일별 일치 여부를 반환합니다."""
+        key = (tuple(color), tolerance_sq)
+        entry = self._masks.get(key)
+        row_starts, col_starts = self._tile_starts(frame.shape)
+
+        if entry is None or entry[2].mean() > 0.5:
+            # 처음이거나 절반 이상 바뀌었으면 전체를 한 번에 계산하는 편이 빠릅니다.
+            mask = compute_match_mask(frame, color, tolerance_sq)
+            tile_any = np.logical_or.reduceat(np.logical_or.reduceat(mask, row_starts, axis=0), col_starts, axis=1)
+            self._masks[key] = [mask, tile_any, np.zeros_like(tile_any)]
+            return mask, tile_any
+
+        mask, tile_any, dirty = entry
+        size = self.tile_size
+        for tile_row, tile_col in np.argwhere(dirty):
+            rows = slice(tile_row * size, (tile_row + 1) * size)
+            cols = slice(tile_col * size, (tile_col + 1) * size)
+            tile_mask = compute_match_mask(frame[rows, cols], color, tolerance_sq)
+            mask[rows, cols] = tile_mask
+            tile_any[tile_row, tile_col] = tile_mask.any()
+        dirty[:] = False
+        return mask, tile_any
+
+
+def find_blob_cross_in_frame(frame: np.ndarray, start_x: int, start_y: int, color: tuple, tolerance: int, metric: str = 'rgb') -> tuple[int, int, int, int]:
+    """
+    blob 중심 계산에 쓰는 십자 구간, 즉 시작 픽셀 행의 가로 구간 (x_min, x_max)과
+    그 중심 열의 세로 구간 (y_min, y_max)을 전체 마스크 없이 구합니다.
+    """
+    row_mask = compute_metric_mask(frame[start_y:start_y + 1], color, tolerance, metric)[0]
+    x_min, x_max = find_run_extent(row_mask, start_x)
+    center_x = (x_min + x_max) // 2
+
+    column_mask = compute_metric_mask(frame[:, center_x:center_x + 1], color, tolerance, metric)[:, 0]
+    y_min, y_max = find_run_extent(column_mask, start_y)
+    return x_min, x_max, y_min, y_max
+
+
+def find_blob_center_in_frame(frame: np.ndarray, start_x: int, start_y: int, color: tuple, tolerance: int, metric: str = 'rgb') -> tuple[int, int]:
+    """
+    전체 마스크 없이 시작 픽셀의 행과 중심 열에 대해서만 일치 여부를 계산하여
+    find_blob_center와 같은 중심 좌표를 구합니다. (부분 탐색 모드에서 사용)
+    """
+    x_min, x_max, y_min, y_max = find_blob_cross_in_frame(frame, start_x, start_y, color, tolerance, metric)
+    return (x_min + x_max) // 2, (y_min + y_max) // 2
+
+
+def downsample_sum(frame: np.ndarray, factor: int) -> np.ndarray:
+    """
+    factor x factor 블록마다 채널별 합계를 구한 축소 화면을 반환합니다. (나머지 픽셀은 버립니다)
+    다축 reduce보다 빠르도록, 행 방향과 열 방향으로 나누어 큰 배열 덧셈으로 처리합니다.
+    """
+    coarse_height, coarse_width = frame.shape[0] // factor, frame.shape[1] // factor
+    dtype = np.uint16 if factor * factor * 255 <= np.iinfo(np.uint16).max else np.uint32
+
+    rows = np.zeros((coarse_height, coarse_width * factor, frame.shape[2]), dtype=dtype)
+    for offset in range(factor):
+        rows += frame[offset:coarse_height * factor:factor, :coarse_width * factor]
+
+    blocks = np.zeros((coarse_height, coarse_width, frame.shape[2]), dtype=dtype)
+    for offset in range(factor):
+        blocks += rows[:, offset::factor]
+    return blocks
+
+
+def find_first_match_pyramid(frame: np.ndarray, color: tuple, tolerance_sq: int, factor: int, column_major: bool, bottom_up: bool, right_to_left: bool) -> tuple[int, int] | None:
+    """
+    factor x factor 블록 평균으로 줄인 화면에서 후보 칸을 먼저 찾고,
+    후보 칸(과 이웃 칸) 안에서만 원본 해상도로 첫 일치 픽셀을 찾습니다.
+
+    한 변이 2 * factor 이상인 단색 대상은 적어도 한 블록을 완전히 덮으므로 반드시 후보가 됩니다.
+    그보다 작은 일치 영역은 무시될 수 있습니다.
+    """
+    if column_major:
+        # 세로 우선 탐색은 전치한 화면에서의 가로 우선 탐색과 같습니다.
+        found = find_first_match_pyramid(frame.transpose(1, 0, 2), color, tolerance_sq, factor, False, right_to_left, bottom_up)
+        return None if found is None else (found[1], found[0])
+
+    height, width = frame.shape[:2]
+    coarse_height, coarse_width = height // factor, width // factor
+    if coarse_height == 0 or coarse_width == 0:
+        return find_first_match(compute_match_mask(frame, color, tolerance_sq), False, bottom_up, right_to_left)
+
+    # 1. 블록 평균 화면에서 일치하는 칸 찾기 (블록의 모든 픽셀이 일치하면 평균도 반드시 일치합니다)
+    #    평균 대신 합계로 비교합니다: |합계 - factor² * 색상|² <= factor⁴ * 허용 오차²
+    block_area = factor * factor
+    coarse = downsample_sum(frame, factor).astype(np.int64) - np.asarray(color, dtype=np.int64) * block_area
+    coarse_mask = np.einsum('ijk,ijk->ij', coarse, coarse) <= tolerance_sq * block_area * block_area
+
+    # 2. 대상의 가장자리가 걸친 이웃 칸(나머지 픽셀 줄 포함)까지 후보로 확장
+    cell_rows, cell_cols = -(-height // factor), -(-width // factor)
+    candidates = np.zeros((cell_rows + 2, cell_cols + 2), dtype=bool)
+    for dy in range(3):
+        for dx in range(3):
+            candidates[dy:dy + coarse_height, dx:dx + coarse_width] |= coarse_mask
+    candidates = candidates[1:-1, 1:-1]
+
+    # 3. 후보 칸이 있는 줄(band)을 탐색 순서대로 원본 해상도에서 확인
+    candidate_rows = np.flatnonzero(candidates.any(axis=1))
+    if bottom_up:
+        candidate_rows = candidate_rows[::-1]
+    for cell_row in candidate_rows:
+        cell_cols_in_row = np.flatnonzero(candidates[cell_row])
+        top = cell_row * factor
+        left = cell_cols_in_row[0] * factor
+        right = min((cell_cols_in_row[-1] + 1) * factor, width)
+
+        band = frame[top:top + factor, left:right]
+        band_mask = compute_match_mask(band, color, tolerance_sq)
+        band_mask &= np.repeat(candidates[cell_row, cell_cols_in_row[0]:cell_cols_in_row[-1] + 1], factor)[:right - left]
+        found = find_first_match(band_mask, False, bottom_up, right_to_left)
+        if found is not None:
+            return found[0] + int(left), found[1] + int(top)
+
+    return None
@@ -5,12 +5,19 @@ from pynput import mouse, keyboard
 from typing import Optional, TYPE_CHECKING
 import ast
 import random # 오차 적용을 위해 추가
-from PIL import ImageGrab # 화면 캡처를 위해 import 합니다.
 import json
 from tkinter import filedialog
 import itertools # 재시도 순환을 위해 추가
+import os
+import numpy as np
 
 from .color_finder import ColorFinder, SearchDirection
+from .color_search import COLOR_METRICS, normalize_blob_constraints
+from .frame_recorder import RECORDING_DIR, FrameRecorder, ReplayScreenSource, default_recording_path
+from .latency_stats import LatencyStats
+from .polling_governor import PollingGovernor
+from .screen_source import FrameProducer, create_screen_source
+from .template_search import TemplateMatcher, load_template, save_template
 
 # 순환 참조를 피하면서 타입 힌팅을 하기 위한 Forward-declaration
 if TYPE_CHECKING:
@@ -60,11 +67,45 @@ class AppController:
         self.area_delay = 0.75 # 구역 클릭 전 딜레이 (초), UI 기본값 30 -> 300ms
         self.use_screen_activation = False # 화면 활성화 사용 여부
         self.empty_coord = (0, 0) # 빈 공간 좌표
-        self.search_delay = 0.15 # 탐색 대기 (초)
+        self.anchor_coord = (0, 0) # '◎' 방향에서 거리를 잴 기준점 (예: 무대 중앙). (0, 0)이면 탐색 영역의 중심
+        self.search_delay = 0.15 # 탐색 대기 (초). 폴링 조절기를 쓰면 화면이 그대로일 때 물러나는 최대 대기 시간
         self.total_duration_sec = 1800 # 총 탐색 시간 (초)
         self.active_search_duration_sec = 600 # 한 사이클의 탐색 시간 (초)
         self.wait_duration_sec = 180 # 사이클 간 대기 시간 (초)
         self.search_time_tolerance_sec = 5 # 탐색 시간 오차 (초)
+        self.capture_backend = 'pillow' # 화면 캡처 백엔드 ('pillow', 'mss', 'auto')
+        self.use_tiled_scan = False # 바뀐 타일만 다시 탐색하는 증분 탐색 사용 여부
+        self.pyramid_factor = 0 # 기본 영역 피라미드 탐색 배율 (0: 사용 안 함, N: 한 변 2N px 이상 대상만 탐색)
+        self.min_target_size = 0 # 기본 영역 최소 대상 크기 (0: 모든 픽셀 검사, N: N-1 간격 격자만 검사)
+        self.use_color_lut = False # 미리 컴파일한 색상표(LUT)로 색상 일치 판정
+        self.use_polling_governor = True # 고정 탐색 대기 대신 측정한 탐색 비용과 화면 변화로 대기 시간을 조절
+        self.polling_cpu_budget = 0.25 # 반복 탐색이 쓸 수 있는 CPU 시간 비율 (코어 하나 기준, 0이면 제한 없음)
+        self.polling_target_fps = 0.0 # 반복 탐색의 목표 초당 탐색 수 (0: 예산 안에서 가능한 한 빠르게)
+        self.polling_governor: Optional[PollingGovernor] = None
+        self.use_hotspot_cache = False # 영역 전체를 탐색하기 전에 최근 발견 위치 주변을 먼저 확인
+        self.hotspot_strict = True # True: 탐색 방향 순서를 지킨 결과만 사용, False: 최근 위치에서 찾으면 바로 사용
+        self.hotspot_radius = 24 # 최근 발견 위치 주변 확인 범위 (px)
+        self.color_metric = 'rgb' # 기본 영역 색상 비교 기준 ('rgb': RGB 거리, 'box': 채널별 차이, 'hsv': 색상/채도 대역, 'lab': CIELAB ΔE)
+        self.blob_constraints = {} # 기본 영역 blob 모양 제약 (min_width, max_width, min_height, max_height, min_fill, max_aspect)
+        self.scan_workers = 1 # 넓은 영역을 띠로 나누어 병렬 탐색할 스레드 수 (1: 병렬 탐색 사용 안 함)
+        self.use_union_capture = True # 재시도 시 모든 활성 구역의 합집합을 한 번만 캡처하고 모든 구역을 함께 확인
+        self.use_capture_producer = False # 별도 스레드가 목표 주기로 미리 캡처하고, 탐색은 최신 프레임만 사용
+        self.capture_fps = 30.0 # 캡처 생산 스레드의 목표 초당 캡처 수
+        self.frame_producer: Optional[FrameProducer] = None
+        self.use_latency_stats = False # 단계별(캡처/변환/탐색/blob 중심/클릭) 지연 시간 기록
+        self.latency_stats: Optional[LatencyStats] = None # 마지막 검색의 지연 시간 기록
+        self._latency_area_names = {} # 탐색 영역 좌표 -> 보고서 표시 이름
+        self.record_frames = False # 탐색한 모든 프레임과 결과를 링 파일에 기록 (놓친 대상의 사후 분석용)
+        self.recording_dir = RECORDING_DIR # 기록 파일을 만들 폴더 (검색마다 새 파일)
+        self.recording_size_mb = 256 # 기록 파일 크기. 가득 차면 오래된 프레임부터 덮어씁니다.
+        self.frame_recorder: Optional[FrameRecorder] = None
+        self.replay_path = '' # 기록 파일 경로를 지정하면 실제 화면 대신 기록을 재생하며, 클릭하지 않습니다.
+        self.replay_speed = 1.0 # 재생 배속 (1: 기록 속도, 0: 최대 속도)
+        self.use_template = False # 기본 탐색에서 색상 대신 템플릿(기준 패치)의 모양으로 탐색
+        self.template_path = '' # 템플릿 선택기로 저장한 패치 이미지 경로
+        self.template_size = 24 # 템플릿 선택기가 마우스 위치를 중심으로 캡처하는 패치 크기 (px)
+        self.template_threshold = 0.85 # 정규화 상호상관 점수 하한 (-1~1)
+        self.template_matcher: Optional[TemplateMatcher] = None
 
         # --- 구역별 설정 데이터 ---
         self.areas = {}
@@ -131,6 +172,10 @@ class AppController:
                 'color': (0, 0, 0),
                 'direction': default_direction,
                 'use_direction': default_use_direction, 
+                'pyramid_factor': 0, # 피라미드 탐색 배율 (0: 사용 안 함)
+                'min_target_size': 0, # 최소 대상 크기 (0: 모든 픽셀 검사)
+                'color_metric': 'rgb', # 색상 비교 기준
+                'blob_constraints': {}, # blob 모양 제약 (비어 있으면 기본 영역의 제약 사용)
                 'search_area': (0, 0, 0, 0) # 계산된 탐색 영역
             }
 
@@ -146,6 +191,7 @@ class AppController:
         """창을 닫을 때 리소스를 안전하게 정리합니다."""
         self.is_searching = False
         self.keyboard_listener.stop()
+        self.color_finder.shutdown_scan_pool()
         self.ui.root.destroy()
 
     def apply_settings(self):
@@ -157,6 +203,7 @@ class AppController:
             self.complete_coord = ast.literal_eval(self.ui.complete_coord_var.get())
             self.color = ast.literal_eval(self.ui.color_var.get())
             self.use_secondary_color = self.ui.use_secondary_color_var.get()
+            self.use_template = self.ui.use_template_var.get()
             self.secondary_color = ast.literal_eval(self.ui.secondary_color_var.get())
             self.color_tolerance = int(self.ui.color_tolerance_var.get())
             self.color_area_tolerance = int(self.ui.color_area_tolerance_var.get())
@@ -175,6 +222,7 @@ class AppController:
                 "↓← (r)": SearchDirection.TOP_TO_BOTTOM_RIGHT_TO_LEFT,
                 "↑→ (d)": SearchDirection.BOTTOM_TO_TOP_LEFT_TO_RIGHT,
                 "↑← (f)": SearchDirection.BOTTOM_TO_TOP_RIGHT_TO_LEFT,
+                "◎ (g)": SearchDirection.NEAREST_TO_ANCHOR,
             }
             selected_direction_str = self.ui.direction_var.get()
             self.search_direction = direction_map.get(selected_direction_str, SearchDirection.TOP_LEFT_TO_BOTTOM_RIGHT)
@@ -182,6 +230,7 @@ class AppController:
             self.use_sequence = self.ui.use_sequence_var.get()
             self.use_screen_activation = self.ui.use_screen_activation_var.get()
             self.empty_coord = ast.literal_eval(self.ui.empty_coord_var.get())
+            self.anchor_coord = ast.literal_eval(self.ui.anchor_coord_var.get())
             self.total_duration_sec = int(self.ui.total_duration_var.get())
             self.active_search_duration_sec = int(self.ui.active_search_duration_var.get())
             self.wait_duration_sec = int(self.ui.wait_duration_var.get())
@@ -260,6 +309,8 @@ class AppController:
         points_to_mark = [
             {'text': '완료', 'pos': self.complete_coord, 'color': '#50E3C2'}, # Teal
         ]
+        if self.anchor_coord != (0, 0):
+            points_to_mark.append({'text': '기준', 'pos': self.anchor_coord, 'color': '#F8E71C'}) # Yellow
         # 활성화된 구역들의 클릭 좌표도 함께 표시
         for area_number, settings in self.areas.items():
             if settings['use']:
@@ -293,6 +344,7 @@ class AppController:
             'use_sequence': self.use_sequence,
             'use_screen_activation': self.use_screen_activation,
             'empty_coord': self.empty_coord,
+            'anchor_coord': self.anchor_coord,
             'use_initial_search': self.use_initial_search,
             'area_delay': self.area_delay,
             'search_delay': self.search_delay,
@@ -300,6 +352,33 @@ class AppController:
             'active_search_duration_sec': self.active_search_duration_sec,
             'wait_duration_sec': self.wait_duration_sec,
             'search_time_tolerance_sec': self.search_time_tolerance_sec,
+            'capture_backend': self.capture_backend,
+            'use_tiled_scan': self.use_tiled_scan,
+            'pyramid_factor': self.pyramid_factor,
+            'min_target_size': self.min_target_size,
+            'use_color_lut': self.use_color_lut,
+            'use_polling_governor': self.use_polling_governor,
+            'polling_cpu_budget': self.polling_cpu_budget,
+            'polling_target_fps': self.polling_target_fps,
+            'use_hotspot_cache': self.use_hotspot_cache,
+            'hotspot_strict': self.hotspot_strict,
+            'hotspot_radius': self.hotspot_radius,
+            'color_metric': self.color_metric,
+            'blob_constraints': self.blob_constraints,
+            'scan_workers': self.scan_workers,
+            'use_union_capture': self.use_union_capture,
+            'use_capture_producer': self.use_capture_producer,
+            'capture_fps': self.capture_fps,
+            'use_latency_stats': self.use_latency_stats,
+            'record_frames': self.record_frames,
+            'recording_dir': self.recording_dir,
+            'recording_size_mb': self.recording_size_mb,
+            'replay_path': self.replay_path,
+            'replay_speed': self.replay_speed,
+            'use_template': self.use_template,
+            'template_path': self.template_path,
+            'template_size': self.template_size,
+            'template_threshold': self.template_threshold,
             'areas': {}
         }
 
@@ -316,6 +395,10 @@ class AppController:
                 'color': area_settings['color'],
                 'direction': area_settings['direction'].value, # Enum을 문자열로 저장
                 'use_direction': area_settings['use_direction'],
+                'pyramid_factor': area_settings['pyramid_factor'],
+                'min_target_size': area_settings['min_target_size'],
+                'color_metric': area_settings['color_metric'],
+                'blob_constraints': area_settings['blob_constraints'],
             }
 
         filepath = filedialog.asksaveasfilename(
@@ -366,6 +449,7 @@ class AppController:
             self.use_initial_search = bool(settings_data.get('use_initial_search', self.use_initial_search))
             self.use_screen_activation = bool(settings_data.get('use_screen_activation', self.use_screen_activation))
             self.empty_coord = tuple(settings_data.get('empty_coord', self.empty_coord))
+            self.anchor_coord = tuple(settings_data.get('anchor_coord', self.anchor_coord))
             self.use_sequence = bool(settings_data.get('use_sequence', self.use_sequence))
             self.area_delay = float(settings_data.get('area_delay', self.area_delay))
             self.search_delay = float(settings_data.get('search_delay', self.search_delay))
@@ -373,6 +457,37 @@ class AppController:
             self.active_search_duration_sec = int(settings_data.get('active_search_duration_sec', self.active_search_duration_sec))
             self.wait_duration_sec = int(settings_data.get('wait_duration_sec', self.wait_duration_sec))
             self.search_time_tolerance_sec = int(settings_data.get('search_time_tolerance_sec', self.search_time_tolerance_sec))
+            self.use_tiled_scan = bool(settings_data.get('use_tiled_scan', self.use_tiled_scan))
+            self.pyramid_factor = int(settings_data.get('pyramid_factor', self.pyramid_factor))
+            self.min_target_size = int(settings_data.get('min_target_size', self.min_target_size))
+            self.use_color_lut = bool(settings_data.get('use_color_lut', self.use_color_lut))
+            self.use_polling_governor = bool(settings_data.get('use_polling_governor', self.use_polling_governor))
+            self.polling_cpu_budget = min(1.0, max(0.0, float(settings_data.get('polling_cpu_budget', self.polling_cpu_budget))))
+            self.polling_target_fps = max(0.0, float(settings_data.get('polling_target_fps', self.polling_target_fps)))
+            self.use_hotspot_cache = bool(settings_data.get('use_hotspot_cache', self.use_hotspot_cache))
+            self.hotspot_strict = bool(settings_data.get('hotspot_strict', self.hotspot_strict))
+            self.hotspot_radius = max(1, int(settings_data.get('hotspot_radius', self.hotspot_radius)))
+            self.color_metric = self._parse_color_metric(settings_data.get('color_metric', self.color_metric))
+            self.blob_constraints = normalize_blob_constraints(settings_data.get('blob_constraints', self.blob_constraints))
+            self.scan_workers = max(1, int(settings_data.get('scan_workers', self.scan_workers)))
+            self.use_union_capture = bool(settings_data.get('use_union_capture', self.use_union_capture))
+            self.use_capture_producer = bool(settings_data.get('use_capture_producer', self.use_capture_producer))
+            self.capture_fps = float(settings_data.get('capture_fps', self.capture_fps))
+            self.use_latency_stats = bool(settings_data.get('use_latency_stats', self.use_latency_stats))
+            self.record_frames = bool(settings_data.get('record_frames', self.record_frames))
+            self.recording_dir = str(settings_data.get('recording_dir', self.recording_dir))
+            self.recording_size_mb = max(1, int(settings_data.get('recording_size_mb', self.recording_size_mb)))
+            self.replay_path = str(settings_data.get('replay_path', self.replay_path) or '')
+            self.replay_speed = max(0.0, float(settings_data.get('replay_speed', self.replay_speed)))
+            self.use_template = bool(settings_data.get('use_template', self.use_template))
+            self.template_path = str(settings_data.get('template_path', self.template_path) or '')
+            self.template_size = max(4, int(settings_data.get('template_size', self.template_size)))
+            self.template_threshold = float(settings_data.get('template_threshold', self.template_threshold))
+            self.template_matcher = None
+            capture_backend = settings_data.get('capture_backend', self.capture_backend)
+            if capture_backend != self.capture_backend:
+                self.color_finder.set_screen_source(create_screen_source(capture_backend))
+                self.capture_backend = capture_backend
 
             loaded_areas = settings_data.get('areas', {})
             for area_number_str, loaded in loaded_areas.items():
@@ -390,6 +505,10 @@ class AppController:
                     area['color'] = tuple(loaded.get('color', area['color']))
                     area['direction'] = SearchDirection(loaded.get('direction', area['direction'].value))
                     area['use_direction'] = bool(loaded.get('use_direction', area['use_direction']))
+                    area['pyramid_factor'] = int(loaded.get('pyramid_factor', area['pyramid_factor']))
+                    area['min_target_size'] = int(loaded.get('min_target_size', area['min_target_size']))
+                    area['color_metric'] = self._parse_color_metric(loaded.get('color_metric', area['color_metric']))
+                    area['blob_constraints'] = normalize_blob_constraints(loaded.get('blob_constraints', area['blob_constraints']))
 
             # UI에 변경된 설정값 반영
             self.ui.update_ui_from_controller()
@@ -415,6 +534,7 @@ class AppController:
         elif coord_key == 'p2': display_name = '기본 ↘영역'
         elif coord_key == 'complete': display_name = '완료'
         elif coord_key == 'empty_coord': display_name = '빈공간'
+        elif coord_key == 'anchor_coord': display_name = '기준점'
         elif coord_key.startswith('area_'):
             parts = coord_key.split('_')
             area_num = parts[1]
@@ -447,6 +567,9 @@ class AppController:
         elif coord_key == 'empty_coord':
             self.ui.empty_coord_var.set(str(new_pos))
             self.ui.queue_task(lambda: self.ui.flash_setting_change('global_setting_change'))
+        elif coord_key == 'anchor_coord':
+            self.ui.anchor_coord_var.set(str(new_pos))
+            self.ui.queue_task(lambda: self.ui.flash_setting_change('global_setting_change'))
         elif coord_key.startswith('area_'): # 예: 'area_1_p1', 'area_1_click_coord'
             try:
                 parts = coord_key.split('_')
@@ -495,10 +618,7 @@ class AppController:
 
         x, y = self.mouse_controller.position
         # 1x1 픽셀만 캡처하면 충분합니다.
-        screenshot = ImageGrab.grab(bbox=(int(x), int(y), int(x) + 1, int(y) + 1))
-        pixel_color = screenshot.getpixel((0, 0))
-        
-        new_color = pixel_color[:3] # RGB 값만 사용 (알파 채널 제외)
+        new_color = self.color_finder.screen_source.grab_pixel(int(x), int(y))
 
         if color_key == 'main_color':
             self.ui.color_var.set(str(new_color))
@@ -522,6 +642,58 @@ class AppController:
         self.ui.queue_task(lambda: self.ui.play_sound(1))
         print(f"색상 저장 완료 ({color_key}): {new_color}")
 
+    def start_template_picker(self):
+        """
+        2초 후 마우스 위치를 중심으로 template_size 크기의 패치를 캡처하여 템플릿으로 저장합니다.
+        UI의 버튼과 연결되어 호출됩니다.
+        """
+        if not self.ui:
+            print("UI가 연결되지 않았습니다.")
+            return
+
+        self.ui.update_status(f"템플릿 지정: 2초 후 마우스 위치의 {self.template_size}x{self.template_size} 패치를 저장합니다...")
+        self.ui.root.after(2000, self._grab_template_after_delay)
+
+    def _grab_template_after_delay(self):
+        """실제로 마우스 주변 패치를 캡처하여 템플릿 파일로 저장하고 UI를 업데이트합니다."""
+        if not self.ui: return
+
+        x, y = self.mouse_controller.position
+        half = self.template_size // 2
+        left, top = int(x) - half, int(y) - half
+        patch = np.array(self.color_finder.screen_source.grab((left, top, left + self.template_size, top + self.template_size)))
+
+        try:
+            matcher = TemplateMatcher(patch)
+            path = save_template(patch)
+        except (ValueError, OSError) as e:
+            self.ui.update_status(f"템플릿 저장 실패: {e}")
+            print(f"템플릿 저장 실패: {e}")
+            return
+
+        self.template_path = path
+        self.template_matcher = matcher
+        self.ui.template_var.set(os.path.basename(path))
+        self.ui.queue_task(lambda: self.ui.flash_setting_change('global_setting_change'))
+        self.ui.update_status(f"템플릿 저장 완료: {patch.shape[1]}x{patch.shape[0]}")
+        self.ui.queue_task(lambda: self.ui.play_sound(1))
+        print(f"템플릿 저장 완료: {path}")
+
+    def _get_template_matcher(self) -> Optional[TemplateMatcher]:
+        """저장된 템플릿 파일을 처음 사용할 때 불러옵니다. 실패하면 None을 반환합니다."""
+        if self.template_matcher is None and self.template_path:
+            try:
+                self.template_matcher = load_template(self.template_path)
+            except (OSError, ValueError) as e:
+                print(f"템플릿을 불러올 수 없습니다: {e}")
+        return self.template_matcher
+
+    def _parse_color_metric(self, metric: str) -> str:
+        """설정 파일의 색상 비교 기준 값을 확인합니다."""
+        if metric not in COLOR_METRICS:
+            raise ValueError(f"알 수 없는 색상 비교 기준입니다: {metric}")
+        return metric
+
     def toggle_search(self):
         """UI 버튼 클릭 시 검색 상태를 토글합니다."""
         if self.is_searching:
@@ -538,17 +710,43 @@ class AppController:
             return
 
         self.tries_count = 0 # 검색 시작 시 시도 횟수 초기화
+        self.color_finder.reset_frame_cache()
+        self.color_finder.use_tiled_scan = self.use_tiled_scan
+        self.color_finder.use_color_lut = self.use_color_lut
+        self.color_finder.use_hotspot_cache = self.use_hotspot_cache
+        self.color_finder.hotspot_strict = self.hotspot_strict
+        self.color_finder.hotspot_radius = self.hotspot_radius
+        self.color_finder.set_scan_workers(self.scan_workers)
+        if not self._prepare_screen_source():
+            return
+        template_matcher = None
+        if self.use_template:
+            template_matcher = self._get_template_matcher()
+            if template_matcher is None:
+                self.ui.update_status("템플릿이 없습니다. 템플릿을 먼저 지정하세요.")
+                return
 
         # --- 검색 계획 생성 ---
         # 찾기 버튼을 누르는 시점에 모든 검색 단계를 미리 정의합니다.
         search_plan = []
-        # 1. 초기 탐색 계획
+        anchor = self.anchor_coord if self.anchor_coord != (0, 0) else None # None이면 단계별 탐색 영역의 중심
+        # 1. 초기 탐색 계획: 1순위, 2순위(사용 시) 색상을 한 번의 캡처로 탐색합니다.
+        initial_targets = [(self.color, self.color_tolerance)]
+        if self.use_secondary_color:
+            initial_targets.append((self.secondary_color, self.color_tolerance))
         search_plan.append({
             'type': 'initial',
-            'search_color': self.color,
+            'search_targets': initial_targets,
             'search_area': self._get_global_search_area(),
             'search_direction': self.search_direction,
-            'description': '초기 탐색 (기본 색상)'
+            'pyramid_factor': self.pyramid_factor,
+            'min_target_size': self.min_target_size,
+            'color_metric': self.color_metric,
+            'blob_constraints': self.blob_constraints,
+            'anchor': anchor,
+            'template': template_matcher,
+            'template_threshold': self.template_threshold,
+            'description': '초기 탐색 (템플릿)' if template_matcher is not None else '초기 탐색 (기본 색상)'
         })
 
         # 2. 재시도 탐색 계획
@@ -563,15 +761,32 @@ class AppController:
                         'type': 'retry',
                         'area_number': area_number,
                         # 재시도 시 찾을 색상을 이 시점에 고정합니다.
-                        'search_color': settings['color'] if settings['use_color'] else self.color,
+                        'search_targets': [(settings['color'] if settings['use_color'] else self.color, self.color_tolerance)],
                         'search_area': retry_search_area,
                         'search_direction': retry_search_direction,
+                        'pyramid_factor': settings['pyramid_factor'],
+                        'min_target_size': settings['min_target_size'],
+                        'color_metric': settings['color_metric'],
+                        'blob_constraints': settings['blob_constraints'] or self.blob_constraints,
+                        'anchor': anchor,
+                        'template': None,
                         'click_coord': settings['click_coord'],
                         'num_retries': settings['clicks'],
                         'offset': settings['offset'],
                         'description': f'구역{area_number} 재시도'
                     })
 
+        self.polling_governor = None
+        if self.use_polling_governor:
+            self.polling_governor = PollingGovernor(self.polling_cpu_budget, self.polling_target_fps, max_interval=self.search_delay)
+
+        self.latency_stats = LatencyStats() if self.use_latency_stats else None
+        self.color_finder.set_latency_stats(self.latency_stats)
+        self._latency_area_names = {}
+        for step in search_plan:
+            name = self._latency_area_names.get(step['search_area'])
+            self._latency_area_names[step['search_area']] = f"{name}, {step['description']}" if name else step['description']
+
         self.is_searching = True
         self.ui.queue_task(lambda: self.ui.update_status("색상 검색 중... (ESC로 중지)"))
         self.ui.queue_task(lambda: self.ui.update_button_text("중지 (ESC)"))
@@ -601,6 +816,143 @@ class AppController:
         self.ui.queue_task(lambda: self.ui.update_button_text("찾기 (Shift x2)"))
         self.ui.queue_task(lambda: self.ui.update_button_text("찾기 (Shift x2 / ESC)"))
         print(f"--- {message} ---")
+        cache_stats = self.color_finder.get_frame_cache_stats()
+        print(f"프레임 캐시: 탐색 생략 {cache_stats['hits']}회 / 실제 탐색 {cache_stats['misses']}회")
+        if self.polling_governor is not None and self.polling_governor.period_seconds:
+            print(f"탐색 주기: {self.polling_governor.describe()}")
+        if self.use_hotspot_cache:
+            hotspot_stats = self.color_finder.get_hotspot_stats()
+            print(f"최근 위치 확인: 발견 {hotspot_stats['hits']}회 / 전체 탐색 {hotspot_stats['misses']}회")
+        if self.latency_stats is not None:
+            print("--- 단계별 지연 시간 ---")
+            print(self.latency_stats.format_report(self._latency_area_names))
+
+    def get_latency_summary(self) -> Optional[dict]:
+        """
+        마지막(또는 진행 중인) 검색의 단계별 지연 시간 요약을 반환합니다.
+        {(단계, 영역): {'count', 'p50', 'p95', 'p99', 'max', 'mean'}} 형태이며, 시간 단위는 ms입니다.
+        지연 시간 기록을 사용하지 않았으면 None을 반환합니다.
+        """
+        if self.latency_stats is None:
+            return None
+        return self.latency_stats.summarize()
+
+    def _record_latency(self, stage: str, started: float, area=None):
+        """perf_counter 기준 started부터 지금까지의 시간을 기록합니다. (기록을 사용하지 않으면 아무것도 하지 않습니다)"""
+        if self.latency_stats is not None:
+            self.latency_stats.record(stage, time.perf_counter() - started, area)
+
+    def _find_step_colors(self, step: dict, frame=None):
+        """
+        검색 계획의 한 단계에 정의된 영역, 색상, 방향, 탐색 옵션으로 색상을 찾습니다.
+        frame(합집합 캡처)이 주어지면 새로 캡처하지 않고 그 조각에서 찾습니다.
+        템플릿 단계는 색상 대신 템플릿의 모양으로 찾으며, 색상 탐색과 같은 (0, (x, y)) 형식으로 반환합니다.
+        """
+        if step.get('template') is not None:
+            found = self.color_finder.find_template_in_area(
+                step['search_area'], step['template'], step['search_direction'], step['template_threshold'], frame=frame, anchor=step['anchor'],
+            )
+            return None if found is None else (0, found)
+        return self.color_finder.find_colors_in_area(
+            step['search_area'], step['search_targets'], step['search_direction'],
+            pyramid_factor=step['pyramid_factor'], min_target_size=step['min_target_size'],
+            metric=step['color_metric'], frame=frame, blob_constraints=step['blob_constraints'], anchor=step['anchor'],
+        )
+
+    def _get_search_frame(self, since: Optional[float] = None):
+        """
+        캡처 생산 스레드가 동작 중이면 최신 프레임을 가져옵니다.
+        since(time.monotonic 기준)가 주어지면 그 이후에 캡처된 프레임을 기다립니다.
+        생산 스레드가 없거나 프레임을 받지 못하면 None을 반환하며, 이때는 각 단계가 직접 캡처합니다.
+        """
+        if self.frame_producer is None:
+            return None
+        return self.frame_producer.get_frame(since=since)
+
+    def _start_frame_producer(self, search_plan: list):
+        """검색 계획의 모든 영역을 덮는 합집합을 캡처하는 생산 스레드를 시작합니다."""
+        areas = [step['search_area'] for step in search_plan if step['search_area'][2] > step['search_area'][0] and step['search_area'][3] > step['search_area'][1]]
+        if not areas:
+            return
+        bbox = (min(a[0] for a in areas), min(a[1] for a in areas), max(a[2] for a in areas), max(a[3] for a in areas))
+        self.frame_producer = FrameProducer(self.color_finder.screen_source, bbox, self.capture_fps)
+        self.frame_producer.start()
+
+    def _stop_frame_producer(self):
+        """캡처 생산 스레드를 멈추고 실제 달성한 캡처/소비 fps를 출력합니다."""
+        producer, self.frame_producer = self.frame_producer, None
+        if producer is None:
+            return
+        producer.stop()
+        stats = producer.get_stats()
+        print(f"캡처 생산: {stats['captured']}프레임 ({stats['capture_fps']:.1f}fps), "
+              f"탐색 사용 {stats['consumed']}프레임 ({stats['consume_fps']:.1f}fps), 버림 {stats['dropped']}프레임")
+
+    def _prepare_screen_source(self) -> bool:
+        """
+        재생 파일이 지정되어 있으면 기록 재생 백엔드로, 아니면 실제 화면 캡처 백엔드로 탐색을 준비합니다.
+        재생 중에는 클릭하지 않으며, 기록을 모두 재생하면 검색을 끝냅니다.
+        """
+        if not self.replay_path:
+            if isinstance(self.color_finder.screen_source, ReplayScreenSource):
+                self.color_finder.set_screen_source(create_screen_source(self.capture_backend))
+            self.color_finder.dry_run = False
+            return True
+
+        try:
+            source = ReplayScreenSource(self.replay_path, speed=self.replay_speed)
+        except (OSError, ValueError) as e:
+            self.ui.update_status(f"기록 파일을 열 수 없습니다: {e}")
+            return False
+        source.on_finished = lambda: self.stop_search("기록 재생이 끝났습니다.", play_sound=False)
+        self.color_finder.set_screen_source(source)
+        self.color_finder.dry_run = True
+        print(f"기록 재생: {self.replay_path} ({len(source.records)}프레임, {self.replay_speed or '최대'}배속)")
+        return True
+
+    def _start_frame_recorder(self):
+        """이번 검색에서 탐색하는 모든 프레임을 새 기록 파일에 기록합니다."""
+        recorder = FrameRecorder(default_recording_path(self.recording_dir), self.recording_size_mb)
+        try:
+            recorder.start()
+        except OSError as e:
+            print(f"프레임 기록 시작 실패: {e}")
+            return
+        self.frame_recorder = recorder
+        self.color_finder.set_frame_recorder(recorder)
+        print(f"프레임 기록: {recorder.path}")
+
+    def _stop_frame_recorder(self):
+        """남은 프레임을 모두 쓰고 기록 파일을 닫습니다."""
+        recorder, self.frame_recorder = self.frame_recorder, None
+        if recorder is None:
+            return
+        self.color_finder.set_frame_recorder(None)
+        recorder.stop()
+        stats = recorder.get_stats()
+        print(f"프레임 기록 완료: {recorder.path} ({stats['recorded']}프레임, 버림 {stats['dropped']}프레임)")
+
+    def _find_retry_colors(self, current_step: dict, retry_steps: list, frame=None):
+        """
+        재시도 중인 구역을 먼저, 이어서 나머지 활성 구역을 탐색하여 (찾은 단계, 결과)를 반환합니다.
+        합집합 캡처를 사용하면 모든 구역을 한 번 캡처한 같은 프레임에서 확인합니다.
+        frame(_get_search_frame으로 받은 생산 스레드 프레임)이 있으면 새로 캡처하지 않고 그 프레임을 사용합니다.
+        """
+        if not self.use_union_capture:
+            found = self._find_step_colors(current_step, frame)
+            return (current_step, found) if found else None
+
+        if frame is None:
+            frame = self.color_finder.capture_union([step['search_area'] for step in retry_steps])
+        for step in [current_step] + [step for step in retry_steps if step is not current_step]:
+            found = self._find_step_colors(step, frame)
+            if found:
+                return step, found
+        return None
+
+    def _describe_targets(self, step: dict) -> str:
+        """탐색 단계의 색상 우선순위를 상태 메시지용 문자열로 만듭니다. (예: '1순위+2순위')"""
+        return '+'.join(f"{i + 1}순위" for i in range(len(step['search_targets'])))
 
     def _handle_found_color(self, found_pos: tuple, success_message: str):
         """색상을 찾았을 때의 공통 처리 로직입니다."""
@@ -651,6 +1003,7 @@ class AppController:
                 'r': SearchDirection.TOP_TO_BOTTOM_RIGHT_TO_LEFT, 'ㄱ': SearchDirection.TOP_TO_BOTTOM_RIGHT_TO_LEFT,
                 'd': SearchDirection.BOTTOM_TO_TOP_LEFT_TO_RIGHT, 'ㅇ': SearchDirection.BOTTOM_TO_TOP_LEFT_TO_RIGHT,
                 'f': SearchDirection.BOTTOM_TO_TOP_RIGHT_TO_LEFT, 'ㄹ': SearchDirection.BOTTOM_TO_TOP_RIGHT_TO_LEFT,
+                'g': SearchDirection.NEAREST_TO_ANCHOR, 'ㅎ': SearchDirection.NEAREST_TO_ANCHOR,
             }
             # key.char가 존재하는지 확인 (특수키가 아닐 경우)
             if hasattr(key, 'char') and key.char in direction_map:
@@ -702,6 +1055,23 @@ class AppController:
 
     def _search_worker(self, search_plan: list):
         """(스레드 워커) 전달받은 검색 계획(search_plan)을 순차적으로 실행합니다."""
+        if self.use_color_lut:
+            # 색상표 생성/불러오기는 UI 스레드가 아닌 이곳에서 탐색 전에 한 번만 수행합니다.
+            self.color_finder.prepare_color_luts((step['search_targets'], step['color_metric']) for step in search_plan)
+        # HSV/Lab 기준은 색상표 탐색 설정과 관계없이 색상별 색상표로 판정하므로 여기서 미리 준비합니다.
+        self.color_finder.prepare_metric_tables((step['search_targets'], step['color_metric']) for step in search_plan)
+        if self.use_capture_producer:
+            self._start_frame_producer(search_plan)
+        if self.record_frames:
+            self._start_frame_recorder()
+        try:
+            self._run_search_plan(search_plan)
+        finally:
+            self._stop_frame_producer()
+            self._stop_frame_recorder()
+
+    def _run_search_plan(self, search_plan: list):
+        """검색 계획을 구역 사용 여부에 따라 사이클 단위로 실행합니다."""
         if self.use_sequence:
             # [구역 사용 ON]: 총 탐색 시간 동안 (탐색 -> 대기) 사이클 반복
             
@@ -765,29 +1135,25 @@ class AppController:
 
             # '기본 탐색 사용'이 체크된 경우에만 초기 탐색을 수행합니다.
             if self.use_initial_search:
-                # 1. 1순위 색상 탐색
-                status_text = f"초기 탐색 (1순위): 기본 영역에서 탐색 중 ({initial_step['search_direction'].value})..."
+                # 1순위, 2순위(사용 시) 색상을 한 번의 캡처로 우선순위 순서대로 탐색합니다.
+                status_text = f"초기 탐색 ({self._describe_targets(initial_step)}): 기본 영역에서 탐색 중 ({initial_step['search_direction'].value})..."
                 self.ui.queue_task(lambda text=status_text: self.ui.update_status(text))
-                found_pos = self.color_finder.find_color_in_area(initial_step['search_area'], initial_step['search_color'], self.color_tolerance, initial_step['search_direction'])
-                if found_pos:
-                    self._handle_found_color(found_pos, "초기 탐색 중 1순위 색상 발견")
+                cycle_started = time.perf_counter()
+                found = self._find_step_colors(initial_step, self._get_search_frame())
+                self._record_latency('cycle', cycle_started, initial_step['search_area'])
+                if found:
+                    priority, found_pos = found
+                    self._handle_found_color(found_pos, f"초기 탐색 중 {priority + 1}순위 색상 발견")
                     return
 
-                # 2. 2순위 색상 탐색 (조건부)
-                if self.is_searching and self.use_secondary_color:
-                    status_text = f"초기 탐색 (2순위): 기본 영역에서 탐색 중 ({initial_step['search_direction'].value})..."
-                    self.ui.queue_task(lambda text=status_text: self.ui.update_status(text))
-                    found_pos_secondary = self.color_finder.find_color_in_area(initial_step['search_area'], self.secondary_color, self.color_tolerance, initial_step['search_direction'])
-                    if found_pos_secondary:
-                        self._handle_found_color(found_pos_secondary, "초기 탐색 중 2순위 색상 발견")
-                        return
-
             retry_steps = [step for step in search_plan if step['type'] == 'retry']
             if not retry_steps:
                 self.stop_search("활성화된 재시도 구역이 없어 중지합니다.")
                 return
 
             retry_cycle = itertools.cycle(retry_steps)
+            governor = self.polling_governor
+            next_search_at = None # 조절기가 정한 다음 탐색 가능 시각 (time.perf_counter 기준)
             while self.is_searching and (time.time() - start_time) < duration:
                 step = next(retry_cycle)
                 final_x, final_y = step['click_coord']
@@ -808,8 +1174,13 @@ class AppController:
                     
                     if not self.is_searching: break # 딜레이 후 다시 확인
                     self.color_finder.click_action(final_x, final_y)
+                    clicked_at = time.monotonic()
 
-                    time.sleep(0.1)
+                    # 클릭 후 화면이 반응할 시간을 기다리되, 조절기가 정한 탐색 간격보다 빨리 다시 탐색하지 않습니다.
+                    settle_delay = 0.1
+                    if next_search_at is not None:
+                        settle_delay = max(settle_delay, next_search_at - time.perf_counter())
+                    time.sleep(settle_delay)
                     elapsed_time = int(time.time() - start_time)
                     if duration == float('inf'):
                         time_info = f"경과 시간 ({elapsed_time}s)"
@@ -817,10 +1188,22 @@ class AppController:
                         total_elapsed_time = int(time.time() - main_start_time)
                         time_info = f"({elapsed_time}s / {int(cycle_target_duration)}s) ({total_elapsed_time}s / {int(total_target_duration)}s)"
                     search_status_text = f"재탐색: 구역{step['area_number']} ({i+1}/{step['num_retries']}) | ({step['search_direction'].value}) | {time_info}"
+                    if governor is not None:
+                        search_status_text += f" | {governor.describe()}"
                     self.ui.queue_task(lambda text=search_status_text: self.ui.update_status(text))
-                    found_pos = self.color_finder.find_color_in_area(step['search_area'], step['search_color'], self.color_tolerance, step['search_direction'])
-                    if found_pos:
-                        self._handle_found_color(found_pos, f"재시도 중 구역{step['area_number']}에서 색상 발견")
+                    # 클릭 이후의 화면에서 찾도록, 클릭 뒤에 캡처된 프레임만 사용합니다.
+                    cycle_started = time.perf_counter()
+                    frame = self._get_search_frame(since=clicked_at)
+                    # 새 프레임을 기다린 시간은 CPU를 쓰지 않으므로 조절기의 작업 시간에서 뺍니다.
+                    if governor is not None:
+                        governor.begin_cycle()
+                    found = self._find_retry_colors(step, retry_steps, frame)
+                    if governor is not None:
+                        next_search_at = time.perf_counter() + governor.end_cycle(self.color_finder.last_frame_changed)
+                    self._record_latency('cycle', cycle_started, step['search_area'])
+                    if found:
+                        found_step, (_, found_pos) = found
+                        self._handle_found_color(found_pos, f"재시도 중 구역{found_step['area_number']}에서 색상 발견")
                         return
             
             if self.is_searching and duration != float('inf'):
@@ -829,23 +1212,32 @@ class AppController:
         else:
             # [구역 사용 OFF]: 색상을 찾을 때까지 초기 탐색만 무한 반복
             initial_step = search_plan[0]
+            last_frame_time = None
+            governor = self.polling_governor
             while self.is_searching:
-                # 1. 1순위 색상 탐색
-                status_text = f"기본 영역 반복 탐색 (1순위) ({initial_step['search_direction'].value})..."
+                # 1순위, 2순위(사용 시) 색상을 한 번의 캡처로 우선순위 순서대로 탐색합니다.
+                status_text = f"기본 영역 반복 탐색 ({self._describe_targets(initial_step)}) ({initial_step['search_direction'].value})..."
+                if governor is not None:
+                    status_text += f" | {governor.describe()}"
                 self.ui.queue_task(lambda text=status_text: self.ui.update_status(text))
-                found_pos = self.color_finder.find_color_in_area(initial_step['search_area'], initial_step['search_color'], self.color_tolerance, initial_step['search_direction'])
-                if found_pos:
-                    self._handle_found_color(found_pos, "기본 영역에서 1순위 색상 발견")
+                # 생산 스레드를 사용하면 이미 탐색한 프레임을 다시 보지 않도록 더 새 프레임을 기다립니다.
+                cycle_started = time.perf_counter()
+                frame = self._get_search_frame(since=last_frame_time)
+                if frame is not None:
+                    last_frame_time = frame.timestamp
+                # 새 프레임을 기다린 시간은 CPU를 쓰지 않으므로 조절기의 작업 시간에서 뺍니다.
+                if governor is not None:
+                    governor.begin_cycle()
+                found = self._find_step_colors(initial_step, frame)
+                if governor is not None:
+                    delay = governor.end_cycle(self.color_finder.last_frame_changed)
+                self._record_latency('cycle', cycle_started, initial_step['search_area'])
+                if found:
+                    priority, found_pos = found
+                    self._handle_found_color(found_pos, f"기본 영역에서 {priority + 1}순위 색상 발견")
                     return
 
-                # 2. 2순위 색상 탐색 (조건부)
-                if self.is_searching and self.use_secondary_color:
-                    status_text = f"기본 영역 반복 탐색 (2순위) ({initial_step['search_direction'].value})..."
-                    self.ui.queue_task(lambda text=status_text: self.ui.update_status(text))
-                    found_pos_secondary = self.color_finder.find_color_in_area(initial_step['search_area'], self.secondary_color, self.color_tolerance, initial_step['search_direction'])
-                    if found_pos_secondary:
-                        self._handle_found_color(found_pos_secondary, "기본 영역에서 2순위 색상 발견")
-                        return
-
-                if self.search_delay > 0:
+                if governor is not None:
+                    time.sleep(delay)
+                elif self.search_delay > 0:
                     time.sleep(self.search_delay)
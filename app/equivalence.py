@@ -0,0 +1,298 @@
+"""
+최적화된 색상 탐색 엔진이 기준 엔진(ReferenceColorFinder, 픽셀 단위 루프)과
+정확히 같은 결과(찾은 색상 인덱스와 blob 중심 좌표, 방향별 우선순위 포함)를 내는지 검증하는 도구입니다.
+
+무작위 화면, blob, 허용 오차, 탐색 방향으로 만든 사례를 모든 엔진에 똑같이 넣어 비교하고,
+엔진별 불일치 수와 기준 엔진 대비 속도 향상을 출력합니다. 불일치가 하나라도 있으면 종료 코드 1을 반환합니다.
+
+사용 예:
+    python -m app.equivalence
+    python -m app.equivalence --cases 5000 --seed 7 --engines full lut bands
+"""
+import argparse
+import sys
+import time
+import numpy as np
+
+from .color_finder import ColorFinder, SearchDirection
+from .color_search import compute_match_mask
+from .reference_finder import ReferenceColorFinder
+from .screen_source import ArrayScreenSource, UnionFrame
+
+TOLERANCES = (0, 1, 4, 10, 25, 60)
+MAX_SIZE = 96 # 일반 사례의 최대 영역 크기 (px). 기준 엔진이 느리므로 작게 유지합니다.
+LARGE_SIZE = 200 # 가끔 섞는 큰 영역의 최대 크기 (띠 병렬 탐색이 여러 띠로 나뉘는 크기)
+CANVAS_PADDING = 12 # 탐색 영역 바깥 화면의 최대 여백 (합집합 프레임 조각 검증용)
+
+# 단색 직사각형 대상 하나만 있는 사례에서만 결과가 보장되는 엔진의 설정
+PYRAMID_FACTOR = 3
+MIN_TARGET_SIZE = 6
+SOLID_MIN_SIZE = max(2 * PYRAMID_FACTOR, MIN_TARGET_SIZE)
+
+
+def _configure_full(finder: ColorFinder):
+    pass
+
+
+def _configure_tiled(finder: ColorFinder):
+    finder.use_tiled_scan = True
+    finder.tile_size = 8 # 작은 영역도 여러 타일로 나뉘도록 합니다.
+
+
+def _configure_lut(finder: ColorFinder):
+    finder.use_color_lut = True
+    finder.lut_cache_dir = None # 검증 중에는 디스크 캐시를 만들지 않습니다.
+
+
+def _configure_bands(finder: ColorFinder):
+    finder.set_scan_workers(3)
+    finder.parallel_min_pixels = 0
+    finder.bands_per_worker = 2
+
+
+def _configure_frame_cache(finder: ColorFinder):
+    finder.use_frame_cache = True
+
+
+def _configure_hotspot(finder: ColorFinder):
+    finder.use_hotspot_cache = True # 엄격 모드. 같은 영역의 바뀐 화면 사례에서 최근 발견 위치를 먼저 확인합니다.
+    finder.hotspot_radius = 4
+
+
+# 이름 -> (설정 함수, find_colors_in_area 추가 인자, 단색 대상 사례 전용 여부)
+ENGINES = {
+    'full': (_configure_full, {}, False),
+    'tiled': (_configure_tiled, {}, False),
+    'lut': (_configure_lut, {}, False),
+    'bands': (_configure_bands, {}, False),
+    'union': (_configure_full, {}, False), # 합집합 프레임의 조각(뷰)을 탐색
+    'frame_cache': (_configure_frame_cache, {}, False),
+    'hotspot': (_configure_hotspot, {}, False),
+    'pyramid': (_configure_full, {'pyramid_factor': PYRAMID_FACTOR}, True),
+    'stride': (_configure_full, {'min_target_size': MIN_TARGET_SIZE}, True),
+    # 피라미드/격자점 설정과 함께 켠 최근 위치 확인 (이 설정에서는 최근 위치를 확인하지 않고 전체 탐색해야 합니다)
+    'hotspot_pyr': (_configure_hotspot, {'pyramid_factor': PYRAMID_FACTOR, 'min_target_size': MIN_TARGET_SIZE}, True),
+}
+
+
+def make_target_sets(rng: np.random.Generator, count: int) -> list:
+    """
+    사례들이 돌려 쓰는 [(색상, 허용 오차), ...] 목록들을 만듭니다.
+    색상표(LUT) 엔진은 목록마다 색상표를 새로 만들므로, 목록 수를 제한해 검증 시간을 일정하게 유지합니다.
+    """
+    target_sets = []
+    for _ in range(count):
+        size = int(rng.choice([1, 1, 2, 3]))
+        target_sets.append([(tuple(int(c) for c in rng.integers(0, 256, 3)), int(rng.choice(TOLERANCES))) for _ in range(size)])
+    return target_sets
+
+
+def _near_color(rng: np.random.Generator, color: tuple, tolerance: int) -> np.ndarray:
+    """허용 오차 경계 근처(안쪽과 바깥쪽 모두)의 색상을 만듭니다."""
+    reach = tolerance + 2
+    offset = rng.integers(-reach, reach + 1, 3)
+    return np.clip(np.asarray(color) + offset, 0, 255).astype(np.uint8)
+
+
+def _random_frame(rng: np.random.Generator, width: int, height: int, targets: list) -> np.ndarray:
+    """잡음 배경에 경계 근처 색상의 점과, 모양과 색이 제각각인 blob을 흩뿌린 화면을 만듭니다."""
+    frame = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+
+    for _ in range(int(rng.integers(0, 1 + width * height // 40))):
+        color, tolerance = targets[int(rng.integers(len(targets)))]
+        frame[rng.integers(height), rng.integers(width)] = _near_color(rng, color, tolerance)
+
+    for _ in range(int(rng.integers(0, 5))):
+        color, tolerance = targets[int(rng.integers(len(targets)))]
+        blob_width, blob_height = int(rng.integers(1, width + 1)), int(rng.integers(1, height + 1))
+        x, y = int(rng.integers(0, width - blob_width + 1)), int(rng.integers(0, height - blob_height + 1))
+        region = frame[y:y + blob_height, x:x + blob_width]
+        shape = rng.random((blob_height, blob_width)) < rng.uniform(0.5, 1.0) # 구멍이 있는 blob
+        if rng.random() < 0.5:
+            region[shape] = color
+        else:
+            region[shape] = _near_color(rng, color, tolerance)
+    return frame
+
+
+def _solid_frame(rng: np.random.Generator, width: int, height: int, targets: list) -> np.ndarray:
+    """
+    어떤 대상 색상과도 일치하지 않는 배경에 대상 색상의 단색 직사각형 하나만 그린 화면을 만듭니다.
+    피라미드/격자점 탐색은 이런 화면에서만 기준 엔진과 같은 결과가 보장됩니다.
+    """
+    frame = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+    for _ in range(100):
+        matched = np.zeros((height, width), dtype=bool)
+        for color, tolerance in targets:
+            matched |= compute_match_mask(frame, color, tolerance**2)
+        if not matched.any():
+            break
+        frame[matched] = rng.integers(0, 256, (int(matched.sum()), 3), dtype=np.uint8)
+    else:
+        return None
+
+    color, _ = targets[int(rng.integers(len(targets)))]
+    blob_width = int(rng.integers(SOLID_MIN_SIZE, width + 1))
+    blob_height = int(rng.integers(SOLID_MIN_SIZE, height + 1))
+    x, y = int(rng.integers(0, width - blob_width + 1)), int(rng.integers(0, height - blob_height + 1))
+    frame[y:y + blob_height, x:x + blob_width] = color
+    return frame
+
+
+def generate_cases(rng: np.random.Generator, count: int, target_sets: list):
+    """
+    검증 사례를 만듭니다. 각 사례는 (화면 전체, 화면 영역, 탐색 영역, 색상 목록, 방향, 단색 대상 여부)입니다.
+    일부 사례는 직전 화면을 조금만 바꾸거나 그대로 반복하여, 타일/프레임 캐시의 증분 경로도 거치도록 합니다.
+    """
+    # 기준 엔진은 순회 방향만 구현하므로 기준점 거리 탐색은 비교하지 않습니다.
+    directions = [direction for direction in SearchDirection if not direction.is_nearest]
+    previous = None
+
+    for _ in range(count):
+        roll = rng.random()
+        if previous is not None and roll < 0.1:
+            # 같은 화면을 다시 탐색 (프레임 캐시 적중)
+            canvas, canvas_bbox, area, targets, solid = previous
+        elif previous is not None and roll < 0.35:
+            # 같은 화면의 일부만 바뀜 (바뀐 타일만 다시 계산)
+            canvas, canvas_bbox, area, targets, _ = previous
+            canvas = canvas.copy()
+            height, width = canvas.shape[:2]
+            patch = _random_frame(rng, int(rng.integers(1, min(width, 16) + 1)), int(rng.integers(1, min(height, 16) + 1)), targets)
+            x, y = int(rng.integers(0, width - patch.shape[1] + 1)), int(rng.integers(0, height - patch.shape[0] + 1))
+            canvas[y:y + patch.shape[0], x:x + patch.shape[1]] = patch
+            solid = False
+        else:
+            targets = target_sets[int(rng.integers(len(target_sets)))]
+            limit = LARGE_SIZE if rng.random() < 0.05 else MAX_SIZE
+            solid = rng.random() < 0.3
+            low = SOLID_MIN_SIZE if solid else 1
+            width, height = int(rng.integers(low, limit + 1)), int(rng.integers(low, limit + 1))
+            frame = _solid_frame(rng, width, height, targets) if solid else None
+            if frame is None:
+                solid = False
+                frame = _random_frame(rng, width, height, targets)
+
+            # 탐색 영역을 임의의 화면 좌표에 두고, 바깥에 잡음 여백을 둘러 조각(뷰) 탐색을 검증합니다.
+            pad_left, pad_top, pad_right, pad_bottom = (int(v) for v in rng.integers(0, CANVAS_PADDING + 1, 4))
+            canvas = rng.integers(0, 256, (height + pad_top + pad_bottom, width + pad_left + pad_right, 3), dtype=np.uint8)
+            canvas[pad_top:pad_top + height, pad_left:pad_left + width] = frame
+            origin_x, origin_y = int(rng.integers(-500, 2000)), int(rng.integers(-500, 1000))
+            canvas_bbox = (origin_x, origin_y, origin_x + canvas.shape[1], origin_y + canvas.shape[0])
+            area = (origin_x + pad_left, origin_y + pad_top, origin_x + pad_left + width, origin_y + pad_top + height)
+
+        previous = (canvas, canvas_bbox, area, targets, solid)
+        direction = directions[int(rng.integers(len(directions)))]
+        yield canvas, canvas_bbox, area, targets, direction, solid
+
+
+def reference_find(reference: ReferenceColorFinder, area: tuple, targets: list, direction: SearchDirection):
+    """find_colors_in_area와 같은 형식((색상 인덱스, 좌표) 또는 None)의 기준 결과를 구합니다."""
+    for index, (color, tolerance) in enumerate(targets):
+        found = reference.find_color_in_area(area, color, tolerance, direction)
+        if found is not None:
+            return index, found
+    return None
+
+
+def run_equivalence(cases: int, seed: int = 0, engines: list | None = None, target_set_count: int = 12,
+                    max_reports: int = 10) -> dict:
+    """
+    모든 사례에서 각 엔진의 결과를 기준 엔진과 비교합니다.
+    :return: {엔진 이름: {'cases', 'mismatches', 'seconds', 'examples'}}와 기준 엔진의 'reference' 항목
+    """
+    engines = engines or list(ENGINES)
+    source = ArrayScreenSource([np.zeros((1, 1, 3), dtype=np.uint8)])
+    reference = ReferenceColorFinder(source)
+    finders = {}
+    for name in engines:
+        configure, _, _ = ENGINES[name]
+        finder = ColorFinder(source)
+        finder.use_frame_cache = False
+        configure(finder)
+        finders[name] = finder
+
+    # 색상표는 실제 사용처(탐색 시작 전 prepare_color_luts)처럼 미리 만들어 두고 탐색 시간만 잽니다.
+    rng = np.random.default_rng(seed)
+    target_sets = make_target_sets(rng, target_set_count)
+    if 'lut' in finders:
+        finders['lut'].prepare_color_luts((targets, 'rgb') for targets in target_sets)
+
+    results = {'reference': {'cases': 0, 'mismatches': 0, 'seconds': 0.0, 'examples': []}}
+    results.update({name: {'cases': 0, 'mismatches': 0, 'seconds': 0.0, 'examples': [], 'reference_seconds': 0.0} for name in engines})
+
+    for case_index, (canvas, canvas_bbox, area, targets, direction, solid) in enumerate(generate_cases(rng, cases, target_sets)):
+        source.set_frame(canvas)
+        source.origin = canvas_bbox[:2]
+
+        start = time.perf_counter()
+        expected = reference_find(reference, area, targets, direction)
+        reference_seconds = time.perf_counter() - start
+        results['reference']['cases'] += 1
+        results['reference']['seconds'] += reference_seconds
+
+        for name, finder in finders.items():
+            _, options, solid_only = ENGINES[name]
+            if solid_only and not solid:
+                continue
+            frame = UnionFrame(canvas, canvas_bbox) if name == 'union' else None
+
+            start = time.perf_counter()
+            found = finder.find_colors_in_area(area, targets, direction, frame=frame, **options)
+            elapsed = time.perf_counter() - start
+
+            row = results[name]
+            row['cases'] += 1
+            row['seconds'] += elapsed
+            row['reference_seconds'] += reference_seconds
+            if found != expected:
+                row['mismatches'] += 1
+                if len(row['examples']) < max_reports:
+                    row['examples'].append({
+                        'case': case_index, 'area': area, 'targets': targets, 'direction': direction.name,
+                        'expected': expected, 'found': found,
+                    })
+
+    for finder in finders.values():
+        finder.shutdown_scan_pool()
+    return results
+
+
+def format_report(results: dict) -> str:
+    """엔진별 불일치 수, 사례당 평균 시간, 같은 사례들에서의 기준 엔진 대비 속도 향상을 표로 만듭니다."""
+    lines = [f"{'엔진':<12} {'사례':>7} {'불일치':>7} {'평균(ms)':>10} {'속도 향상':>10}"]
+    reference = results['reference']
+    lines.append(f"{'reference':<12} {reference['cases']:>7} {'-':>7} "
+                 f"{reference['seconds'] / max(reference['cases'], 1) * 1000:>10.3f} {'1.00x':>10}")
+    for name, row in results.items():
+        if name == 'reference':
+            continue
+        mean_ms = row['seconds'] / max(row['cases'], 1) * 1000
+        speedup = row['reference_seconds'] / row['seconds'] if row['seconds'] else 0.0
+        lines.append(f"{name:<12} {row['cases']:>7} {row['mismatches']:>7} {mean_ms:>10.3f} {speedup:>9.1f}x")
+        for example in row['examples']:
+            lines.append(f"    사례 {example['case']}: 영역 {example['area']} {example['direction']} "
+                         f"색상 {example['targets']} -> 기준 {example['expected']}, 결과 {example['found']}")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="색상 탐색 엔진과 기준 엔진의 결과 동등성 검증")
+    parser.add_argument('--cases', type=int, default=2000, help="검증할 무작위 사례 수")
+    parser.add_argument('--seed', type=int, default=0, help="난수 시드 (같은 시드는 같은 사례를 만듭니다)")
+    parser.add_argument('--engines', nargs='+', choices=list(ENGINES), help="검증할 엔진 (기본: 전체)")
+    parser.add_argument('--target-sets', type=int, default=12, help="사례들이 돌려 쓰는 색상 목록 수")
+    parser.add_argument('--max-reports', type=int, default=10, help="엔진별로 출력할 불일치 사례 수")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    results = run_equivalence(args.cases, args.seed, args.engines, args.target_sets, args.max_reports)
+    print(format_report(results))
+
+    mismatches = sum(row['mismatches'] for name, row in results.items() if name != 'reference')
+    print(f"사례 {args.cases}개, 시드 {args.seed}, 불일치 {mismatches}개 ({time.perf_counter() - started:.1f}초)")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
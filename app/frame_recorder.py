@@ -0,0 +1,344 @@
+"""
+탐색 스레드가 본 모든 프레임을 기록하고, 기록을 다시 재생하는 도구입니다.
+
+기록 파일은 크기가 고정된 메모리 매핑 링 파일로, 가득 차면 가장 오래된 프레임부터 덮어씁니다.
+각 기록에는 캡처 시각, 탐색 영역, 탐색 조건(색상, 방향, 비교 기준 등)과 탐색 결과(클릭 여부와 좌표)가 함께 저장됩니다.
+
+사용 예:
+    python -m app.frame_recorder info ~/.outtic/recordings/session_20260101_120000.rec
+    python -m app.frame_recorder replay session.rec --speed 0 --lut --latency
+"""
+import argparse
+import json
+import os
+import queue
+import struct
+import sys
+import threading
+import time
+from collections import deque
+import numpy as np
+
+from .screen_source import ScreenSource
+
+RECORDING_DIR = os.path.join(os.path.expanduser('~'), '.outtic', 'recordings')
+RECORDING_MAGIC = b'OTFRAME1'
+RECORDING_VERSION = 1
+
+# 파일 머리: 매직, 버전, 색인 칸 수, 데이터 영역 크기, 누적 기록 위치, 다음 순번, 버린 프레임 수
+_HEADER = struct.Struct('<8sIIQQQQ')
+_HEADER_SIZE = 64
+# 색인 항목: 순번, 누적 기록 위치, 메타데이터 길이, 프레임 길이, 캡처 시각, 너비, 높이
+_ENTRY = struct.Struct('<QQIIdII')
+
+
+def default_recording_path(directory: str = RECORDING_DIR) -> str:
+    """기록을 시작한 시각으로 새 기록 파일 경로를 만듭니다."""
+    return os.path.join(directory, time.strftime('session_%Y%m%d_%H%M%S.rec'))
+
+
+class FrameRecorder:
+    """
+    탐색한 프레임과 그 결과를 링 파일에 기록합니다.
+
+    record는 프레임을 복사해 큐에 넣기만 하고, 파일 쓰기는 별도 스레드가 합니다.
+    큐가 가득 차면(쓰기가 캡처를 따라가지 못하면) 탐색을 기다리게 하지 않고 그 프레임을 버립니다.
+    """
+    def __init__(self, path: str, size_mb: int = 256, index_slots: int = 65536, queue_size: int = 16):
+        self.path = path
+        self.index_slots = index_slots
+        self.data_capacity = size_mb * 1024 * 1024
+        self._data_offset = _HEADER_SIZE + index_slots * _ENTRY.size
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._thread = None
+        self._map = None
+
+        self.recorded = 0 # 파일에 쓴 프레임 수
+        self.dropped = 0 # 큐가 가득 차서 버린 프레임 수
+        self._written = 0 # 데이터 영역의 누적 기록 위치 (링을 돌아도 계속 증가)
+
+    def start(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._map = np.memmap(self.path, dtype=np.uint8, mode='w+', shape=(self._data_offset + self.data_capacity,))
+        self._write_header()
+        self._thread = threading.Thread(target=self._run, name='frame-recorder', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """남은 기록을 모두 쓴 뒤 파일을 닫습니다."""
+        if self._thread is None:
+            return
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+        self._write_header()
+        self._map.flush()
+        self._map = None
+
+    def record(self, frame: np.ndarray, area: tuple, targets: list, direction, metric: str = 'rgb',
+               pyramid_factor: int = 0, min_target_size: int = 0, found=None, blob_constraints: dict | None = None, anchor=None):
+        """
+        탐색한 프레임 한 장과 탐색 조건, 결과를 기록 대기열에 넣습니다.
+        캡처 버퍼는 다음 캡처에 다시 쓰이므로 여기서 복사합니다. (1920x1080 기준 1ms 이하)
+        """
+        if self._thread is None:
+            return
+        item = (time.time(), np.array(frame[..., :3]), tuple(area), targets, direction, metric, pyramid_factor, min_target_size, found, blob_constraints, anchor)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.dropped += 1
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                break
+            timestamp, frame, area, targets, direction, metric, pyramid_factor, min_target_size, found, blob_constraints, anchor = item
+            meta = json.dumps({
+                'area': area,
+                'targets': [[list(color), tolerance] for color, tolerance in targets],
+                'direction': direction.name,
+                'metric': metric,
+                'pyramid_factor': pyramid_factor,
+                'min_target_size': min_target_size,
+                'found': None if found is None else [found[0], list(found[1])],
+                'blob_constraints': blob_constraints or {},
+                'anchor': None if anchor is None else [int(anchor[0]), int(anchor[1])],
+            }).encode('utf-8')
+            self._write_record(timestamp, meta, frame)
+
+    def _write_record(self, timestamp: float, meta: bytes, frame: np.ndarray):
+        length = len(meta) + frame.nbytes
+        if length > self.data_capacity:
+            self.dropped += 1
+            return
+
+        # 기록 하나는 항상 데이터 영역 안에 연속으로 놓이도록, 끝에 걸치면 처음부터 씁니다.
+        position = self._written
+        offset = position % self.data_capacity
+        if offset + length > self.data_capacity:
+            position += self.data_capacity - offset
+            offset = 0
+
+        start = self._data_offset + offset
+        self._map[start:start + len(meta)] = np.frombuffer(meta, dtype=np.uint8)
+        self._map[start + len(meta):start + length] = frame.reshape(-1)
+
+        sequence = self.recorded
+        height, width = frame.shape[:2]
+        _ENTRY.pack_into(self._map, _HEADER_SIZE + (sequence % self.index_slots) * _ENTRY.size,
+                         sequence, position, len(meta), frame.nbytes, timestamp, width, height)
+        # 머리는 기록을 모두 쓴 뒤에 갱신하므로, 중간에 종료되어도 완성된 기록만 읽힙니다.
+        self._written = position + length
+        self.recorded += 1
+        self._write_header()
+
+    def _write_header(self):
+        _HEADER.pack_into(self._map, 0, RECORDING_MAGIC, RECORDING_VERSION, self.index_slots,
+                          self.data_capacity, self._written, self.recorded, self.dropped)
+
+    def get_stats(self) -> dict:
+        return {'recorded': self.recorded, 'dropped': self.dropped, 'pending': self._queue.qsize()}
+
+
+def read_recording(path: str) -> dict:
+    """
+    기록 파일에서 아직 덮어쓰이지 않은 기록을 순번 순서대로 읽습니다.
+    각 기록의 'frame'은 파일을 메모리 매핑한 (높이, 너비, 3) 배열이므로 파일 전체를 읽어 들이지 않습니다.
+    :return: {'records': [...], 'recorded': 전체 기록 수, 'dropped': 버린 프레임 수}
+    """
+    data = np.memmap(path, dtype=np.uint8, mode='r')
+    magic, version, index_slots, data_capacity, written, next_sequence, dropped = _HEADER.unpack_from(data, 0)
+    if magic != RECORDING_MAGIC or version != RECORDING_VERSION:
+        raise ValueError(f"프레임 기록 파일이 아닙니다: {path}")
+    data_offset = _HEADER_SIZE + index_slots * _ENTRY.size
+
+    records = []
+    for sequence in range(max(0, next_sequence - index_slots), next_sequence):
+        entry = _ENTRY.unpack_from(data, _HEADER_SIZE + (sequence % index_slots) * _ENTRY.size)
+        entry_sequence, position, meta_length, frame_length, timestamp, width, height = entry
+        # 데이터 영역을 한 바퀴 넘게 지난 기록은 이미 덮어쓰였습니다.
+        if entry_sequence != sequence or position < written - data_capacity:
+            continue
+        start = data_offset + position % data_capacity
+        meta = json.loads(bytes(data[start:start + meta_length]).decode('utf-8'))
+        frame_start = start + meta_length
+        meta['area'] = tuple(meta['area'])
+        meta['targets'] = [(tuple(color), tolerance) for color, tolerance in meta['targets']]
+        if meta['found'] is not None:
+            meta['found'] = (meta['found'][0], tuple(meta['found'][1]))
+        meta.update(sequence=sequence, timestamp=timestamp,
+                    frame=data[frame_start:frame_start + frame_length].reshape(height, width, 3))
+        records.append(meta)
+    return {'records': records, 'recorded': next_sequence, 'dropped': dropped}
+
+
+class ReplayScreenSource(ScreenSource):
+    """
+    기록 파일의 프레임을 화면처럼 제공하는 백엔드입니다.
+
+    영역별로 기록된 순서대로 프레임을 내주므로, 같은 설정으로 탐색하면 기록 당시와 같은 순서로 같은 화면을 봅니다.
+    기록된 영역들을 포함하는 합집합 영역을 요청하면 각 영역의 다음 프레임을 붙여 한 장으로 만듭니다.
+    speed가 1이면 기록된 시간 간격대로, 2이면 두 배 빠르게, 0이면 기다리지 않고 최대 속도로 재생합니다.
+    기록이 끝나면 영역마다 마지막 프레임을 계속 내주며, finished가 True가 됩니다.
+    """
+    name = 'replay'
+
+    def __init__(self, path: str, speed: float = 1.0, loop: bool = False):
+        super().__init__()
+        self.path = path
+        self.speed = speed
+        self.loop = loop
+        self.records = read_recording(path)['records']
+        self.on_finished = None # 기록을 모두 재생했을 때 한 번 호출할 함수
+        self.finished = False
+        self._rewind()
+
+    def _rewind(self):
+        self._pending = {} # 영역 -> 아직 재생하지 않은 기록
+        for record in self.records:
+            self._pending.setdefault(record['area'], deque()).append(record)
+        self._last = {} # 영역 -> 마지막으로 내준 기록
+        self._remaining = len(self.records)
+        self._started = None # (재생 시작 시각, 첫 기록의 캡처 시각)
+
+    def _next_record(self, area: tuple) -> dict | None:
+        pending = self._pending.get(area)
+        if not pending and self._remaining == 0:
+            # 마지막 기록까지 탐색에 쓰인 뒤, 다음 프레임을 요청받은 시점에 재생을 끝냅니다.
+            if self.loop:
+                self._rewind()
+                pending = self._pending.get(area)
+            elif not self.finished:
+                self.finished = True
+                if self.on_finished is not None:
+                    self.on_finished()
+        if pending:
+            record = pending.popleft()
+            self._remaining -= 1
+            self._last[area] = record
+            self._wait_for(record['timestamp'])
+            return record
+        return self._last.get(area)
+
+    def _wait_for(self, timestamp: float):
+        """기록된 시간 간격을 speed 배로 재현합니다."""
+        if self.speed <= 0:
+            return
+        now = time.monotonic()
+        if self._started is None:
+            self._started = (now, timestamp)
+            return
+        delay = self._started[0] + (timestamp - self._started[1]) / self.speed - now
+        if delay > 0:
+            time.sleep(delay)
+
+    def grab(self, bbox: tuple) -> np.ndarray:
+        bbox = tuple(bbox)
+        if bbox in self._pending:
+            record = self._next_record(bbox)
+            if record is not None:
+                return record['frame']
+
+        # 합집합(또는 기록되지 않은) 영역: 안에 들어가는 기록 영역의 다음 프레임을 붙입니다.
+        left, top, right, bottom = bbox
+        canvas = np.zeros((bottom - top, right - left, 3), dtype=np.uint8)
+        for area in self._pending:
+            x1, y1, x2, y2 = area
+            if left <= x1 and top <= y1 and x2 <= right and y2 <= bottom:
+                record = self._next_record(area)
+                if record is not None:
+                    canvas[y1 - top:y2 - top, x1 - left:x2 - left] = record['frame']
+        return canvas
+
+    def grab_pixel(self, x: int, y: int) -> tuple[int, int, int]:
+        """마지막으로 재생한 프레임 중 좌표를 포함하는 프레임의 색상을 반환합니다. (없으면 검은색)"""
+        for (x1, y1, x2, y2), record in self._last.items():
+            if x1 <= x < x2 and y1 <= y < y2:
+                return tuple(int(c) for c in record['frame'][y - y1, x - x1])
+        return (0, 0, 0)
+
+
+def run_info(args):
+    recording = read_recording(args.path)
+    records = recording['records']
+    print(f"기록 {len(records)}개 (전체 {recording['recorded']}개 중 남은 기록, 버림 {recording['dropped']}개)")
+    if not records:
+        return
+    span = records[-1]['timestamp'] - records[0]['timestamp']
+    print(f"기간: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(records[0]['timestamp']))}부터 {span:.1f}초")
+
+    areas = {}
+    for record in records:
+        row = areas.setdefault(record['area'], {'count': 0, 'found': 0})
+        row['count'] += 1
+        row['found'] += record['found'] is not None
+    print(f"{'영역':<28} {'프레임':>8} {'발견':>6}")
+    for area, row in areas.items():
+        print(f"{str(area):<28} {row['count']:>8} {row['found']:>6}")
+
+
+def run_replay(args):
+    """기록된 탐색 조건으로 모든 프레임을 다시 탐색하여, 기록 당시의 결과와 비교합니다."""
+    from .color_finder import ColorFinder, SearchDirection
+    from .latency_stats import LatencyStats
+
+    source = ReplayScreenSource(args.path, speed=args.speed)
+    finder = ColorFinder(source)
+    finder.use_frame_cache = not args.no_frame_cache
+    finder.use_tiled_scan = args.tiled
+    finder.use_color_lut = args.lut
+    finder.set_scan_workers(args.workers)
+    if args.latency:
+        finder.set_latency_stats(LatencyStats())
+
+    mismatches = 0
+    started = time.perf_counter()
+    for record in source.records:
+        found = finder.find_colors_in_area(
+            record['area'], record['targets'], SearchDirection[record['direction']],
+            pyramid_factor=record['pyramid_factor'], min_target_size=record['min_target_size'], metric=record['metric'],
+            blob_constraints=record.get('blob_constraints'), anchor=record.get('anchor'),
+        )
+        if found != record['found']:
+            mismatches += 1
+            if mismatches <= args.max_reports:
+                print(f"기록 {record['sequence']}: 영역 {record['area']} -> 기록 {record['found']}, 재생 {found}")
+    elapsed = time.perf_counter() - started
+    finder.shutdown_scan_pool()
+
+    count = len(source.records)
+    print(f"재생 {count}프레임, {elapsed:.2f}초 ({count / elapsed if elapsed else 0:.1f}fps), 결과 불일치 {mismatches}개")
+    if finder.latency_stats is not None:
+        print(finder.latency_stats.format_report())
+    return 1 if mismatches else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="탐색 프레임 기록 확인과 재생")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    info = commands.add_parser('info', help="기록 수, 기간, 영역별 프레임/발견 수")
+    info.add_argument('path')
+    info.set_defaults(func=run_info)
+
+    replay = commands.add_parser('replay', help="기록된 조건으로 다시 탐색하여 결과 비교 (불일치가 있으면 종료 코드 1)")
+    replay.add_argument('path')
+    replay.add_argument('--speed', type=float, default=0, help="재생 배속 (1: 기록 속도, 0: 최대 속도)")
+    replay.add_argument('--workers', type=int, default=1, help="띠 병렬 탐색 작업자 수")
+    replay.add_argument('--lut', action='store_true', help="색상표(LUT) 탐색 사용")
+    replay.add_argument('--tiled', action='store_true', help="타일 증분 탐색 사용")
+    replay.add_argument('--no-frame-cache', action='store_true', help="프레임 지문 캐시 사용 안 함")
+    replay.add_argument('--latency', action='store_true', help="단계별 지연 시간 출력")
+    replay.add_argument('--max-reports', type=int, default=10, help="출력할 불일치 기록 수")
+    replay.set_defaults(func=run_replay)
+
+    args = parser.parse_args(argv)
+    return args.func(args) or 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+import math
+import threading
+
+# 탐색 파이프라인의 측정 단계
+STAGES = ('capture', 'convert', 'hotspot', 'scan', 'blob_center', 'click', 'cycle')
+STAGE_NAMES = {
+    'capture': '캡처',
+    'convert': '배열 변환',
+    'hotspot': '최근 위치 확인',
+    'scan': '색상 탐색',
+    'blob_center': 'blob 중심',
+    'click': '클릭',
+    'cycle': '탐색 1회',
+}
+
+
+class LatencyHistogram:
+    """
+    고정 크기 로그 구간 히스토그램입니다.
+    1µs부터 약 1000초까지를 옥타브당 8칸(구간 폭 약 9%)으로 나누어, 기록 수와 관계없이 메모리가 일정합니다.
+    """
+    BINS_PER_OCTAVE = 8
+    MIN_SECONDS = 1e-6
+    BIN_COUNT = BINS_PER_OCTAVE * 30
+
+    __slots__ = ('counts', 'count', 'total', 'max')
+
+    def __init__(self):
+        self.counts = [0] * self.BIN_COUNT
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds: float):
+        if seconds > self.MIN_SECONDS:
+            index = min(int(math.log2(seconds / self.MIN_SECONDS) * self.BINS_PER_OCTAVE), self.BIN_COUNT - 1)
+        else:
+            index = 0
+        self.counts[index] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: 'LatencyHistogram'):
+        """다른 히스토그램의 기록을 더합니다."""
+        self.counts = [a + b for a, b in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def percentile(self, percent: float) -> float:
+        """백분위 값(초)을 반환합니다. 해당 구간의 상한값이며, 최댓값을 넘지 않습니다."""
+        if self.count == 0:
+            return 0.0
+        rank = max(1, math.ceil(self.count * percent / 100))
+        seen = 0
+        for index, bin_count in enumerate(self.counts):
+            seen += bin_count
+            if seen >= rank:
+                upper = self.MIN_SECONDS * 2 ** ((index + 1) / self.BINS_PER_OCTAVE)
+                return min(upper, self.max)
+        return self.max
+
+    def summary(self) -> dict:
+        """기록 수와 p50/p95/p99/최댓값/평균(ms)을 반환합니다."""
+        return {
+            'count': self.count,
+            'p50': self.percentile(50) * 1000,
+            'p95': self.percentile(95) * 1000,
+            'p99': self.percentile(99) * 1000,
+            'max': self.max * 1000,
+            'mean': self.total / self.count * 1000 if self.count else 0.0,
+        }
+
+
+class LatencyStats:
+    """
+    단계별, 영역별 지연 시간 히스토그램 모음입니다.
+    기록은 단계와 영역(탐색 영역 좌표, 영역과 무관하면 None)으로 구분하며,
+    단계 전체 통계는 조회할 때 영역별 히스토그램을 합쳐 계산합니다.
+    """
+    def __init__(self):
+        self._histograms = {} # (단계, 영역) -> LatencyHistogram
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, seconds: float, area=None):
+        """한 번의 소요 시간(초)을 기록합니다. 기록 비용은 수 µs 이하입니다."""
+        key = (stage, area)
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram())
+        histogram.record(seconds)
+
+    def reset(self):
+        with self._lock:
+            self._histograms.clear()
+
+    def summarize(self) -> dict:
+        """
+        {(단계, 영역): 요약} 형태로 반환합니다. 영역이 None인 항목은 그 단계의 모든 영역을 합친 값입니다.
+        """
+        with self._lock:
+            items = list(self._histograms.items())
+
+        totals = {}
+        result = {}
+        for (stage, area), histogram in items:
+            if area is not None:
+                result[(stage, area)] = histogram.summary()
+            total = totals.setdefault(stage, LatencyHistogram())
+            total.merge(histogram)
+        for stage, histogram in totals.items():
+            result[(stage, None)] = histogram.summary()
+        return result
+
+    def format_report(self, area_names: dict | None = None) -> str:
+        """단계별 요약 표를 문자열로 만듭니다. area_names로 영역 좌표에 표시 이름을 붙일 수 있습니다."""
+        area_names = area_names or {}
+        summary = self.summarize()
+        stage_order = {stage: i for i, stage in enumerate(STAGES)}
+        keys = sorted(summary, key=lambda key: (stage_order.get(key[0], len(STAGES)), key[0], key[1] is not None, str(key[1])))
+
+        lines = [f"{'단계':<12} {'영역':<24} {'횟수':>7} {'p50':>8} {'p95':>8} {'p99':>8} {'최대':>8} (ms)"]
+        for stage, area in keys:
+            row = summary[(stage, area)]
+            area_label = '전체' if area is None else area_names.get(area, str(area))
+            lines.append(f"{STAGE_NAMES.get(stage, stage):<12} {area_label:<24} {row['count']:>7} "
+                         f"{row['p50']:>8.2f} {row['p95']:>8.2f} {row['p99']:>8.2f} {row['max']:>8.2f}")
+        return '\n'.join(lines)
@@ -0,0 +1,104 @@
+import time
+
+
+class PollingGovernor:
+    """
+    반복 탐색의 다음 캡처까지 대기 시간을 정하는 조절기입니다.
+
+    매 탐색의 실제 작업 시간(캡처 + 탐색)과 화면이 바뀌었는지를 기록받아,
+    CPU 사용률이 cpu_budget(코어 하나 기준 비율)을 넘지 않고 target_fps에 가깝도록 대기 시간을 고릅니다.
+    화면이 바뀌는 동안에는 이 최소 대기 시간으로 빠르게 탐색하고, 화면이 그대로이면 대기 시간을
+    static_backoff 배씩 늘려 max_interval까지 물러납니다. 화면이 다시 바뀌면 즉시 최소 대기 시간으로 돌아옵니다.
+
+    사용 예:
+        governor.begin_cycle()
+        found = finder.find_colors_in_area(...)
+        time.sleep(governor.end_cycle(finder.last_frame_changed))
+    """
+    SMOOTHING = 0.3 # 작업 시간/주기 지수 이동 평균의 새 값 가중치
+
+    def __init__(self, cpu_budget: float = 0.25, target_fps: float = 0.0, min_interval: float = 0.0,
+                 max_interval: float = 0.25, static_backoff: float = 1.5):
+        """
+        :param cpu_budget: 탐색 스레드가 쓸 수 있는 CPU 시간 비율 (0~1, 0이면 제한 없음)
+        :param target_fps: 목표 초당 탐색 수 (0이면 예산 안에서 가능한 한 빠르게)
+        :param min_interval: 화면이 바뀌는 동안의 최소 대기 시간 (초)
+        :param max_interval: 화면이 그대로일 때 물러나는 최대 대기 시간 (초). 예산이 더 긴 대기를 요구하면 예산을 따릅니다.
+        :param static_backoff: 화면이 그대로인 탐색마다 대기 시간을 늘리는 배율
+        """
+        self.cpu_budget = cpu_budget
+        self.target_fps = target_fps
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.static_backoff = static_backoff
+        self.reset()
+
+    def reset(self):
+        """측정값을 지우고 처음 상태로 돌아갑니다."""
+        self.work_seconds = None # 탐색 1회 작업 시간의 이동 평균 (아직 측정 전이면 None)
+        self.period_seconds = None # 탐색 시작 간격의 이동 평균 (아직 측정 전이면 None)
+        self.change_rate = 1.0 # 화면이 바뀐 탐색 비율의 이동 평균
+        self.interval = self.min_interval # 다음 대기 시간
+        self._cycle_started = None
+        self._last_cycle_started = None
+
+    def begin_cycle(self):
+        """탐색(캡처 + 색상 탐색) 직전에 호출합니다."""
+        now = time.perf_counter()
+        if self._last_cycle_started is not None:
+            self.period_seconds = self._smooth(self.period_seconds, now - self._last_cycle_started)
+        self._last_cycle_started = now
+        self._cycle_started = now
+
+    def end_cycle(self, changed: bool = True) -> float:
+        """
+        탐색 직후에 호출합니다.
+
+        :param changed: 이번 탐색의 화면이 지난 탐색과 달랐는지 여부 (모르면 True)
+        :return: 다음 탐색까지 대기할 시간 (초)
+        """
+        if self._cycle_started is not None:
+            self.work_seconds = self._smooth(self.work_seconds, time.perf_counter() - self._cycle_started)
+            self._cycle_started = None
+        self.change_rate = self._smooth(self.change_rate, 1.0 if changed else 0.0)
+
+        fastest = self.min_interval_for_budget()
+        if changed:
+            self.interval = fastest
+        else:
+            backoff = max(self.interval, self.min_interval, 0.001) * self.static_backoff
+            self.interval = max(fastest, min(backoff, self.max_interval))
+        return self.interval
+
+    def min_interval_for_budget(self) -> float:
+        """CPU 예산과 목표 초당 탐색 수를 모두 지키는 가장 짧은 대기 시간을 반환합니다."""
+        interval = self.min_interval
+        work = self.work_seconds or 0.0
+        if 0 < self.cpu_budget < 1:
+            # work / (work + 대기) <= 예산
+            interval = max(interval, work * (1 - self.cpu_budget) / self.cpu_budget)
+        if self.target_fps > 0:
+            interval = max(interval, 1.0 / self.target_fps - work)
+        return interval
+
+    def _smooth(self, average: float | None, value: float) -> float:
+        if average is None:
+            return value
+        return average + self.SMOOTHING * (value - average)
+
+    @property
+    def rate(self) -> float:
+        """현재 초당 탐색 수"""
+        return 1.0 / self.period_seconds if self.period_seconds else 0.0
+
+    @property
+    def budget_usage(self) -> float:
+        """CPU 예산 대비 현재 사용률 (1이면 예산을 모두 사용). 예산 제한이 없으면 CPU 사용률 자체를 반환합니다."""
+        if not self.period_seconds or self.work_seconds is None:
+            return 0.0
+        usage = min(1.0, self.work_seconds / self.period_seconds)
+        return usage / self.cpu_budget if 0 < self.cpu_budget < 1 else usage
+
+    def describe(self) -> str:
+        """상태 표시줄용 요약 문자열 (예: '12.3회/s, 예산 45%, 화면 변화 20%')"""
+        return f"{self.rate:.1f}회/s, 예산 {self.budget_usage * 100:.0f}%, 화면 변화 {self.change_rate * 100:.0f}%"
@@ -0,0 +1,114 @@
+import numpy as np
+
+from .color_finder import SearchDirection
+from .screen_source import ScreenSource
+
+
+class ReferenceColorFinder:
+    """
+    픽셀 단위 이중 루프로 구현된 최초의 색상 탐색 엔진입니다.
+    느리지만 결과(방향별 순회 순서와 blob 중심 계산)의 기준이 되므로, 최적화된 엔진의 동등성 검증에만 사용합니다.
+    캡처만 ImageGrab 대신 ScreenSource를 거치도록 바꾸었고, 탐색 로직은 원래 코드 그대로입니다.
+    """
+    def __init__(self, screen_source: ScreenSource):
+        self.screen_source = screen_source
+
+    def _is_color_match(self, c1_rgb: tuple, c2_rgb: tuple, tolerance_sq: int) -> bool:
+        """두 색상이 허용 오차 내에 있는지 확인합니다."""
+        r1, g1, b1 = c1_rgb
+        r2, g2, b2 = c2_rgb
+        dist_sq = (int(r1) - r2)**2 + (int(g1) - g2)**2 + (int(b1) - b2)**2
+        return dist_sq <= tolerance_sq
+
+    def _find_blob_center(self, img_array: np.ndarray, start_x: int, start_y: int, color: tuple, tolerance_sq: int) -> tuple[int, int]:
+        """
+        발견된 픽셀을 시작으로 상하좌우로 색상 영역을 스캔하여
+        해당 영역(blob)의 중심 좌표를 찾습니다.
+        """
+        height, width, _ = img_array.shape
+
+        # 1. 가로 경계 찾기 (x-axis)
+        x_min, x_max = start_x, start_x
+        # 시작점에서 왼쪽으로 스캔
+        for x in range(start_x - 1, -1, -1):
+            if self._is_color_match(img_array[start_y, x][:3], color, tolerance_sq):
+                x_min = x
+            else:
+                break
+        # 시작점에서 오른쪽으로 스캔
+        for x in range(start_x + 1, width):
+            if self._is_color_match(img_array[start_y, x][:3], color, tolerance_sq):
+                x_max = x
+            else:
+                break
+
+        center_x = (x_min + x_max) // 2
+
+        # 2. 세로 경계 찾기 (y-axis at a horizontal center)
+        y_min, y_max = start_y, start_y
+        # 중심 x좌표에서 위쪽으로 스캔
+        for y in range(start_y - 1, -1, -1):
+            if self._is_color_match(img_array[y, center_x][:3], color, tolerance_sq):
+                y_min = y
+            else:
+                break
+        # 중심 x좌표에서 아래쪽으로 스캔
+        for y in range(start_y + 1, height):
+            if self._is_color_match(img_array[y, center_x][:3], color, tolerance_sq):
+                y_max = y
+            else:
+                break
+
+        center_y = (y_min + y_max) // 2
+
+        return center_x, center_y
+
+    def find_color_in_area(self, area: tuple, color: tuple, tolerance: int, direction: SearchDirection) -> tuple[int, int] | None:
+        """
+        지정된 영역(area)에서 주어진 색상(color)을 허용 오차(tolerance) 내에서 찾습니다.
+        지정된 방향으로 픽셀을 순회합니다.
+        """
+        x1, y1, x2, y2 = area
+        if not (x2 > x1 and y2 > y1):
+            return None
+
+        img_array = np.array(self.screen_source.grab((x1, y1, x2, y2)))
+        height, width, _ = img_array.shape
+
+        # 성능을 위해 제곱된 허용 오차를 사용합니다.
+        tolerance_sq = tolerance**2
+
+        # 가로 우선 탐색 (기존 방식)
+        if direction in [SearchDirection.TOP_LEFT_TO_BOTTOM_RIGHT, SearchDirection.TOP_RIGHT_TO_BOTTOM_LEFT, SearchDirection.BOTTOM_LEFT_TO_TOP_RIGHT, SearchDirection.BOTTOM_RIGHT_TO_TOP_LEFT]:
+            if direction == SearchDirection.TOP_LEFT_TO_BOTTOM_RIGHT:
+                y_range, x_range = range(height), range(width)
+            elif direction == SearchDirection.TOP_RIGHT_TO_BOTTOM_LEFT:
+                y_range, x_range = range(height), range(width - 1, -1, -1)
+            elif direction == SearchDirection.BOTTOM_LEFT_TO_TOP_RIGHT:
+                y_range, x_range = range(height - 1, -1, -1), range(width)
+            else: # BOTTOM_RIGHT_TO_TOP_LEFT
+                y_range, x_range = range(height - 1, -1, -1), range(width - 1, -1, -1)
+
+            for y in y_range:
+                for x in x_range:
+                    if self._is_color_match(img_array[y, x][:3], color, tolerance_sq):
+                        center_x_rel, center_y_rel = self._find_blob_center(img_array, x, y, color, tolerance_sq)
+                        return x1 + center_x_rel, y1 + center_y_rel
+        # 세로 우선 탐색 (새로 추가)
+        else:
+            if direction == SearchDirection.TOP_TO_BOTTOM_LEFT_TO_RIGHT:
+                x_range, y_range = range(width), range(height)
+            elif direction == SearchDirection.TOP_TO_BOTTOM_RIGHT_TO_LEFT:
+                x_range, y_range = range(width - 1, -1, -1), range(height)
+            elif direction == SearchDirection.BOTTOM_TO_TOP_LEFT_TO_RIGHT:
+                x_range, y_range = range(width), range(height - 1, -1, -1)
+            else: # BOTTOM_TO_TOP_RIGHT_TO_LEFT
+                x_range, y_range = range(width - 1, -1, -1), range(height - 1, -1, -1)
+
+            for x in x_range:
+                for y in y_range:
+                    if self._is_color_match(img_array[y, x][:3], color, tolerance_sq):
+                        center_x_rel, center_y_rel = self._find_blob_center(img_array, x, y, color, tolerance_sq)
+                        return x1 + center_x_rel, y1 + center_y_rel
+
+        return None
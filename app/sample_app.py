@@ -7,9 +7,8 @@ import random
 import sys
 from pynput import mouse
 from pynput import keyboard
-from PIL import ImageGrab
-from color_finder import ColorFinder, SearchDirection
-from global_hotkey_listener import GlobalHotkeyListener
+from .color_finder import ColorFinder, SearchDirection
+from .global_hotkey_listener import GlobalHotkeyListener
 
 class SampleApp:
     def __init__(self, root):
@@ -20,7 +19,7 @@ class SampleApp:
         self._process_ui_queue() # UI 업데이트 큐 처리 시작
 
         # 핵심 로직 컴포넌트 초기화
-        self.color_finder = ColorFinder(sleep_time=self.sleep_time)
+        self.color_finder = ColorFinder()
         self.mouse_controller = mouse.Controller()
         hotkey_map = {
             'tab+esc': self.start_search,
@@ -351,9 +350,7 @@ class SampleApp:
             x, y = self.mouse_controller.position
             ix, iy = int(x), int(y)
             
-            screenshot = ImageGrab.grab(bbox=(ix, iy, ix + 1, iy + 1)).convert('RGB')
-            pixel_color = screenshot.getpixel((0, 0))
-            new_color = pixel_color
+            new_color = self.color_finder.screen_source.grab_pixel(ix, iy)
 
             if color_index == 0:
                 self.color_var.set(str(new_color))
@@ -569,9 +566,10 @@ class SampleApp:
     def _search_worker(self):
         """(스레드 워커) 색상을 주기적으로 검색하고, 찾으면 클릭 후 종료합니다."""
         while self.is_searching:
-            abs_x, abs_y = self.color_finder.find_color_in_area(self.area, self.current_search_color, self.color_tolerance, self.search_direction)
+            found_pos = self.color_finder.find_color_in_area(self.area, self.current_search_color, self.color_tolerance, self.search_direction)
 
-            if abs_x is not None and abs_y is not None:
+            if found_pos is not None:
+                abs_x, abs_y = found_pos
                 self.color_finder.click_action(abs_x, abs_y)
 
                 if self.position3 != (0, 0):
@@ -585,7 +583,9 @@ class SampleApp:
                         offset_y = random.randint(-self.click_offset3, self.click_offset3)
                         final_comp_x += offset_x
                         final_comp_y += offset_y
-                    self.color_finder.click_action(final_comp_x, final_comp_y, delay=self.complete_click_delay)
+                    if self.complete_click_delay > 0:
+                        time.sleep(self.complete_click_delay)
+                    self.color_finder.click_action(final_comp_x, final_comp_y)
                     status_message = f"색상 클릭 후 완료선택({final_comp_x},{final_comp_y}) 클릭"
                 else:
                     status_message = f"색상 발견 및 클릭 완료: ({abs_x}, {abs_y})"
@@ -644,7 +644,9 @@ class SampleApp:
                     if self.fail_click_delay > 0:
                         random_offset = random.uniform(-0.1, 0.1)
                         final_delay = self.fail_click_delay + random_offset
-                    self.color_finder.click_action(fail_x, fail_y, delay=max(0, final_delay))
+                    if final_delay > 0:
+                        time.sleep(final_delay)
+                    self.color_finder.click_action(fail_x, fail_y)
 
                     # 자동 중단 로직
                     self.total_fail_clicks += 1
@@ -0,0 +1,337 @@
+import threading
+import time
+import numpy as np
+from PIL import Image, ImageGrab
+
+from .color_search import frame_fingerprint
+
+
+class ScreenSource:
+    """
+    화면 캡처 백엔드의 공통 인터페이스입니다.
+    ColorFinder와 컨트롤러의 모든 캡처는 이 인터페이스를 거칩니다.
+    """
+    name = 'base'
+
+    def __init__(self):
+        # 영역 크기별로 재사용하는 프레임 버퍼. 매 캡처마다 새 배열을 할당하지 않습니다.
+        # 캡처 생산 스레드와 탐색 스레드가 같은 크기를 캡처해도 겹치지 않도록 스레드마다 따로 둡니다.
+        self._local_buffers = threading.local()
+        # 지연 시간 측정 (LatencyStats). None이면 측정하지 않습니다.
+        self.latency_stats = None
+
+    def grab(self, bbox: tuple) -> np.ndarray:
+        """
+        (left, top, right, bottom) 영역을 캡처하여 (높이, 너비, 3) uint8 RGB 배열로 반환합니다.
+        반환값은 재사용 버퍼의 채널 뷰일 수 있으므로, 같은 스레드에서 같은 크기로 다시 캡처하기 전까지만 유효합니다.
+        읽기 전용 배열일 수 있으므로 수정하지 말고 필요하면 복사해서 사용합니다.
+        """
+        raise NotImplementedError
+
+    def _fill_frame_buffer(self, raw: np.ndarray) -> np.ndarray:
+        """원본 바이트의 뷰(raw)를 같은 크기의 재사용 버퍼에 복사하고 그 버퍼를 반환합니다."""
+        buffers = getattr(self._local_buffers, 'buffers', None)
+        if buffers is None:
+            buffers = self._local_buffers.buffers = {}
+        buffer = buffers.get(raw.shape)
+        if buffer is None:
+            buffer = np.empty(raw.shape, dtype=np.uint8)
+            buffers[raw.shape] = buffer
+        np.copyto(buffer, raw)
+        return buffer
+
+    def grab_pixel(self, x: int, y: int) -> tuple[int, int, int]:
+        """지정된 좌표 한 픽셀의 (R, G, B) 값을 반환합니다."""
+        pixel = self.grab((x, y, x + 1, y + 1))[0, 0]
+        return tuple(int(v) for v in pixel[:3])
+
+    def close(self):
+        """백엔드가 사용하는 리소스를 정리합니다."""
+        pass
+
+
+class PillowScreenSource(ScreenSource):
+    """PIL.ImageGrab을 사용하는 기본 캡처 백엔드입니다."""
+    name = 'pillow'
+
+    def grab(self, bbox: tuple) -> np.ndarray:
+        stats = self.latency_stats
+        if stats is not None:
+            started = time.perf_counter()
+        screenshot = ImageGrab.grab(bbox=bbox)
+        if stats is not None:
+            grabbed = time.perf_counter()
+            stats.record('capture', grabbed - started, bbox)
+        if screenshot.mode not in ('RGB', 'RGBA'):
+            screenshot = screenshot.convert('RGB')
+        # Pillow는 이미지 메모리를 직접 내보내지 않고 np.asarray도 내부에서 tobytes로 한 번 복사하므로,
+        # 그 바이트를 그대로 감싼 배열을 사용합니다. 재사용 버퍼에 다시 복사하면 프레임마다 두 번 복사하게 됩니다.
+        frame = np.asarray(screenshot)
+        if stats is not None:
+            stats.record('convert', time.perf_counter() - grabbed, bbox)
+        # 알파 채널은 복사하지 않고 RGB 채널 뷰만 반환합니다.
+        return frame[..., :3]
+
+
+class MssScreenSource(ScreenSource):
+    """
+    mss 라이브러리를 사용하는 네이티브 캡처 백엔드입니다. (pip install mss)
+    PIL 이미지 변환을 거치지 않아 ImageGrab보다 빠릅니다.
+    """
+    name = 'mss'
+
+    def __init__(self):
+        super().__init__()
+        import mss  # 선택 의존성이므로 이 백엔드를 사용할 때만 불러옵니다.
+        self._mss_module = mss
+        # mss 인스턴스는 스레드 간에 공유할 수 없으므로 스레드마다 따로 생성합니다.
+        self._local = threading.local()
+
+    def _get_sct(self):
+        sct = getattr(self._local, 'sct', None)
+        if sct is None:
+            sct = self._mss_module.mss()
+            self._local.sct = sct
+        return sct
+
+    def grab(self, bbox: tuple) -> np.ndarray:
+        left, top, right, bottom = bbox
+        width, height = right - left, bottom - top
+        stats = self.latency_stats
+        if stats is not None:
+            started = time.perf_counter()
+        shot = self._get_sct().grab({'left': left, 'top': top, 'width': width, 'height': height})
+        if stats is not None:
+            grabbed = time.perf_counter()
+            stats.record('capture', grabbed - started, bbox)
+        raw = np.frombuffer(shot.raw, dtype=np.uint8).reshape(shot.height, shot.width, 4)
+        # Retina 등 고배율 화면에서는 논리 좌표 크기에 맞게 줄입니다.
+        if shot.height != height and height > 0:
+            step = shot.height // height
+            raw = raw[::step, ::step][:height, :width]
+        frame = self._fill_frame_buffer(raw)
+        if stats is not None:
+            stats.record('convert', time.perf_counter() - grabbed, bbox)
+        # 버퍼는 BGRA 순서이므로 채널 순서를 뒤집은 뷰로 RGB를 만듭니다.
+        return frame[..., 2::-1]
+
+    def close(self):
+        sct = getattr(self._local, 'sct', None)
+        if sct is not None:
+            sct.close()
+            self._local.sct = None
+
+
+class ArrayScreenSource(ScreenSource):
+    """
+    메모리 배열이나 이미지 파일을 화면처럼 제공하는 백엔드입니다.
+    디스플레이가 없는 환경에서의 벤치마크, 저장된 화면의 재현에 사용합니다.
+
+    frames의 각 항목은 가상 화면 전체이며, origin은 그 화면의 좌상단 화면 좌표입니다.
+    grab을 호출할 때마다 다음 프레임으로 넘어갑니다. (loop=False이면 마지막 프레임 유지)
+    """
+    name = 'array'
+
+    def __init__(self, frames: list, origin: tuple = (0, 0), loop: bool = True):
+        super().__init__()
+        if not frames:
+            raise ValueError("최소 한 개의 프레임이 필요합니다.")
+        self.frames = [self._load_frame(frame) for frame in frames]
+        self.origin = origin
+        self.loop = loop
+        self.frame_index = 0
+
+    @classmethod
+    def from_files(cls, paths: list, origin: tuple = (0, 0), loop: bool = True) -> 'ArrayScreenSource':
+        """이미지 파일 경로 목록으로부터 재생 소스를 만듭니다."""
+        return cls(list(paths), origin=origin, loop=loop)
+
+    @staticmethod
+    def _load_frame(frame) -> np.ndarray:
+        if isinstance(frame, np.ndarray):
+            return frame[..., :3]
+        with Image.open(frame) as image:
+            return np.array(image.convert('RGB'))
+
+    def set_frame(self, frame: np.ndarray):
+        """재생 중인 프레임 목록을 한 장의 프레임으로 교체합니다."""
+        self.frames = [self._load_frame(frame)]
+        self.frame_index = 0
+
+    def grab(self, bbox: tuple) -> np.ndarray:
+        frame = self.frames[self.frame_index]
+        if self.frame_index + 1 < len(self.frames):
+            self.frame_index += 1
+        elif self.loop:
+            self.frame_index = 0
+
+        left, top, right, bottom = bbox
+        ox, oy = self.origin
+        # 메모리에 있는 프레임이므로 복사 없이 잘라낸 뷰를 그대로 반환합니다.
+        return frame[top - oy:bottom - oy, left - ox:right - ox]
+
+
+class UnionFrame:
+    """
+    여러 탐색 영역을 덮는 합집합 영역을 한 번 캡처한 프레임입니다.
+    각 영역은 복사 없는 조각(뷰)으로 꺼내며, 캡처 버퍼가 다시 쓰이기 전까지만 유효합니다.
+    """
+    def __init__(self, image: np.ndarray, bbox: tuple, timestamp: float | None = None, sequence: int = 0):
+        self.image = image
+        self.bbox = tuple(bbox)
+        self.timestamp = time.monotonic() if timestamp is None else timestamp # 캡처를 시작한 시각 (time.monotonic)
+        self.sequence = sequence # 캡처 생산 스레드가 매긴 프레임 번호
+        self._fingerprint = None
+
+    def contains(self, area: tuple) -> bool:
+        """영역이 이 프레임 안에 완전히 들어오는지 확인합니다."""
+        left, top, right, bottom = self.bbox
+        x1, y1, x2, y2 = area
+        return left <= x1 and top <= y1 and x2 <= right and y2 <= bottom
+
+    def crop(self, area: tuple) -> np.ndarray:
+        """화면 좌표 영역에 해당하는 조각을 복사 없이 반환합니다."""
+        left, top = self.bbox[:2]
+        x1, y1, x2, y2 = area
+        return self.image[y1 - top:y2 - top, x1 - left:x2 - left]
+
+    @property
+    def fingerprint(self) -> int:
+        """프레임 지문. 같은 프레임을 나눠 쓰는 모든 영역이 한 번 계산한 값을 공유합니다."""
+        if self._fingerprint is None:
+            self._fingerprint = frame_fingerprint(self.image)
+        return self._fingerprint
+
+
+class FrameProducer:
+    """
+    별도 스레드에서 목표 주기로 영역을 캡처해 작은 프레임 링 버퍼에 채우는 생산자입니다.
+    탐색 스레드는 get_frame으로 항상 가장 최근 프레임만 가져가며, 소비되기 전에 더 새 프레임으로
+    대체된 프레임은 대기열에 쌓지 않고 버립니다.
+
+    링 버퍼는 (소비자가 사용 중인 칸, 최신 칸, 캡처 중인 칸)을 위해 최소 3칸을 사용하므로,
+    get_frame이 반환한 프레임은 다음 get_frame 호출 전까지 덮어써지지 않습니다.
+    """
+    def __init__(self, screen_source: ScreenSource, bbox: tuple, target_fps: float = 30.0, ring_size: int = 3):
+        left, top, right, bottom = bbox
+        self.screen_source = screen_source
+        self.bbox = tuple(bbox)
+        self.target_fps = target_fps
+        self._ring = [np.empty((bottom - top, right - left, 3), dtype=np.uint8) for _ in range(max(3, ring_size))]
+        self._timestamps = [0.0] * len(self._ring)
+        self._condition = threading.Condition()
+        self._thread: threading.Thread | None = None
+        self._running = False
+
+        self._latest_slot = None # 가장 최근에 완성된 칸
+        self._held_slot = None # 소비자가 사용 중인 칸
+        self._latest_consumed = True # 최신 칸이 이미 소비되었는지 여부
+        self.sequence = 0 # 지금까지 완성된 프레임 수
+        self.frames_consumed = 0
+        self.frames_dropped = 0 # 소비되기 전에 더 새 프레임으로 대체되어 버려진 프레임 수
+        self.capture_errors = 0
+        self.started_at = None
+
+    def start(self):
+        if self._running:
+            return
+        self._running = True
+        self.started_at = time.monotonic()
+        self._thread = threading.Thread(target=self._run, name='frame-producer', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._running = False
+        with self._condition:
+            self._condition.notify_all()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+
+    def _run(self):
+        interval = 1.0 / self.target_fps if self.target_fps > 0 else 0.0
+        while self._running:
+            started = time.monotonic()
+            with self._condition:
+                # 소비자가 사용 중인 칸과 최신 칸을 제외한 칸에 씁니다.
+                slot = next(i for i in range(len(self._ring)) if i != self._held_slot and i != self._latest_slot)
+            try:
+                np.copyto(self._ring[slot], self.screen_source.grab(self.bbox))
+            except Exception as e:
+                self.capture_errors += 1
+                if self.capture_errors == 1:
+                    print(f"캡처 생산 스레드 오류: {e}")
+                time.sleep(max(interval, 0.1))
+                continue
+
+            with self._condition:
+                if not self._latest_consumed:
+                    self.frames_dropped += 1
+                self._timestamps[slot] = started
+                self._latest_slot = slot
+                self._latest_consumed = False
+                self.sequence += 1
+                self._condition.notify_all()
+
+            remaining = interval - (time.monotonic() - started)
+            if remaining > 0:
+                time.sleep(remaining)
+
+    def get_frame(self, since: float | None = None, timeout: float = 1.0) -> UnionFrame | None:
+        """
+        가장 최근 프레임을 가져옵니다. since(time.monotonic 기준)가 주어지면 그 이후에 캡처를 시작한
+        프레임이 나올 때까지 최대 timeout초 기다립니다. 시간 안에 없으면 None을 반환합니다.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            while self._running and (self._latest_slot is None or (since is not None and self._timestamps[self._latest_slot] <= since)):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+            if self._latest_slot is None:
+                return None
+            slot = self._latest_slot
+            if since is not None and self._timestamps[slot] <= since:
+                return None
+            if not self._latest_consumed:
+                self._latest_consumed = True
+                self.frames_consumed += 1
+            self._held_slot = slot
+            return UnionFrame(self._ring[slot], self.bbox, self._timestamps[slot], self.sequence)
+
+    def get_stats(self) -> dict:
+        """캡처/소비/버린 프레임 수와 실제 캡처·소비 fps, 최신 프레임의 경과 시간을 반환합니다."""
+        with self._condition:
+            elapsed = time.monotonic() - self.started_at if self.started_at else 0.0
+            latest_age = time.monotonic() - self._timestamps[self._latest_slot] if self._latest_slot is not None else None
+            return {
+                'captured': self.sequence,
+                'consumed': self.frames_consumed,
+                'dropped': self.frames_dropped,
+                'capture_fps': self.sequence / elapsed if elapsed > 0 else 0.0,
+                'consume_fps': self.frames_consumed / elapsed if elapsed > 0 else 0.0,
+                'latest_age': latest_age,
+            }
+
+
+# 설정 파일 등에서 이름으로 선택할 수 있는 백엔드 목록
+SCREEN_SOURCES = {
+    'pillow': PillowScreenSource,
+    'mss': MssScreenSource,
+}
+
+
+def create_screen_source(name: str = 'pillow') -> ScreenSource:
+    """
+    이름으로 캡처 백엔드를 생성합니다.
+    'auto'는 사용 가능한 가장 빠른 백엔드(mss)를 고르고, 없으면 pillow를 사용합니다.
+    """
+    if name == 'auto':
+        try:
+            return MssScreenSource()
+        except ImportError:
+            return PillowScreenSource()
+    if name not in SCREEN_SOURCES:
+        raise ValueError(f"알 수 없는 캡처 백엔드입니다: {name}")
+    return SCREEN_SOURCES[name]()
@@ -0,0 +1,153 @@
+import os
+import time
+import numpy as np
+from PIL import Image
+
+# 템플릿 선택기로 캡처한 패치를 저장하는 위치
+TEMPLATE_DIR = os.path.join(os.path.expanduser('~'), '.outtic', 'templates')
+
+# 명암 변환 가중치 (ITU-R BT.601). 템플릿과 화면 모두 같은 가중치로 한 채널로 줄입니다.
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+# 보관할 화면 크기별 템플릿 스펙트럼 수
+_MAX_CACHED_SPECTRA = 8
+# 점수 비교 전에 후보가 이보다 많으면 점수가 높은 것만 남깁니다. (낮은 임계값에서 비최대 억제 비용 제한)
+_MAX_CANDIDATES = 4096
+
+
+def to_gray(image: np.ndarray) -> np.ndarray:
+    """(높이, 너비, 3) RGB 배열을 float32 명암 배열로 변환합니다."""
+    return image[..., :3] @ _LUMA
+
+
+def _fast_length(n: int) -> int:
+    """n 이상이면서 소인수가 2, 3, 5뿐인 가장 작은 수. 이 길이의 FFT가 가장 빠릅니다."""
+    best = 1 << max(0, (n - 1).bit_length())
+    power5 = 1
+    while power5 < best:
+        power35 = power5
+        while power35 < best:
+            length = power35
+            while length < n:
+                length *= 2
+            best = min(best, length)
+            power35 *= 3
+        power5 *= 5
+    return best
+
+
+def _window_sums(values: np.ndarray, height: int, width: int) -> np.ndarray:
+    """누적 합(적분 영상)으로 모든 height x width 창의 합을 구합니다."""
+    integral = np.zeros((values.shape[0] + 1, values.shape[1] + 1), dtype=np.float64)
+    np.cumsum(values, axis=0, out=integral[1:, 1:])
+    np.cumsum(integral[1:, 1:], axis=1, out=integral[1:, 1:])
+    return integral[height:, width:] - integral[:-height, width:] - integral[height:, :-width] + integral[:-height, :-width]
+
+
+class TemplateMatcher:
+    """
+    작은 기준 패치(아이콘, 버튼 등)를 화면에서 찾는 정규화 상호상관(NCC) 탐색기입니다.
+
+    상관은 FFT로 계산하며, 화면 크기별 템플릿 스펙트럼을 보관하므로 프레임마다 정방향/역방향 변환 한 번씩만 합니다.
+    창별 밝기 평균과 분산은 적분 영상으로 구하므로, 점수는 밝기나 대비가 달라져도 -1~1 범위로 비교할 수 있습니다.
+    """
+    def __init__(self, template: np.ndarray):
+        gray = to_gray(np.asarray(template, dtype=np.float32))
+        if gray.ndim != 2 or gray.shape[0] < 2 or gray.shape[1] < 2:
+            raise ValueError("템플릿은 2x2 픽셀 이상이어야 합니다.")
+        zero_mean = gray - gray.mean()
+        norm = float(np.sqrt(np.square(zero_mean, dtype=np.float64).sum()))
+        if norm < 1e-3:
+            raise ValueError("단색 템플릿은 모양 정보가 없으므로 색상 탐색을 사용하세요.")
+
+        self.template = np.ascontiguousarray(template[..., :3], dtype=np.uint8)
+        self.height, self.width = gray.shape
+        self._zero_mean = zero_mean
+        self._norm = norm
+        self._spectra = {} # (높이, 너비) FFT 크기 -> 켤레 템플릿 스펙트럼
+
+    def _get_spectrum(self, fft_shape: tuple) -> np.ndarray:
+        spectrum = self._spectra.get(fft_shape)
+        if spectrum is None:
+            if len(self._spectra) >= _MAX_CACHED_SPECTRA:
+                self._spectra.clear()
+            spectrum = np.conj(np.fft.rfft2(self._zero_mean, s=fft_shape))
+            self._spectra[fft_shape] = spectrum
+        return spectrum
+
+    def match_scores(self, frame: np.ndarray) -> np.ndarray | None:
+        """
+        템플릿의 좌상단을 놓을 수 있는 모든 위치의 NCC 점수 (높이 - h + 1, 너비 - w + 1) 배열을 반환합니다.
+        화면이 템플릿보다 작으면 None을 반환합니다. 밝기가 균일한 창의 점수는 0입니다.
+        """
+        frame_height, frame_width = frame.shape[:2]
+        if frame_height < self.height or frame_width < self.width:
+            return None
+        gray = to_gray(frame)
+
+        # 유효 위치의 상관은 FFT 크기를 화면 크기 이상으로만 잡으면 순환 겹침이 생기지 않습니다.
+        fft_shape = (_fast_length(frame_height), _fast_length(frame_width))
+        spectrum = np.fft.rfft2(gray, s=fft_shape)
+        spectrum *= self._get_spectrum(fft_shape)
+        correlation = np.fft.irfft2(spectrum, s=fft_shape)
+        valid_height, valid_width = frame_height - self.height + 1, frame_width - self.width + 1
+        numerator = correlation[:valid_height, :valid_width]
+
+        # 창별 분산: Σf² - (Σf)² / n
+        count = self.height * self.width
+        sums = _window_sums(gray, self.height, self.width)
+        sums_sq = _window_sums(np.square(gray, dtype=np.float64), self.height, self.width)
+        variance = np.maximum(sums_sq - sums * sums / count, 0.0)
+        denominator = np.sqrt(variance) * self._norm
+
+        scores = np.zeros((valid_height, valid_width), dtype=np.float32)
+        np.divide(numerator, denominator, out=scores, where=denominator > self._norm * 1e-3, casting='unsafe')
+        return scores
+
+    def find_matches(self, frame: np.ndarray, threshold: float, column_major: bool = False, bottom_up: bool = False,
+                     right_to_left: bool = False, max_results: int | None = None) -> list:
+        """
+        점수가 threshold 이상인 위치를 찾아, 서로 겹치는 후보 중 점수가 가장 높은 것만 남긴 뒤 탐색 방향 순서로 정렬합니다.
+        :return: [(중심 x, 중심 y, 점수), ...] (화면 기준 상대 좌표)
+        """
+        scores = self.match_scores(frame)
+        if scores is None:
+            return []
+        ys, xs = np.nonzero(scores >= threshold)
+        if len(ys) == 0:
+            return []
+        values = scores[ys, xs]
+        if len(values) > _MAX_CANDIDATES:
+            top = np.argpartition(values, -_MAX_CANDIDATES)[-_MAX_CANDIDATES:]
+            ys, xs, values = ys[top], xs[top], values[top]
+
+        # 비최대 억제: 점수가 높은 후보부터, 이미 고른 후보와 템플릿 크기 안으로 겹치면 버립니다.
+        kept = []
+        for index in np.argsort(-values, kind='stable'):
+            y, x = int(ys[index]), int(xs[index])
+            if all(abs(y - ky) >= self.height or abs(x - kx) >= self.width for ky, kx, _ in kept):
+                kept.append((y, x, float(values[index])))
+
+        def scan_key(match):
+            y, x, _ = match
+            row = -y if bottom_up else y
+            col = -x if right_to_left else x
+            return (col, row) if column_major else (row, col)
+
+        kept.sort(key=scan_key)
+        if max_results is not None:
+            kept = kept[:max_results]
+        return [(x + self.width // 2, y + self.height // 2, score) for y, x, score in kept]
+
+
+def save_template(patch: np.ndarray, directory: str = TEMPLATE_DIR) -> str:
+    """캡처한 패치를 PNG로 저장하고 경로를 반환합니다."""
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, time.strftime('template_%Y%m%d_%H%M%S.png'))
+    Image.fromarray(np.ascontiguousarray(patch[..., :3])).save(path)
+    return path
+
+
+def load_template(path: str) -> TemplateMatcher:
+    """저장된 패치 이미지로 TemplateMatcher를 만듭니다."""
+    with Image.open(path) as image:
+        return TemplateMatcher(np.array(image.convert('RGB')))
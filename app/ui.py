@@ -2,6 +2,7 @@ import tkinter as tk
 from tkinter import ttk
 import sys
 import queue
+import os
 
 from .color_finder import SearchDirection
 
@@ -37,12 +38,15 @@ class AppUI:
         self.color_var = tk.StringVar(value=str(c.color))
         self.use_secondary_color_var = tk.BooleanVar(value=c.use_secondary_color)
         self.secondary_color_var = tk.StringVar(value=str(c.secondary_color))
+        self.use_template_var = tk.BooleanVar(value=c.use_template)
+        self.template_var = tk.StringVar(value=os.path.basename(c.template_path) or "(없음)")
         self.area_delay_var = tk.StringVar(value=str(int(c.area_delay * 100)))
         self.search_delay_var = tk.StringVar(value=str(int(c.search_delay * 100)))
         self.complete_coord_var = tk.StringVar(value=str(c.complete_coord))
         self.use_initial_search_var = tk.BooleanVar(value=c.use_initial_search)
         self.use_screen_activation_var = tk.BooleanVar(value=c.use_screen_activation)
         self.empty_coord_var = tk.StringVar(value=str(c.empty_coord))
+        self.anchor_coord_var = tk.StringVar(value=str(c.anchor_coord))
 
         self.use_sequence_var = tk.BooleanVar(value=c.use_sequence)
         # 탐색 방향 Enum과 UI 표시 문자열을 매핑합니다.
@@ -59,6 +63,7 @@ class AppUI:
             SearchDirection.TOP_TO_BOTTOM_RIGHT_TO_LEFT: "↓← (r)",
             SearchDirection.BOTTOM_TO_TOP_LEFT_TO_RIGHT: "↑→ (d)",
             SearchDirection.BOTTOM_TO_TOP_RIGHT_TO_LEFT: "↑← (f)",
+            SearchDirection.NEAREST_TO_ANCHOR: "◎ (g)",
         }
         self.direction_var = tk.StringVar(value=self.SEARCH_DIRECTION_MAP[c.search_direction])
         self.total_duration_var = tk.StringVar(value=str(c.total_duration_sec))
@@ -153,17 +158,28 @@ class AppUI:
         self.global_toggles['secondary_color'] = toggle_func
         secondary_color_selector.pack(expand=True, fill=tk.X)
 
-        # Row 3: 색상오차, 색상영역 오차
-        row3_container, (_, _, right_frame) = self._create_split_container(basic_group, weights=[1, 1, 1])
+        # Row 3: 템플릿, 색상오차, 색상영역 오차
+        row3_container, (left_frame, _, right_frame) = self._create_split_container(basic_group, weights=[1, 1, 1])
+        template_selector, toggle_func = self._create_toggleable_color_selector(
+            left_frame,
+            use_var=self.use_template_var,
+            color_var=self.template_var,
+            check_text="모양",
+            button_text="패치",
+            command=self.controller.start_template_picker
+        )
+        self.global_toggles['template'] = toggle_func
+        template_selector.pack(expand=True, fill=tk.X)
         self._create_labeled_entry(right_frame, "색영역오차:", self.color_area_tolerance_var).pack(side=tk.RIGHT)
         self._create_labeled_entry(right_frame, "색상오차:", self.color_tolerance_var).pack(side=tk.RIGHT)
 
 
-        # Row 4: 완료 좌표, 완료 딜레이, 탐색 방향
+        # Row 4: 완료 좌표, 기준점, 완료 딜레이, 탐색 방향
         row4_container, (left_frame, right_frame) = self._create_split_container(basic_group, weights=[1, 1])
         
-        # Part 1: 완료 좌표
+        # Part 1: 완료 좌표, '◎' 방향의 기준점
         self._create_value_button_row(left_frame, self.complete_coord_var, "완료", command=lambda: self.controller.start_coordinate_picker('complete')).pack(side=tk.LEFT)
+        self._create_value_button_row(left_frame, self.anchor_coord_var, "기준", command=lambda: self.controller.start_coordinate_picker('anchor_coord')).pack(side=tk.LEFT, padx=(5, 0))
       
         # Part 2: 완료 선택 딜레이, 탐색 방향
         self._create_labeled_entry(right_frame, "완료 딜레이:", self.complete_delay_var).pack(expand=True, fill=tk.X, side=tk.LEFT)
@@ -581,12 +597,15 @@ class AppUI:
         self.color_var.set(str(c.color))
         self.use_secondary_color_var.set(c.use_secondary_color)
         self.secondary_color_var.set(str(c.secondary_color))
+        self.use_template_var.set(c.use_template)
+        self.template_var.set(os.path.basename(c.template_path) or "(없음)")
         self.area_delay_var.set(str(int(c.area_delay * 100)))
         self.search_delay_var.set(str(int(c.search_delay * 100)))
         self.complete_coord_var.set(str(c.complete_coord))
         self.use_initial_search_var.set(c.use_initial_search)
         self.use_screen_activation_var.set(c.use_screen_activation)
         self.empty_coord_var.set(str(c.empty_coord))
+        self.anchor_coord_var.set(str(c.anchor_coord))
         self.use_sequence_var.set(c.use_sequence)
         self.direction_var.set(self.SEARCH_DIRECTION_MAP[c.search_direction])
         self.total_duration_var.set(str(c.total_duration_sec))